@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Micro-Benchmark für parser_core.layout._histogram_split.
+
+Die Layout-Sidecar-Fixture enthält nur Zeilentext, keine Wortkoordinaten. Für jede Seite werden
+deshalb Wortmittelpunkte aus den serialisierten Spalten (links | "" | rechts) rekonstruiert:
+Spaltenanfang + Zeichenposition × mittlere Zeichenbreite. Das ergibt realistische Verteilungen
+(Wortanzahl, zwei Spaltenpeaks, Tal in der Mitte) für die echten Protokollseiten.
+
+Verglichen wird die alte Referenz (jeder Bin zählt alle Mittelpunkte, O(bins × Wörter)) mit der
+aktuellen Implementierung; die Ergebnisse müssen identisch sein.
+
+Aufruf:
+  python scripts/benchmarks/bench_histogram_split.py [--fixture PFAD] [--repeat N]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.parser_core.layout import _histogram_split
+
+DEFAULT_FIXTURE = ROOT / "data" / "session_17_127_2025-07-16.layout.json"
+PAGE_WIDTH = 595.28
+LEFT_X0 = 56.7
+RIGHT_X0 = 310.0
+CHAR_W = 4.1
+
+
+def approximate_page_mids(lines: List[str]) -> List[float]:
+    """Rekonstruiert Wortmittelpunkte aus den Zeilen einer Seite (links, "", rechts)."""
+    mids: List[float] = []
+    x_start = LEFT_X0
+    for line in lines:
+        if line == "":
+            x_start = RIGHT_X0
+            continue
+        pos = 0
+        for word in line.split(" "):
+            if word:
+                mids.append(x_start + (pos + len(word) / 2.0) * CHAR_W)
+            pos += len(word) + 1
+    mids.sort()
+    return mids
+
+
+def histogram_split_reference(mids, page_width, bins, min_peak_sep_rel, min_valley_rel_drop):
+    """Bisherige Implementierung (Bin-Füllung per Doppelschleife), nur für den Vergleich."""
+    if len(mids) < 10 or page_width <= 0:
+        return None
+    lo = min(mids); hi = max(mids)
+    if hi - lo < page_width * 0.3:
+        return None
+    bin_w = (hi - lo) / bins if bins > 0 else (hi - lo)
+    if bin_w <= 0:
+        return None
+    counts = []
+    edges = []
+    for i in range(bins):
+        start = lo + i * bin_w
+        end = start + bin_w
+        edges.append((start, end))
+        cnt = 0
+        for m in mids:
+            if start <= m < end:
+                cnt += 1
+        counts.append(cnt)
+    peaks = []
+    for i in range(1, bins - 1):
+        if counts[i] > counts[i-1] and counts[i] > counts[i+1]:
+            peaks.append((counts[i], i))
+    if len(peaks) < 2:
+        return None
+    peaks.sort(reverse=True)
+    p1, p2 = sorted(peaks[:2], key=lambda x: x[1])
+    c1, i1 = p1
+    c2, i2 = p2
+    center1 = (edges[i1][0] + edges[i1][1]) / 2.0
+    center2 = (edges[i2][0] + edges[i2][1]) / 2.0
+    sep_abs = abs(center2 - center1)
+    sep_rel = sep_abs / page_width
+    if sep_rel < min_peak_sep_rel:
+        return None
+    valley = None
+    valley_i = None
+    for j in range(i1 + 1, i2):
+        if valley is None or counts[j] < valley:
+            valley = counts[j]
+            valley_i = j
+    if valley is None:
+        return None
+    avg_peak_height = (c1 + c2) / 2.0
+    if avg_peak_height == 0:
+        return None
+    drop_rel = 1.0 - (valley / avg_peak_height)
+    if drop_rel < min_valley_rel_drop:
+        return None
+    valley_center = (edges[valley_i][0] + edges[valley_i][1]) / 2.0
+    return valley_center, {
+        "hist_peak1_center": round(center1, 2),
+        "hist_peak2_center": round(center2, 2),
+        "hist_sep_abs": round(sep_abs, 2),
+        "hist_sep_rel": round(sep_rel, 3),
+        "hist_valley_drop_rel": round(drop_rel, 3),
+        "hist_valley_bin": valley_i,
+        "hist_bins": bins
+    }
+
+
+def _time(fn, pages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for mids in pages:
+            fn(mids, PAGE_WIDTH, 80, 0.18, 0.30)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Micro-Benchmark _histogram_split")
+    p.add_argument("--fixture", default=str(DEFAULT_FIXTURE), help="Layout-Sidecar (JSON)")
+    p.add_argument("--repeat", type=int, default=10, help="Wiederholungen (Bestwert zählt)")
+    args = p.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        pages_lines = json.load(f)["layout_debug"]["normalized_pages"]
+    pages = [approximate_page_mids(lines) for lines in pages_lines]
+
+    for mids in pages:
+        expected = histogram_split_reference(mids, PAGE_WIDTH, 80, 0.18, 0.30)
+        if _histogram_split(mids, PAGE_WIDTH, 80, 0.18, 0.30) != expected:
+            print("[ERROR] Ergebnis weicht von der Referenz ab", file=sys.stderr)
+            return 1
+
+    words = sum(len(m) for m in pages)
+    t_ref = _time(histogram_split_reference, pages, args.repeat)
+    t_new = _time(_histogram_split, pages, args.repeat)
+    print(f"Seiten: {len(pages)}, Wörter: {words} (Ø {words / max(1, len(pages)):.0f}/Seite)")
+    print(f"Referenz (bins × Wörter): {t_ref * 1000:8.2f} ms  ({t_ref / len(pages) * 1e6:8.1f} µs/Seite)")
+    print(f"bisect:                   {t_new * 1000:8.2f} ms  ({t_new / len(pages) * 1e6:8.1f} µs/Seite)")
+    print(f"Speedup: {t_ref / t_new:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
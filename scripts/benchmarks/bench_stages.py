@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Offline-Benchmark der Textstufen von parse_landtag_pdf.py auf der Layout-Sidecar-Fixture.
+
+Der Sidecar enthält normalized_pages (Ausgabe der Layout-Stufe); daraus werden alle folgenden Stufen
+ohne pdfplumber und ohne Netz nachgespielt:
+  header_footer  normalized_pages -> filtered_pages
+  cleanup        filtered_pages -> post_cleaned_pages
+  toc_split      Inhaltsverzeichnis-Zeilen
+  toc            parse_toc + normalize_toc_items (ohne Interleave-Fallback, der braucht die PDF)
+  speeches       Tokenizer: ein Durchlauf über den Sitzungstext (Köpfe, Absätze, Events, Aufrufe)
+  events         Reden-, Absatz- und Event-Tabellen aus dem Tokenstrom (Spannen-Modell)
+  enrich         Rede-Dicts erzeugen, TOC-Parteien/Redner aus den Reden, nächste Sitzung
+  session        Sitzungsdaten und Pausen
+header_footer und cleanup werden gegen filtered_pages/post_cleaned_pages der Fixture geprüft, sofern
+vorhanden. --synthetic 10,100,1000 ersetzt die Fixture durch generierte Protokolle dieser Seitenzahlen
+(synthetic_protocol.py) und zeigt zusätzlich ms/Seite und den Wachstumsexponenten je Stufe.
+
+Je Stufe: ops/s, Median/Minimum/Streuung einer Ausführung, tracemalloc-Spitze (eigener Durchlauf,
+damit die Zeitmessung nicht mitbezahlt), Normalisierungszeit (nfkc/collapse_ws/squeeze_blanks aus
+parser_core.normalize mit Aufrufen und Schnellpfad-Treffern, ebenfalls eigener Durchlauf) und Mengen.
+Stufen, die ihre Eingabe verändern, bekommen vor jeder Ausführung eine ungemessene Kopie.
+
+Die Ergebnisse werden an eine JSON-Historie angehängt (Default .benchmarks/stages.json, mit Commit)
+und mit dem vorigen Lauf verglichen; --fail-slower PROZENT beendet mit 1, wenn eine Stufe im Median
+um mehr als PROZENT langsamer geworden ist.
+
+Aufruf:
+  python scripts/benchmarks/bench_stages.py [--fixture PFAD] [--repeat N] [--stages a,b] [--no-save]
+  python scripts/benchmarks/bench_stages.py --synthetic 10,100,1000 --repeat 1 --min-time 0
+"""
+import argparse
+import copy
+import datetime as dt
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.benchmarks.synthetic_protocol import generate
+from scripts.parse_landtag_pdf import (
+    normalize_toc_items,
+    parse_toc,
+    stage_cleanup,
+    stage_enrich,
+    stage_events,
+    stage_header_footer,
+    stage_session,
+    stage_speeches,
+    stage_toc_split,
+)
+from scripts.parser_core.normalize import profile as normalize_profile
+from scripts.parser_core.spans import page_start_offsets
+
+DEFAULT_FIXTURE = ROOT / "data" / "session_17_127_2025-07-16.layout.json"
+DEFAULT_HISTORY = ROOT / ".benchmarks" / "stages.json"
+HISTORY_VERSION = 1
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Dict[str, Any]]      # frische Eingabe je Ausführung (ungemessen)
+    run: Callable[..., Any]
+    counts: Callable[[Any], Dict[str, int]]
+
+
+def _page_counts(pages: List[List[str]]) -> Dict[str, int]:
+    return {"pages": len(pages), "lines": sum(len(p) for p in pages)}
+
+
+def _speech_counts(speeches: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {"speeches": len(speeches), "events": sum(len(sp.get("events_flat") or []) for sp in speeches)}
+
+
+def _stage_toc(toc_lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"toc": normalize_toc_items(parse_toc(toc_lines)), "fallback_used": False}
+
+
+def load_fixture(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["layout_debug"]
+
+
+def build_cases(fixture: Dict[str, Any]) -> List[Case]:
+    """Spielt die Kette einmal durch (Referenzeingaben) und prüft die Seitenstufen gegen die Fixture."""
+    normalized = fixture["normalized_pages"]
+    header_footer = stage_header_footer({"pages": normalized})
+    if "filtered_pages" in fixture and header_footer["pages"] != fixture["filtered_pages"]:
+        raise ValueError("header_footer weicht von filtered_pages der Fixture ab")
+    cleanup = stage_cleanup(header_footer)
+    if "post_cleaned_pages" in fixture and cleanup != fixture["post_cleaned_pages"]:
+        raise ValueError("cleanup weicht von post_cleaned_pages der Fixture ab")
+    toc_lines = stage_toc_split(cleanup)
+    toc = _stage_toc(toc_lines)
+    text = "\n".join("\n".join(p) for p in cleanup)
+    page_starts = page_start_offsets(len("\n".join(p)) for p in cleanup)
+    speeches = stage_speeches(text, page_starts)
+    events = stage_events(speeches)
+
+    return [
+        Case("header_footer", lambda: {"layout": {"pages": normalized}}, stage_header_footer,
+             lambda v: _page_counts(v["pages"])),
+        Case("cleanup", lambda: {"header_footer": header_footer}, stage_cleanup, _page_counts),
+        Case("toc_split", lambda: {"cleanup": cleanup}, stage_toc_split, lambda v: {"toc_lines": len(v)}),
+        Case("toc", lambda: {"toc_lines": toc_lines}, _stage_toc,
+             lambda v: {"toc_items": len(v["toc"].get("items", []))}),
+        Case("speeches", lambda: {"text": text, "page_starts": page_starts}, stage_speeches,
+             lambda v: {"speeches": len(v), "tokens": len(v.tokens)}),
+        Case("events", lambda: {"speeches": speeches}, stage_events,
+             lambda v: {"speeches": len(v), "event_spans": len(v.events)}),
+        Case("enrich", lambda: {"toc": copy.deepcopy(toc), "events": events}, stage_enrich,
+             lambda v: {"toc_items": len(v["toc"].get("items", [])), **_speech_counts(v["speeches"])}),
+        Case("session", lambda: {"text": text}, stage_session, lambda v: {"breaks": len(v["breaks"] or [])}),
+    ]
+
+
+def _alloc_peak_mb(case: Case) -> float:
+    kwargs = case.setup()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        case.run(**kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(max(0, peak - base) / (1024 * 1024), 2)
+
+
+def _normalize_stats(case: Case) -> Dict[str, Any]:
+    kwargs = case.setup()
+    with normalize_profile() as prof:
+        case.run(**kwargs)
+    return {"norm_ms": round(prof.total_seconds * 1000, 3), "normalize": prof.as_dict()}
+
+
+def bench_case(case: Case, repeat: int, min_time: float) -> Dict[str, Any]:
+    """Mindestens repeat Ausführungen und min_time Sekunden reine Laufzeit; eine Aufwärmrunde vorab."""
+    result = case.run(**case.setup())
+    times: List[float] = []
+    while len(times) < repeat or sum(times) < min_time:
+        kwargs = case.setup()
+        t0 = time.perf_counter()
+        case.run(**kwargs)
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {
+        "rounds": len(times),
+        "ops_per_sec": round(len(times) / sum(times), 2),
+        "median_ms": round(median * 1000, 3),
+        "min_ms": round(min(times) * 1000, 3),
+        "stdev_ms": round(statistics.stdev(times) * 1000, 3) if len(times) > 1 else 0.0,
+        "alloc_peak_mb": _alloc_peak_mb(case),
+        **_normalize_stats(case),
+        "counts": case.counts(result),
+    }
+
+
+def run_cases(fixture: Dict[str, Any], repeat: int = 5, min_time: float = 0.0,
+              only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    cases = build_cases(fixture)
+    if only:
+        unknown = set(only) - {c.name for c in cases}
+        if unknown:
+            raise ValueError(f"Unbekannte Stufe(n): {', '.join(sorted(unknown))}")
+        cases = [c for c in cases if c.name in only]
+    return {c.name: bench_case(c, repeat, min_time) for c in cases}
+
+
+def run_suite(fixture_path: Path = DEFAULT_FIXTURE, repeat: int = 5, min_time: float = 0.0,
+              only: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    return run_cases(load_fixture(fixture_path), repeat, min_time, only)
+
+
+def synthetic_fixture(pages: int, seed: int = 1) -> Dict[str, Any]:
+    return {"normalized_pages": generate(pages, seed=seed).page_lines()}
+
+
+def growth_exponent(sizes: List[int], medians: List[float]) -> Optional[float]:
+    """Steigung von log(Zeit) über log(Seiten) (Kleinste-Quadrate); ~1 linear, ~2 quadratisch."""
+    pts = [(math.log(n), math.log(t)) for n, t in zip(sizes, medians) if n > 0 and t > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    sxx = sum((x - mx) ** 2 for x, _ in pts)
+    if sxx == 0:
+        return None
+    return round(sum((x - mx) * (y - my) for x, y in pts) / sxx, 2)
+
+
+def format_scaling(results: Dict[int, Dict[str, Dict[str, Any]]]) -> str:
+    sizes = sorted(results)
+    names = list(results[sizes[0]])
+    lines = [f"{'Stufe':<14} " + " ".join(f"{f'{n} S. ms/S.':>14}" for n in sizes) + f" {'Exponent':>9}"]
+    for name in names:
+        medians = [results[n][name]["median_ms"] for n in sizes]
+        exp = growth_exponent(sizes, medians)
+        lines.append(f"{name:<14} " + " ".join(f"{m / n:>14.3f}" for m, n in zip(medians, sizes))
+                     + f" {exp if exp is not None else '-':>9}")
+    return "\n".join(lines)
+
+
+# ------------------------- Historie -------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, timeout=10)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if out.returncode != 0:
+        return None
+    return out.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if data.get("version") != HISTORY_VERSION:
+        return []
+    return list(data.get("runs") or [])
+
+
+def append_history(path: Path, stages: Dict[str, Dict[str, Any]], fixture: str,
+                   commit: Optional[str] = None) -> Dict[str, Any]:
+    run = {
+        "commit": commit if commit is not None else _git_commit(),
+        "timestamp": dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "fixture": fixture,
+        "stages": stages,
+    }
+    runs = load_history(path) + [run]
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps({"version": HISTORY_VERSION, "runs": runs}, ensure_ascii=False, indent=2),
+                 encoding="utf-8")
+    return run
+
+
+def compare(previous: Optional[Dict[str, Any]], stages: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
+    """Änderung des Medians je Stufe in Prozent gegenüber dem vorigen Lauf (positiv = langsamer)."""
+    if not previous:
+        return {}
+    deltas: Dict[str, float] = {}
+    for name, cur in stages.items():
+        old = (previous.get("stages") or {}).get(name)
+        if old and old.get("median_ms"):
+            deltas[name] = round((cur["median_ms"] / old["median_ms"] - 1.0) * 100.0, 1)
+    return deltas
+
+
+def format_report(stages: Dict[str, Dict[str, Any]], deltas: Dict[str, float]) -> str:
+    lines = [f"{'Stufe':<14} {'ops/s':>9} {'Median/ms':>10} {'Min/ms':>9} {'±/ms':>7} {'Alloc/MB':>9} "
+             f"{'Norm/ms':>8} {'Δ Median':>9}  Mengen"]
+    for name, r in stages.items():
+        delta = f"{deltas[name]:+.1f}%" if name in deltas else "-"
+        counts = " ".join(f"{k}={v}" for k, v in r["counts"].items())
+        norm = f"{r['norm_ms']:.2f}" if "norm_ms" in r else "-"
+        lines.append(f"{name:<14} {r['ops_per_sec']:>9.1f} {r['median_ms']:>10.2f} {r['min_ms']:>9.2f} "
+                     f"{r['stdev_ms']:>7.2f} {r['alloc_peak_mb']:>9.2f} {norm:>8} {delta:>9}  {counts}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Offline-Benchmark der Textstufen (Layout-Sidecar-Fixture)")
+    p.add_argument("--fixture", default=str(DEFAULT_FIXTURE), help="Layout-Sidecar (JSON)")
+    p.add_argument("--repeat", type=int, default=5, help="Mindestzahl gemessener Ausführungen je Stufe")
+    p.add_argument("--min-time", type=float, default=0.5, help="Mindest-Messzeit je Stufe in Sekunden")
+    p.add_argument("--stages", help="Nur diese Stufen (kommagetrennt)")
+    p.add_argument("--history", default=str(DEFAULT_HISTORY), help="JSON-Historie der Läufe")
+    p.add_argument("--no-save", action="store_true", help="Ergebnis nicht an die Historie anhängen")
+    p.add_argument("--fail-slower", type=float, default=None, metavar="PROZENT",
+                   help="Exit 1, wenn eine Stufe im Median um mehr als PROZENT langsamer ist als im vorigen Lauf")
+    p.add_argument("--json", action="store_true", help="Ergebnis als JSON statt Tabelle ausgeben")
+    p.add_argument("--synthetic", metavar="SEITEN",
+                   help="Statt der Fixture synthetische Protokolle dieser Seitenzahlen (kommagetrennt, z. B. 10,100,1000)")
+    p.add_argument("--seed", type=int, default=1, help="Seed für --synthetic")
+    args = p.parse_args()
+
+    only = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+    if args.synthetic:
+        sizes = [int(x) for x in args.synthetic.split(",") if x.strip()]
+        runs = [(f"synthetic-{n}p-seed{args.seed}", n) for n in sizes]
+    else:
+        runs = [(Path(args.fixture).name, None)]
+
+    history = load_history(Path(args.history))
+    results: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    failed: Dict[str, float] = {}
+    for label, n in runs:
+        try:
+            fixture = synthetic_fixture(n, args.seed) if n is not None else load_fixture(Path(args.fixture))
+            stages = run_cases(fixture, repeat=max(1, args.repeat), min_time=args.min_time, only=only)
+        except ValueError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+        previous = next((r for r in reversed(history) if r.get("fixture") == label), None)
+        deltas = compare(previous, stages)
+        if n is not None:
+            results[n] = stages
+        if args.json:
+            print(json.dumps({"fixture": label, "stages": stages, "delta_median_pct": deltas},
+                             ensure_ascii=False, indent=2))
+        else:
+            print(f"== {label}")
+            print(format_report(stages, deltas))
+        if not args.no_save:
+            run = append_history(Path(args.history), stages, label)
+            history.append(run)
+            print(f"[HISTORY] {args.history} ({run['commit'] or 'ohne Commit'}, {len(history)} Läufe)",
+                  file=sys.stderr)
+        if args.fail_slower is not None:
+            failed.update({f"{label}:{s}": d for s, d in deltas.items() if d > args.fail_slower})
+
+    if len(results) > 1 and not args.json:
+        print("== Skalierung")
+        print(format_scaling(results))
+    if failed:
+        print("[SLOWER] " + ", ".join(f"{n} {d:+.1f}%" for n, d in failed.items()), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
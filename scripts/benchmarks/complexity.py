@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Komplexitäts-Wächter für die Textstufen: misst Stufenfunktionen bei mehreren Eingabegrößen und
+schätzt das Wachstum.
+
+Je Fall liefert make(n) eine Eingabe-Fabrik und die Funktion; gemessen wird die CPU-Zeit des
+Prozesses (time.process_time: andere Prozesse auf der Maschine verfälschen sie kaum, anders als die
+Wandzeit), der Bestwert aus mehreren Stichproben (frische Eingaben, ungemessen erzeugt; gc aus wie
+bei timeit; kleine Laufzeiten werden über mehrere Aufrufe pro Stichprobe gemittelt). Aus den Zeiten t(n) wird der
+Exponent von t(n) / f(n) gefittet, f = deklarierte Schranke ("n" oder "n log n"). Liegt er über
+slack, wächst die Stufe schneller als deklariert (quadratisch ergibt ~1).
+
+Fälle:
+- stage_cases: alle Stufen aus bench_stages.py auf synthetischen Protokollen (n = Seiten)
+- Einzelfunktionen mit eigener Größenachse in tests/test_complexity.py (nur mit COMPLEXITY_TESTS=1,
+  im normalen pytest-Lauf übersprungen)
+
+Aufruf:
+  python scripts/benchmarks/complexity.py [--sizes 15,60,240]
+"""
+import argparse
+import gc
+import math
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from scripts.benchmarks.bench_stages import build_cases, growth_exponent, synthetic_fixture
+
+BOUNDS: Dict[str, Callable[[int], float]] = {
+    "n": lambda n: float(n),
+    "n log n": lambda n: n * math.log2(max(n, 2)),
+}
+SLACK = 0.35
+MIN_SAMPLE_SECONDS = 0.02
+SAMPLES = 5
+
+# make(n) -> (setup, run): setup() liefert kwargs für run(**kwargs)
+CaseFactory = Callable[[int], Tuple[Callable[[], Dict[str, Any]], Callable[..., Any]]]
+
+
+@dataclass
+class Growth:
+    name: str
+    bound: str
+    sizes: List[int]
+    seconds: List[float]
+    excess: Optional[float]          # Exponent von t(n)/f(n)
+    slack: float = SLACK
+
+    @property
+    def ok(self) -> bool:
+        return self.excess is None or self.excess <= self.slack
+
+    def describe(self) -> str:
+        times = ", ".join(f"n={n}: {t * 1000:.2f} ms" for n, t in zip(self.sizes, self.seconds))
+        exp = growth_exponent(self.sizes, self.seconds)
+        return (f"{self.name}: Exponent {exp}, Überschuss gegenüber O({self.bound}) {self.excess} "
+                f"(erlaubt {self.slack}) – {times}")
+
+
+def time_call(setup: Callable[[], Dict[str, Any]], run: Callable[..., Any], samples: int = SAMPLES) -> float:
+    """Bestwert in CPU-Sekunden je Aufruf; pro Stichprobe so viele Aufrufe, dass MIN_SAMPLE_SECONDS erreicht ist."""
+    kwargs = setup()
+    t0 = time.process_time()
+    run(**kwargs)
+    first = time.process_time() - t0
+    number = max(1, min(1000, int(MIN_SAMPLE_SECONDS / max(first, 1e-9)) + 1))
+    best = first
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(samples):
+            inputs = [setup() for _ in range(number)]
+            gc.collect()
+            gc.disable()
+            t0 = time.process_time()
+            for kwargs in inputs:
+                run(**kwargs)
+            best = min(best, (time.process_time() - t0) / number)
+            if gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def measure_growth(name: str, make: CaseFactory, sizes: List[int], bound: str = "n",
+                   slack: float = SLACK, samples: int = SAMPLES) -> Growth:
+    f = BOUNDS[bound]
+    seconds = []
+    for n in sizes:
+        setup, run = make(n)
+        seconds.append(time_call(setup, run, samples))
+    excess = growth_exponent(sizes, [t / f(n) * f(sizes[0]) for n, t in zip(sizes, seconds)])
+    return Growth(name, bound, list(sizes), seconds, excess, slack)
+
+
+def stage_growth(sizes: List[int], bounds: Dict[str, str], seed: int = 1, samples: int = SAMPLES,
+                 slack: float = SLACK) -> List[Growth]:
+    """Alle Stufen aus bench_stages.build_cases auf synthetischen Protokollen mit sizes Seiten."""
+    per_size = {n: {c.name: c for c in build_cases(synthetic_fixture(n, seed))} for n in sizes}
+    out = []
+    for name, bound in bounds.items():
+        make = lambda n, name=name: (per_size[n][name].setup, per_size[n][name].run)
+        out.append(measure_growth(name, make, sizes, bound, slack, samples))
+    return out
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Wachstum der Textstufen auf synthetischen Protokollen")
+    p.add_argument("--sizes", default="15,60,240", help="Seitenzahlen (kommagetrennt)")
+    p.add_argument("--seed", type=int, default=1)
+    args = p.parse_args()
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    names = [c.name for c in build_cases(synthetic_fixture(sizes[0], args.seed))]
+    results = stage_growth(sizes, {n: "n" for n in names}, seed=args.seed)
+    for g in results:
+        print(("[OK]   " if g.ok else "[FAIL] ") + g.describe())
+    return 0 if all(g.ok for g in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
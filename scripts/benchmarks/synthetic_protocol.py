@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Generator für synthetische Plenarprotokolle beliebiger Länge (Skalierungstests, Benchmarks).
+
+Nachgebildet ist Aufbau und Vokabular der echten Fixture (17/127): Deckblatt mit INHALT,
+Inhaltsverzeichnis mit Punktführern und Seitenzahlen (Tagesordnungspunkte mit Drucksachen,
+Rednerzeilen, Beschluss, Nächste Sitzung), danach das Protokoll in zwei Spalten mit
+Rollen-Kopfzeilen („Abg. Name PARTEI:“, „Präsidentin …:“, „Minister …:“), Aufrufen
+(„Ich rufe Punkt 3 der Tagesordnung auf:“), Klammer-Ereignissen über mehrere Zeilen,
+Gedankenstrich-Ereignissen, Fortsetzungsköpfen „(Name)“ und Seitenkopf/Seitenzahl.
+
+Ausgaben:
+- Seiten als Zeilenlisten in der Form der Layout-Stufe (normalized_pages: linke Spalte, "",
+  rechte Spalte); write_fixture schreibt sie als Layout-Sidecar für bench_stages.py --fixture
+- zweispaltige PDF über einen eigenen, reinen Python-PDF-Writer (Helvetica, WinAnsiEncoding,
+  Flate-komprimierte Inhaltsströme) – keine zusätzlichen Abhängigkeiten
+
+Die Ausgabe ist für (pages, seed) deterministisch; truth enthält die erzeugten Mengen
+(Reden, Ereignisse, Tagesordnungspunkte) zum Abgleich mit dem Parser.
+
+Aufruf:
+  python scripts/benchmarks/synthetic_protocol.py --pages 1000 [--seed 1] [--pdf out.pdf] [--fixture out.layout.json]
+"""
+import argparse
+import json
+import random
+import sys
+import zlib
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+LEFT_X0 = 56.7
+RIGHT_X0 = 310.0
+COLUMN_WIDTH = 230.0
+FONT_SIZE = 9.0
+LEADING = 12.0
+TOP_Y = 780.0
+HEADER_Y = 805.0
+FOOTER_Y = 40.0
+COLUMN_LINES = 58
+ITEM_MIN_LINES = 60
+
+FIRST_PAGE_NUMBER = 7639
+LEGISLATIVE_PERIOD = 17
+
+PARTIES = ["GRÜNE", "CDU", "AfD", "SPD", "FDP/DVP"]
+PARTY_DATIVE = {"GRÜNE": "den Grünen", "CDU": "der CDU", "AfD": "der AfD", "SPD": "der SPD", "FDP/DVP": "der FDP/DVP"}
+MEMBERS = {
+    "GRÜNE": ["Dr. Marilena Geugjes", "Stefanie Seemann", "Peter Seimer", "Swantje Sperling", "Thomas Poreski"],
+    "CDU": ["Andreas Sturm", "Dr. Alexander Becker", "Isabell Huber", "Ulli Hockenberger", "Dr. Albrecht Schütte"],
+    "AfD": ["Dr. Rainer Balzer", "Alfred Bamberger", "Daniel Lindenschmid", "Sandro Scheer", "Emil Sänze"],
+    "SPD": ["Dr. Stefan Fulst-Blei", "Martin Rivoir", "Jonas Hoffmann", "Klaus Ranger", "Nicolas Fink"],
+    "FDP/DVP": ["Alena Fink-Trauschel", "Stephen Brauer", "Daniel Karrais", "Julia Goll", "Nikolai Reith"],
+}
+PRESIDENTS = [("Präsidentin", "Muhterem Aras"), ("Stellv. Präsident", "Daniel Born"),
+              ("Stellv. Präsident", "Dr. Wolfgang Reinhart")]
+GOVERNMENT = [("Minister", "Thomas Strobl"), ("Staatssekretärin", "Sandra Boser"),
+              ("Staatssekretär", "Arne Braun"), ("Staatssekretärin", "Dr. Gisela Splett")]
+COMMITTEES = ["Wissenschaft, Forschung und Kunst", "Finanzen", "Kultus, Jugend und Sport",
+              "des Inneren, für Digitalisierung und Kommunen", "Umwelt, Klima und Energiewirtschaft"]
+MINISTRIES = ["Finanzen", "Kultus, Jugend und Sport", "Verkehr", "Soziales, Gesundheit und Integration"]
+TOPICS = ["Neuregelung des Landesarchivrechts", "Änderung kommunalrechtlicher und weiterer Vorschriften",
+          "Förderung der elektronischen Verwaltung", "Änderung der Landeshaushaltsordnung",
+          "Stärkung der Schulsozialarbeit", "Ausbau des öffentlichen Nahverkehrs im ländlichen Raum",
+          "Sicherung der Hausarztversorgung", "Förderprogramme der Landesregierung",
+          "Entlastung der Kommunen bei der Unterbringung", "Digitalisierung der Berufsschulen"]
+SENTENCES = [
+    "Sehr geehrte Frau Präsidentin, liebe Kolleginnen und Kollegen!",
+    "Wir beraten heute einen Gesetzentwurf, der für die Kommunen in unserem Land von großer Bedeutung ist.",
+    "Die Landesregierung hat in den vergangenen Jahren erhebliche Mittel bereitgestellt.",
+    "Das ist keine Frage der Ideologie, sondern eine Frage der Verantwortung.",
+    "Der Ausschuss hat sich in mehreren Sitzungen ausführlich mit den Stellungnahmen befasst.",
+    "Wir haben die Anregungen aus der Anhörung aufgenommen und den Entwurf an mehreren Stellen verbessert.",
+    "Die Bürgerinnen und Bürger erwarten zu Recht, dass wir die Verwaltung einfacher und schneller machen.",
+    "Für die Umsetzung brauchen wir verlässliche Strukturen und eine auskömmliche Finanzierung.",
+    "Ich will an dieser Stelle ausdrücklich allen danken, die an diesem Kompromiss mitgewirkt haben.",
+    "Die Zahlen aus der Stellungnahme des Ministeriums sprechen eine deutliche Sprache.",
+    "Es geht um Planungssicherheit für die Schulen, die Träger und die Beschäftigten.",
+    "Gerade im ländlichen Raum sind die Herausforderungen besonders groß.",
+    "Wir werden diesem Gesetzentwurf deshalb zustimmen.",
+    "Sie haben in Ihrem Antrag selbst eingeräumt, dass die Datenlage lückenhaft ist.",
+    "Die Digitalisierung der Verwaltung ist eine Daueraufgabe, die wir gemeinsam angehen müssen.",
+    "Mit den vorgesehenen Änderungen schaffen wir Rechtssicherheit für die Kommunen.",
+    "Das Land trägt dabei einen erheblichen Teil der Kosten, das sollte man nicht vergessen.",
+    "Wer die Förderpraxis vereinfachen will, muss auch bereit sein, Standards zu überprüfen.",
+    "Ich erinnere daran, dass wir diese Debatte bereits im vergangenen Jahr geführt haben.",
+    "Die Anhörung hat gezeigt, dass die Praxis andere Antworten braucht als die, die Sie vorschlagen.",
+    "Vielen Dank für die Aufmerksamkeit.",
+]
+SHOUTS = ["Das stimmt doch gar nicht!", "Sehr richtig!", "Belegen Sie das mal!", "Das bestimmen Sie?",
+          "Ach!", "Wo steht das denn?", "Ja!", "Das ist doch Unsinn!"]
+
+
+def _char_width(ch: str) -> float:
+    """Grobe Helvetica-Breiten (Anteil der Schriftgröße) für Zeilenumbruch und Punktführer."""
+    if ch in " .,:;'!|()-ijltfr":
+        return 0.28
+    if ch in "mwMW":
+        return 0.83
+    if ch.isupper():
+        return 0.67
+    if ch.isdigit():
+        return 0.556
+    return 0.5
+
+
+@lru_cache(maxsize=4096)
+def text_width(text: str, size: float = FONT_SIZE) -> float:
+    return sum(_char_width(c) for c in text) * size
+
+
+def wrap(text: str, width: float = COLUMN_WIDTH) -> List[str]:
+    lines: List[str] = []
+    cur: List[str] = []
+    cur_w = 0.0
+    space = text_width(" ")
+    for word in text.split():
+        w = text_width(word)
+        if cur and cur_w + space + w > width:
+            lines.append(" ".join(cur))
+            cur, cur_w = [word], w
+        else:
+            cur_w += (space if cur else 0.0) + w
+            cur.append(word)
+    if cur:
+        lines.append(" ".join(cur))
+    return lines
+
+
+def dot_leader(label: str, pages: str, width: float = COLUMN_WIDTH) -> str:
+    """„Label . . . . 7639, 7650“ bis zur Spaltenbreite aufgefüllt."""
+    dot = text_width(" .")
+    n = max(1, int((width - text_width(f"{label} . {pages}")) // dot) + 1)
+    return f"{label}{' .' * n} {pages}"
+
+
+# ------------------------- Seitenmodell -------------------------
+
+@dataclass
+class SyntheticPage:
+    number: int                                   # gedruckte Seitenzahl
+    left: List[str] = field(default_factory=list)
+    right: List[str] = field(default_factory=list)
+    header: Optional[Tuple[str, str]] = None      # (links, rechts); Deckblatt ohne Kopf
+
+    def lines(self) -> List[str]:
+        """Zeilen wie aus der Layout-Stufe: linke Spalte, "", rechte Spalte (Kopf/Seitenzahl inklusive)."""
+        left = ([self.header[0]] if self.header else []) + self.left
+        right = ([self.header[1]] if self.header else []) + self.right
+        if self.header:
+            right = right + [str(self.number)]
+        return left + [""] + right
+
+
+@dataclass
+class SyntheticProtocol:
+    pages: List[SyntheticPage]
+    session: int
+    date_text: str
+    truth: Dict[str, int]
+
+    def page_lines(self) -> List[List[str]]:
+        return [p.lines() for p in self.pages]
+
+
+class _Flow:
+    """Verteilt Zeilen auf Spalten und Seiten; relative Seitennummern ab 0."""
+
+    def __init__(self, capacity: int):
+        self.columns: List[List[str]] = [[]]
+        self.capacity = capacity
+        self.cont: Optional[str] = None            # Fortsetzungskopf der laufenden Rede
+        self.n_lines = 0
+
+    @property
+    def page(self) -> int:
+        return (len(self.columns) - 1) // 2
+
+    def add(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            if len(self.columns[-1]) >= COLUMN_LINES:
+                self.columns.append([])
+                if len(self.columns) % 2 == 1 and self.cont:
+                    self.columns[-1].append(f"({self.cont})")
+                    self.n_lines += 1
+            self.columns[-1].append(line)
+            self.n_lines += 1
+
+    def fits(self, n: int) -> bool:
+        return self.n_lines + n <= self.capacity
+
+    def pages(self) -> List[Tuple[List[str], List[str]]]:
+        cols = self.columns + ([[]] if len(self.columns) % 2 else [])
+        return [(cols[i], cols[i + 1]) for i in range(0, len(cols), 2)]
+
+
+# ------------------------- Inhalt -------------------------
+
+@dataclass
+class _Agenda:
+    number: int
+    title_lines: List[str]
+    speakers: List[Tuple[str, List[int]]] = field(default_factory=list)   # TOC-Label, relative Seiten
+    decision_page: Optional[int] = None
+
+
+class _Writer:
+    def __init__(self, rnd: random.Random, session: int, date_text: str, capacity: int):
+        self.rnd = rnd
+        self.session = session
+        self.date_text = date_text
+        self.flow = _Flow(capacity)
+        self.agenda: List[_Agenda] = []
+        self.truth = {"speeches": 0, "events": 0, "toc_items": 0, "drucksachen": 0}
+        self.president = PRESIDENTS[0]
+        self.drs = 8800
+
+    def _drucksache(self) -> str:
+        self.drs += self.rnd.randint(1, 40)
+        self.truth["drucksachen"] += 1
+        return f"Drucksache {LEGISLATIVE_PERIOD}/{self.drs}"
+
+    def _sentences(self, lo: int, hi: int) -> str:
+        return " ".join(self.rnd.choice(SENTENCES) for _ in range(self.rnd.randint(lo, hi)))
+
+    def _event(self, party: str) -> List[str]:
+        self.truth["events"] += 1
+        r = self.rnd.random()
+        other = self.rnd.choice([p for p in PARTIES if p != party])
+        if r < 0.4:
+            text = f"(Beifall bei {PARTY_DATIVE[party]})"
+        elif r < 0.6:
+            name = self.rnd.choice(MEMBERS[other])
+            text = f"(Beifall bei {PARTY_DATIVE[party]} und der Abg. {name} {other})"
+        elif r < 0.75:
+            text = f"(Zuruf des Abg. {self.rnd.choice(MEMBERS[other])} {other})"
+        elif r < 0.9:
+            text = f"(Zuruf von {PARTY_DATIVE[other]}: {self.rnd.choice(SHOUTS)})"
+        else:
+            name = self.rnd.choice(MEMBERS[other])
+            text = (f"(Beifall bei {PARTY_DATIVE[party]} – Abg. {name} {other}: "
+                    f"{self.rnd.choice(SHOUTS)} – Zuruf von {PARTY_DATIVE[self.rnd.choice(PARTIES)]})")
+        return wrap(text)
+
+    def _speech(self, header: str, cont: str, party: Optional[str], paragraphs: int,
+                first: Optional[str] = None) -> int:
+        """Eine Rede; Rückgabe: relative Seite des Redebeginns."""
+        self.truth["speeches"] += 1
+        self.flow.cont = None
+        self.flow.add(wrap(f"{header}: {first or self._sentences(1, 2)}"))
+        start = self.flow.page
+        self.flow.cont = cont
+        for i in range(paragraphs):
+            self.flow.add(wrap(self._sentences(2, 5)))
+            if party and self.rnd.random() < 0.7:
+                self.flow.add(self._event(party))
+            if self.rnd.random() < 0.08:
+                self.truth["events"] += 1
+                self.flow.add(["– Danke für Ihre Aufmerksamkeit." if i == paragraphs - 1 else "– Zuruf: Ja!"])
+        return start
+
+    def _chair(self, text: str) -> None:
+        role, name = self.president
+        self._speech(f"{role} {name}", f"{role} {name}", None, 0, first=text)
+
+    def opening(self) -> None:
+        self.flow.add(["Protokoll", f"über die {self.session}. Sitzung", f"vom {self.date_text}", "Beginn: 9:02 Uhr"])
+        self._chair(f"Guten Morgen, meine Damen und Herren! Ich eröffne die {self.session}. Sitzung des "
+                    f"{LEGISLATIVE_PERIOD}. Landtags von Baden-Württemberg. Im Eingang befindet sich die Mitteilung "
+                    f"der Landesregierung, {self._drucksache()}. – Sie stimmen zu.")
+
+    def item(self) -> bool:
+        """Ein Tagesordnungspunkt; Redner nur, solange sie (geschätzt) noch auf die Zielseitenzahl passen."""
+        if not self.flow.fits(ITEM_MIN_LINES):
+            return False
+        number = len(self.agenda) + 1
+        party = self.rnd.choice(PARTIES)
+        topic = self.rnd.choice(TOPICS)
+        kind = self.rnd.random()
+        if kind < 0.25:
+            title = f"Aktuelle Debatte – {topic} – beantragt von der Fraktion der {party}"
+        elif kind < 0.75:
+            title = (f"Zweite Beratung des Gesetzentwurfs der Landesregierung – Gesetz zur {topic} – "
+                     f"{self._drucksache()} Beschlussempfehlung und Bericht des Ausschusses für "
+                     f"{self.rnd.choice(COMMITTEES)} – {self._drucksache()}")
+        else:
+            title = (f"Antrag der Fraktion der {party} und Stellungnahme des Ministeriums für "
+                     f"{self.rnd.choice(MINISTRIES)} – {topic} – {self._drucksache()}")
+        if self.rnd.random() < 0.2:
+            self.president = self.rnd.choice(PRESIDENTS)
+
+        agenda = _Agenda(number, wrap(f"{number}. {title}"))
+        self.agenda.append(agenda)
+        self.truth["toc_items"] += 1
+        self._chair(f"Ich rufe Punkt {number} der Tagesordnung auf:")
+        self.flow.add(wrap(title))
+        self.flow.add(wrap("Das Präsidium hat für die Aussprache eine Redezeit von fünf Minuten je Fraktion festgelegt."))
+        speakers = [(f"Abg. {self.rnd.choice(MEMBERS[p])}", p) for p in self.rnd.sample(PARTIES, len(PARTIES))]
+        speakers.append(self.rnd.choice(GOVERNMENT) + (None,))
+        for first, second, *rest in speakers:
+            paragraphs = self.rnd.randint(4, 9)
+            # ~5 Zeilen je Absatz mit Ereignis, dazu Überleitung und Abstimmung
+            if not self.flow.fits(paragraphs * 5 + 12):
+                break
+            if rest:                                   # Regierungsmitglied (Rolle, Name, None)
+                label = f"{first} {second}"
+                cont = label
+                party_of = None
+                self._chair(f"Für die Landesregierung erteile ich {label} das Wort.")
+            else:
+                label = f"{first} {second}"
+                cont = first[len("Abg. "):]
+                party_of = second
+                self._chair(f"Für die Fraktion {second} erteile ich {first} das Wort.")
+            page = self._speech(label, cont, party_of, paragraphs)
+            agenda.speakers.append((label, [page]))
+        self._chair("Weitere Wortmeldungen liegen nicht vor. Wir kommen zur Abstimmung. Wer der "
+                    "Beschlussempfehlung zustimmt, den bitte ich um das Handzeichen. – Damit ist so beschlossen.")
+        agenda.decision_page = self.flow.page
+        return True
+
+    def closing(self, next_date: str) -> int:
+        self._chair(f"Damit sind wir am Ende der heutigen Tagesordnung angelangt. Die nächste Sitzung findet "
+                    f"am {next_date}, um 9:30 Uhr statt. Ich schließe die Sitzung.")
+        self.flow.add(["Schluss: 12:43 Uhr"])
+        return self.flow.page
+
+
+def _toc_lines(writer: _Writer, body_offset: int, closing_page: int) -> List[str]:
+    pno = lambda rel: str(FIRST_PAGE_NUMBER + body_offset + rel)
+    lines = [dot_leader("Eröffnung – Mitteilungen der Präsidentin", pno(0))]
+    for ag in writer.agenda:
+        title = ag.title_lines
+        pages = pno(ag.speakers[0][1][0]) if ag.speakers else pno(0)
+        lines.extend(wrap(" ".join(title[:-1]))) if len(title) > 1 else None
+        lines.append(dot_leader(title[-1], pages))
+        for label, rels in ag.speakers:
+            lines.append(dot_leader(label, ", ".join(pno(r) for r in rels)))
+        if ag.decision_page is not None:
+            lines.append(dot_leader("Beschluss", pno(ag.decision_page)))
+    lines.append(dot_leader("Nächste Sitzung", pno(closing_page)))
+    return lines
+
+
+def generate(pages: int = 44, seed: int = 1, session: int = 127) -> SyntheticProtocol:
+    """Protokoll mit etwa pages Seiten (Deckblatt/Inhalt plus Sitzung; Abweichung höchstens eine Seite)."""
+    if pages < 2:
+        raise ValueError("mindestens 2 Seiten (Inhaltsverzeichnis und Sitzung)")
+    date_text = "16. Juli 2025"
+    cover = ["Landtag von Baden-Württemberg", f"Plenarprotokoll {LEGISLATIVE_PERIOD} / {session}",
+             f"{session}. Sitzung", f"{LEGISLATIVE_PERIOD}. Wahlperiode", "Stuttgart, Mittwoch, 16. Juli 2025",
+             "Beginn: 9:02 Uhr Schluss: 12:43 Uhr",
+             "INHALT"]
+    toc_pages = max(1, pages // 60)
+    for _ in range(5):
+        # Inhaltsverzeichnis-Länge hängt von der Zahl der Tagesordnungspunkte ab: bis zur Konvergenz wiederholen
+        rnd = random.Random(seed)
+        capacity = (pages - toc_pages) * 2 * COLUMN_LINES - 2 * COLUMN_LINES // 3
+        writer = _Writer(rnd, session, date_text, capacity)
+        writer.opening()
+        while writer.item():
+            pass
+        closing_page = writer.closing("Donnerstag, 17. Juli 2025")
+        toc = cover + _toc_lines(writer, toc_pages, closing_page)
+        needed = -(-len(toc) // (2 * COLUMN_LINES))
+        if needed == toc_pages:
+            break
+        toc_pages = needed
+
+    result: List[SyntheticPage] = []
+    toc_cols = [toc[i:i + COLUMN_LINES] for i in range(0, len(toc), COLUMN_LINES)]
+    toc_cols += [[]] * (2 * toc_pages - len(toc_cols))
+    for k in range(toc_pages):
+        header = None if k == 0 else (f"Landtag von Baden-Württemberg – {LEGISLATIVE_PERIOD}. Wahlperiode",
+                                      f"– {session}. Sitzung – Mittwoch, {date_text}")
+        result.append(SyntheticPage(FIRST_PAGE_NUMBER - toc_pages + k, toc_cols[2 * k], toc_cols[2 * k + 1], header))
+    for rel, (left, right) in enumerate(writer.flow.pages()):
+        number = FIRST_PAGE_NUMBER + rel
+        header = (f"Landtag von Baden-Württemberg – {LEGISLATIVE_PERIOD}. Wahlperiode",
+                  f"– {session}. Sitzung – Mittwoch, {date_text}")
+        result.append(SyntheticPage(number, left, right, header))
+    truth = dict(writer.truth, pages=len(result))
+    return SyntheticProtocol(result, session, date_text, truth)
+
+
+# ------------------------- Ausgabe -------------------------
+
+def write_fixture(protocol: SyntheticProtocol, path) -> Path:
+    """Layout-Sidecar mit normalized_pages (für bench_stages.py --fixture)."""
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps({
+        "session_ref": {"synthetic": True, "session": protocol.session, "truth": protocol.truth},
+        "layout_debug": {"normalized_pages": protocol.page_lines()},
+    }, ensure_ascii=False), encoding="utf-8")
+    return p
+
+
+def _pdf_string(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _column_ops(x: float, y: float, lines: List[str]) -> List[bytes]:
+    if not lines:
+        return []
+    ops = [b"BT", f"/F1 {FONT_SIZE:g} Tf {LEADING:g} TL {x:.2f} {y:.2f} Td".encode("ascii")]
+    for i, line in enumerate(lines):
+        ops.append(_pdf_string(line) + (b" Tj" if i == 0 else b" '"))
+    ops.append(b"ET")
+    return ops
+
+
+def _page_content(page: SyntheticPage) -> bytes:
+    ops: List[bytes] = []
+    if page.header:
+        ops += _column_ops(LEFT_X0, HEADER_Y, [page.header[0]])
+        ops += _column_ops(RIGHT_X0, HEADER_Y, [page.header[1]])
+        ops += _column_ops(PAGE_WIDTH - LEFT_X0 - 20, FOOTER_Y, [str(page.number)])
+    ops += _column_ops(LEFT_X0, TOP_Y, page.left)
+    ops += _column_ops(RIGHT_X0, TOP_Y, page.right)
+    return b"\n".join(ops)
+
+
+def write_pdf(protocol: SyntheticProtocol, path) -> Path:
+    """Zweispaltige PDF (A4, Helvetica/WinAnsi, Flate-komprimiert), Objekte in einem Durchgang geschrieben."""
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    n = len(protocol.pages)
+    # Objektnummern: 1 Katalog, 2 Seitenbaum, 3 Schrift, dann je Seite (Seite, Inhalt)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    offsets: List[int] = []
+    with p.open("wb") as f:
+        def obj(num: int, body: bytes) -> None:
+            offsets.append(f.tell())
+            f.write(f"{num} 0 obj\n".encode("ascii") + body + b"\nendobj\n")
+
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        obj(2, f"<< /Type /Pages /Count {n} /Kids [{kids}] >>".encode("ascii"))
+        obj(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        for i, page in enumerate(protocol.pages):
+            content = zlib.compress(_page_content(page))
+            obj(4 + 2 * i, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode("ascii"))
+            obj(5 + 2 * i, f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+                + content + b"\nendstream")
+        xref = f.tell()
+        f.write(f"xref\n0 {len(offsets) + 1}\n0000000000 65535 f \n".encode("ascii"))
+        for off in offsets:
+            f.write(f"{off:010d} 00000 n \n".encode("ascii"))
+        f.write(f"trailer\n<< /Size {len(offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+    return p
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Synthetisches Plenarprotokoll erzeugen")
+    ap.add_argument("--pages", type=int, default=44, help="Zielseitenzahl (mindestens 2)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--session", type=int, default=127, help="Sitzungsnummer")
+    ap.add_argument("--pdf", help="Zweispaltige PDF schreiben")
+    ap.add_argument("--fixture", help="Layout-Sidecar (normalized_pages) schreiben")
+    args = ap.parse_args()
+    if not args.pdf and not args.fixture:
+        ap.error("--pdf und/oder --fixture angeben")
+
+    try:
+        protocol = generate(args.pages, seed=args.seed, session=args.session)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    if args.fixture:
+        print(f"[OK] {write_fixture(protocol, args.fixture)}")
+    if args.pdf:
+        print(f"[OK] {write_pdf(protocol, args.pdf)}")
+    print(json.dumps(protocol.truth, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
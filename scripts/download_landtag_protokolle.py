@@ -1,15 +1,23 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
 from pathlib import Path
-import time
+
+from parser_core.crawler import CrawlState, crawl_html, save_unless_failed, write_manifest
+from parser_core.downloader import download_all
 
 BASE_URL = "https://www.landtag-bw.de/de/dokumente/plenarprotokolle"
 SAVE_DIR = Path("downloads/plenarprotokolle")
 SAVE_DIR.mkdir(parents=True, exist_ok=True)
+STATE_PATH = Path(".cache/crawl/plenarprotokolle.json")
+MANIFEST_PATH = Path("downloads/plenarprotokolle_neu.txt")
 
 def get_protokoll_links():
     resp = requests.get(BASE_URL)
-    soup = BeautifulSoup(resp.content, "html.parser")
+    return extract_protokoll_links(resp.content)
+
+def extract_protokoll_links(html):
+    soup = BeautifulSoup(html, "html.parser")
     links = []
     # Die genaue CSS-Klasse/Struktur kann variieren, ggf. anpassen!
     for a in soup.find_all("a", href=True):
@@ -23,19 +31,52 @@ def get_protokoll_links():
             links.append(full_url)
     return links
 
-def download_pdf(url, save_dir):
-    local_name = url.split("/")[-1]
-    out_path = save_dir / local_name
-    if out_path.exists():
-        print(f"Bereits vorhanden: {local_name}")
-        return
-    print(f"Lade herunter: {local_name}")
-    r = requests.get(url)
-    out_path.write_bytes(r.content)
-    time.sleep(2)  # Netiquette: Pausiere zwischen Downloads!
+def _local_path(url, save_dir):
+    return save_dir / url.split("/")[-1]
+
+def _report(result):
+    name = result.url.split("/")[-1]
+    if result.status == "downloaded":
+        print(f"Heruntergeladen: {name} ({result.size} Bytes, sha256 {result.sha256[:12]})")
+    elif result.status in ("cached", "not-modified"):
+        print(f"Bereits vorhanden: {name}" + (" (unverändert laut Server)" if result.status == "not-modified" else ""))
+    else:
+        print(f"Fehler: {name}: {result.error}")
+
+def download_pdfs(urls, save_dir):
+    """Nebenläufig mit Pro-Host-Drosselung, bedingten Anfragen und gestreamtem Schreiben (parser_core.downloader)."""
+    return download_all(
+        urls,
+        dest_for=lambda url: _local_path(url, save_dir),
+        concurrency=4,
+        per_host_concurrency=2,
+        per_host_interval=2.0,  # Netiquette: Anfragen pro Host zeitlich strecken
+        on_result=_report,
+    )
 
 if __name__ == "__main__":
-    links = get_protokoll_links()
-    print(f"Insgesamt {len(links)} Protokolle gefunden.")
-    for link in links:
-        download_pdf(link, SAVE_DIR)
\ No newline at end of file
+    ap = argparse.ArgumentParser(description="Neue Plenarprotokolle von der Übersichtsseite holen")
+    ap.add_argument("--full", action="store_true", help="Zustand ignorieren, alle Links melden")
+    ap.add_argument("--state", default=str(STATE_PATH), help=f"Crawl-Zustand (Default: {STATE_PATH})")
+    ap.add_argument("--manifest", default=str(MANIFEST_PATH),
+                    help=f"Liste der neuen PDF-URLs für parse_landtag_pdf.py --list-file (Default: {MANIFEST_PATH})")
+    ap.add_argument("--no-download", action="store_true", help="Nur Manifest schreiben, keine PDFs laden")
+    args = ap.parse_args()
+
+    state = CrawlState(path=Path(args.state)) if args.full else CrawlState.load(args.state)
+    links, result = crawl_html(BASE_URL, state, extract_protokoll_links)
+    if result.mode == "not-modified":
+        print("Seite unverändert seit dem letzten Lauf.")
+    else:
+        print(f"Insgesamt {len(links)} Protokolle gefunden.")
+    new_links = [item["url"] for item in result.new_items]
+    state.pdf_urls.extend(new_links)
+    print(f"{len(new_links)} neue Protokolle.")
+    write_manifest(args.manifest, new_links)
+    print(f"Manifest: {args.manifest}")
+    results = download_pdfs(new_links, SAVE_DIR) if not args.no_download else []
+    # Zustand (samt ETag) nur fortschreiben, wenn alle Downloads geklappt haben
+    failed = save_unless_failed(state, results)
+    if failed:
+        print(f"{len(failed)} Downloads fehlgeschlagen, Zustand nicht gespeichert (nächster Lauf versucht sie erneut).")
+        exit(1)
\ No newline at end of file
@@ -1,10 +1,16 @@
+import argparse
 import requests
 from pathlib import Path
 
+from parser_core.crawler import CrawlState, crawl_filterlist, new_pdf_links, save_unless_failed, write_manifest
+from parser_core.downloader import download_all
+
 BASE_URL = "https://www.landtag-bw.de/ajax/filterlist/de/plenarprotokolle-509800?noFilterSet=true&offset={offset}"
 
 SAVE_DIR = Path("downloads/plenarprotokolle_17")
 SAVE_DIR.mkdir(parents=True, exist_ok=True)
+STATE_PATH = Path(".cache/crawl/plenarprotokolle_17.json")
+MANIFEST_PATH = Path("downloads/plenarprotokolle_17_neu.txt")
 
 def fetch_json(BASE_URL):
     response = requests.get(BASE_URL)
@@ -20,23 +26,17 @@ def fetch_json(BASE_URL):
         return None
         
 def fetch_all_protokolle():
-    offset = 0
-    all_items = []
-    while True:
-        url = BASE_URL.format(offset=offset)
-        resp = requests.get(url)
-        try:
-            data = resp.json()
-        except ValueError:
-            print("Fehler: Die Antwort ist kein gültiges JSON oder leer.")
-            print("Antwort-Text:", resp.text)
-            break
-        items = data.get("result", [])
-        if not items:
-            break
-        all_items.extend(items)
-        offset += len(items)
-    return all_items
+    """Vollständige Liste (Backfill, Seiten nebenläufig), ohne Zustand zu lesen oder zu schreiben."""
+    return crawl_filterlist(BASE_URL, CrawlState(), full=True).new_items
+
+def fetch_new_protokolle(state, full=False):
+    """
+    Nur Einträge neuer als die gespeicherte Hochwassermarke; täglich meist eine Anfrage.
+    Ohne Zustand (erster Lauf) oder mit full=True: kompletter Backfill.
+    """
+    result = crawl_filterlist(BASE_URL, state, full=full)
+    print(f"{len(result.new_items)} neue Einträge ({result.mode}, {result.requests} Anfragen).")
+    return result.new_items
 
 def get_pdf_links(items):
     pdf_links = []
@@ -50,15 +50,28 @@ def get_pdf_links(items):
                     pdf_links.append(full_url)
     return pdf_links
 
-def download_pdf(url, save_dir):
-    local_name = url.split("/")[-1]
-    out_path = save_dir / local_name
-    if out_path.exists():
-        print(f"Bereits vorhanden: {local_name}")
-        return
-    print(f"Lade herunter: {local_name}")
-    r = requests.get(url)
-    out_path.write_bytes(r.content)
+def _local_path(url, save_dir):
+    return save_dir / url.split("/")[-1]
+
+def _report(result):
+    name = result.url.split("/")[-1]
+    if result.status == "downloaded":
+        print(f"Heruntergeladen: {name} ({result.size} Bytes, sha256 {result.sha256[:12]})")
+    elif result.status in ("cached", "not-modified"):
+        print(f"Bereits vorhanden: {name}" + (" (unverändert laut Server)" if result.status == "not-modified" else ""))
+    else:
+        print(f"Fehler: {name}: {result.error}")
+
+def download_pdfs(urls, save_dir):
+    """Nebenläufig mit Pro-Host-Drosselung, bedingten Anfragen und gestreamtem Schreiben (parser_core.downloader)."""
+    return download_all(
+        urls,
+        dest_for=lambda url: _local_path(url, save_dir),
+        concurrency=4,
+        per_host_concurrency=2,
+        per_host_interval=1.0,  # Netiquette: Anfragen pro Host zeitlich strecken
+        on_result=_report,
+    )
 
 def main():
     data = fetch_json(BASE_URL)
@@ -69,9 +82,23 @@ def main():
     print("Erfolgreich geladen:", data)
 
 if __name__ == "__main__":
-    items = fetch_all_protokolle()
-    print(f"{len(items)} Protokolle insgesamt gefunden.")
-    pdf_links = get_pdf_links(items)
-    print(f"{len(pdf_links)} Protokolle der 17. Wahlperiode gefunden.")
-    for link in pdf_links:
-        download_pdf(link, SAVE_DIR)
+    ap = argparse.ArgumentParser(description="Neue Plenarprotokolle der 17. Wahlperiode holen")
+    ap.add_argument("--full", action="store_true", help="Komplette Liste neu durchgehen (Backfill)")
+    ap.add_argument("--state", default=str(STATE_PATH), help=f"Crawl-Zustand (Default: {STATE_PATH})")
+    ap.add_argument("--manifest", default=str(MANIFEST_PATH),
+                    help=f"Liste der neuen PDF-URLs für parse_landtag_pdf.py --list-file (Default: {MANIFEST_PATH})")
+    ap.add_argument("--no-download", action="store_true", help="Nur Manifest schreiben, keine PDFs laden")
+    args = ap.parse_args()
+
+    state = CrawlState.load(args.state)
+    items = fetch_new_protokolle(state, full=args.full)
+    pdf_links = new_pdf_links(items, state, get_pdf_links)
+    print(f"{len(pdf_links)} neue Protokolle der 17. Wahlperiode gefunden.")
+    write_manifest(args.manifest, pdf_links)
+    print(f"Manifest: {args.manifest}")
+    results = download_pdfs(pdf_links, SAVE_DIR) if not args.no_download else []
+    # Zustand nur fortschreiben, wenn alle Downloads geklappt haben
+    failed = save_unless_failed(state, results)
+    if failed:
+        print(f"{len(failed)} Downloads fehlgeschlagen, Zustand nicht gespeichert (nächster Lauf versucht sie erneut).")
+        exit(1)
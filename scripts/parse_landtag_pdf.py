@@ -28,36 +28,69 @@ Hinweis:
 from __future__ import annotations
 
 import argparse
+import cProfile
 import datetime as dt
+import functools
 import hashlib
 import json
 import math
 import re
 import sys
-import unicodedata
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 from pathlib import Path
 
 import pdfplumber
-import requests
+
+try:
+    from parser_core.batch import format_summary, run_batch, summarize
+    from parser_core.downloader import download_pdf as fetch_pdf
+    from parser_core.pdfcache import PdfStore, content_hash_for_path
+    from parser_core.manifest import REASON_FORCED, REASON_PDF_UNKNOWN, ParseManifest, code_fingerprint
+    from parser_core.flatlines import FlatLines
+    from parser_core.normalize import collapse_ws, nfkc, squeeze_blanks
+    from parser_core.hfbands import HeaderFooterBands, learn_bands
+    from parser_core.config import ENGINE_FIXED_MID, ENGINE_SAMPLED, ENGINES, LayoutConfig, ParserConfig, apply_overrides, load_parser_config
+    from parser_core.pagestream import MemoryProbe, PageSpool, dump_json, format_memory_report
+    from parser_core.spans import (EVENT_DASH, EVENT_PAREN, TOKEN_AGENDA, TOKEN_DASH, TOKEN_HEADER, TOKEN_PAREN,
+                                   TOKEN_TEXT, PageIndex, SessionText, page_start_offsets)
+    from parser_core.stages import StageCache, StageRunner, format_stage_report, instrumentation_summary, measure
+    from parser_core.layout import PageLayoutResult, build_layout_template, layout_page_words, sample_page_numbers
+    from parser_core.wordcache import WordCache, file_sha256
+    from parser_core.wordtable import WordTable, assign_columns, group_lines_by_y, split_by_mid
+except ImportError:  # Import als Paket (scripts.parse_landtag_pdf), z. B. in Tests
+    from .parser_core.batch import format_summary, run_batch, summarize
+    from .parser_core.downloader import download_pdf as fetch_pdf
+    from .parser_core.pdfcache import PdfStore, content_hash_for_path
+    from .parser_core.manifest import REASON_FORCED, REASON_PDF_UNKNOWN, ParseManifest, code_fingerprint
+    from .parser_core.flatlines import FlatLines
+    from .parser_core.normalize import collapse_ws, nfkc, squeeze_blanks
+    from .parser_core.hfbands import HeaderFooterBands, learn_bands
+    from .parser_core.config import ENGINE_FIXED_MID, ENGINE_SAMPLED, ENGINES, LayoutConfig, ParserConfig, apply_overrides, load_parser_config
+    from .parser_core.pagestream import MemoryProbe, PageSpool, dump_json, format_memory_report
+    from .parser_core.spans import (EVENT_DASH, EVENT_PAREN, TOKEN_AGENDA, TOKEN_DASH, TOKEN_HEADER, TOKEN_PAREN,
+                                    TOKEN_TEXT, PageIndex, SessionText, page_start_offsets)
+    from .parser_core.stages import StageCache, StageRunner, format_stage_report, instrumentation_summary, measure
+    from .parser_core.layout import PageLayoutResult, build_layout_template, layout_page_words, sample_page_numbers
+    from .parser_core.wordcache import WordCache, file_sha256
+    from .parser_core.wordtable import WordTable, assign_columns, group_lines_by_y, split_by_mid
 
 # ------------------------- Downloader -------------------------
 
-def download_pdf(url_or_path: str, cache_dir: str = ".cache/pdfs", force: bool = False) -> Path:
+def download_pdf(url_or_path: str, cache_dir: str = ".cache/pdfs", force: bool = False,
+                 store: Optional[PdfStore] = None) -> Path:
+    """
+    Lokaler Pfad oder URL; URLs landen gestreamt im inhaltsadressierten PDF-Cache
+    (parser_core.downloader/pdfcache), Rückgabe ist dann der Blob-Pfad.
+    """
     try:
         p = Path(url_or_path)
         if p.exists():
             return p
-        Path(cache_dir).mkdir(parents=True, exist_ok=True)
-        h = hashlib.sha256(url_or_path.encode("utf-8")).hexdigest()[:16]
-        out = Path(cache_dir) / f"{h}.pdf"
-        if out.exists() and not force:
-            return out
-        r = requests.get(url_or_path, timeout=60)
-        r.raise_for_status()
-        out.write_bytes(r.content)
-        return out
+        return fetch_pdf(url_or_path, cache_dir=cache_dir, force=force, store=store)
     except Exception as e:
         raise ValueError(f"Fehler beim Download: {e}")
 
@@ -77,54 +110,31 @@ class PageMeta:
 DOT_LEADERS = re.compile(r"\.{2,}")
 ELLIPSIS = "…"
 
-def _group_lines_by_y(words: List[dict], y_quant: float = 3.0) -> List[List[dict]]:
-    buckets: Dict[int, List[dict]] = {}
-    for w in words:
-        yk = int(round(float(w.get("top", 0.0)) / y_quant))
-        buckets.setdefault(yk, []).append(w)
-    lines = []
-    for yk in sorted(buckets.keys()):
-        line = sorted(buckets[yk], key=lambda w: float(w.get("x0", 0.0)))
-        lines.append(line)
-    return lines
-
-def _words_to_lines_text(words: List[dict]) -> List[str]:
-    lines = _group_lines_by_y(words)
-    out = []
-    for line in lines:
-        out.append(" ".join((w.get("text") or "").strip() for w in line if (w.get("text") or "").strip()))
-    return out
+def _group_lines_by_y(table: WordTable, indices: Optional[List[int]] = None,
+                      y_quant: float = 3.0) -> List[List[int]]:
+    return group_lines_by_y(table, indices, y_quant=y_quant)
 
-def _words_to_lines_with_y(words: List[dict], y_quant: float = 3.0) -> List[Tuple[float, str]]:
-    if not words:
-        return []
-    groups = _group_lines_by_y(words, y_quant=y_quant)
-    lines_with_y: List[Tuple[float, str]] = []
-    for g in groups:
-        g_sorted = sorted(g, key=lambda w: float(w.get("x0", 0.0)))
-        y = float(min(float(w.get("top", 0.0)) for w in g_sorted))
-        text = " ".join((w.get("text") or "").strip() for w in g_sorted if (w.get("text") or "").strip())
-        if text:
-            lines_with_y.append((y, text))
-    lines_with_y.sort(key=lambda t: t[0])
-    return lines_with_y
+def _join_words(table: WordTable, line: List[int]) -> str:
+    return " ".join(t for t in (t.strip() for t in table.texts(line)) if t)
 
-def _words_to_lines_with_xy(words: List[dict], y_quant: float = 3.0) -> List[Tuple[float, float, str]]:
+def _words_to_lines_text(table: WordTable, indices: Optional[List[int]] = None) -> List[str]:
+    return [_join_words(table, line) for line in _group_lines_by_y(table, indices)]
+
+def _words_to_lines_with_xy(table: WordTable, indices: Optional[List[int]] = None,
+                            y_quant: float = 3.0) -> List[Tuple[float, float, str]]:
     """Gruppiert Wörter zu Zeilen und gibt (y_min, x_min, text) zurück, sortiert nach (y,x)."""
-    if not words:
+    if not len(table) or (indices is not None and not indices):
         return []
-    groups = _group_lines_by_y(words, y_quant=y_quant)
+    top = table.top
+    x0 = table.x0
     out: List[Tuple[float, float, str]] = []
-    for g in groups:
-        g_sorted = sorted(g, key=lambda w: float(w.get("x0", 0.0)))
-        y = float(min(float(w.get("top", 0.0)) for w in g_sorted))
-        x = float(min(float(w.get("x0", 0.0)) for w in g_sorted))
-        text = " ".join((w.get("text") or "").strip() for w in g_sorted if (w.get("text") or "").strip())
+    for line in _group_lines_by_y(table, indices, y_quant=y_quant):
+        text = _join_words(table, line)
         text = text.replace(ELLIPSIS, ".")
         text = DOT_LEADERS.sub(" ", text)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = collapse_ws(text)
         if text:
-            out.append((y, x, text))
+            out.append((min(top[i] for i in line), min(x0[i] for i in line), text))
     out.sort(key=lambda t: (t[0], t[1]))
     return out
 
@@ -134,32 +144,18 @@ COLUMN_MARGIN_PTS = 12.0
 HF_TOP_N = 3
 HF_BOTTOM_N = 3
 HF_MIN_SHARE = 0.6
-
-def _sort_words_reading_order(words: List[dict]) -> List[dict]:
-    return sorted(words, key=lambda w: (float(w.get("top", 0.0)), float(w.get("x0", 0.0))))
-
-def _assign_columns(words: List[dict], split_x: float, margin: float = COLUMN_MARGIN_PTS) -> Tuple[List[dict], List[dict], List[dict]]:
-    left: List[dict] = []
-    right: List[dict] = []
-    full: List[dict] = []
-    left_boundary = split_x - margin
-    right_boundary = split_x + margin
-    for w in words:
-        x0 = float(w.get("x0", 0.0))
-        x1 = float(w.get("x1", 0.0))
-        mid = (x0 + x1) * 0.5
-        if x0 < left_boundary and x1 > right_boundary:
-            full.append(w)
-        elif mid < split_x - 0.5:
-            left.append(w)
-        elif mid > split_x + 0.5:
-            right.append(w)
-        else:
-            full.append(w)
-    return left, right, full
-
-def _lines_only_text(lines_with_y: List[Tuple[float, str]]) -> List[str]:
-    return [t for _, t in lines_with_y]
+# Titel/Inhaltsverzeichnis: weder Text-Filter noch Zuschnitt
+HF_SKIP_FIRST_N_PAGES = 3
+# Geometrischer Vorfilter: Lernseiten nach den übersprungenen Seiten; Fußzeilen-Bänder bleiben aus,
+# weil die Seitenzahl in einer Spalte steht und die andere teils darunter weiterläuft
+HF_CROP_LEARN_PAGES = 6
+HF_CROP_FOOTERS = False
+# erhöhen, wenn sich ändert, welche Wörter die Bänder verwerfen (Wort-Cache-Einträge mit Zuschnitt)
+HF_CROP_VERSION = 2
+
+def _assign_columns(table: WordTable, split_x: float,
+                    margin: float = COLUMN_MARGIN_PTS) -> Tuple[List[int], List[int], List[int]]:
+    return assign_columns(table, split_x, margin)
 
 def _merge_hyphenation(lines: List[str]) -> List[str]:
     """
@@ -179,68 +175,471 @@ def _merge_hyphenation(lines: List[str]) -> List[str]:
         out.append(s)
     return out
 
+# ------------------------- Dokumentweiter Wort-Speicher -------------------------
+
+TOC_FALLBACK_MAX_PAGE = 3
+
+@dataclass
+class PageWords:
+    page: int
+    width: float
+    words: WordTable
+
+class DocumentWords:
+    """
+    Wort-Speicher für ein Dokument: Der Layout-Durchlauf legt die extrahierten Wörter hier ab,
+    spätere Stufen (z. B. der TOC-Interleave-Fallback) lesen daraus, statt das PDF erneut zu öffnen.
+    retain: Seitennummern (1-basiert), die behalten werden; None = alle Seiten.
+    """
+    def __init__(self, retain: Optional[Any] = None):
+        self.retain = retain
+        self.page_count: Optional[int] = None
+        # Gelernte Kopf-/Fußzeilen-Bänder, falls der geometrische Vorfilter aktiv war
+        self.hf_bands: Optional[HeaderFooterBands] = None
+        self._pages: Dict[int, PageWords] = {}
+
+    def wants(self, page_number: int) -> bool:
+        return self.retain is None or page_number in self.retain
+
+    def put(self, entry: PageWords) -> None:
+        if self.wants(entry.page):
+            self._pages[entry.page] = entry
+
+    def get(self, page_number: int) -> Optional[PageWords]:
+        return self._pages.get(page_number)
+
+    def __contains__(self, page_number: int) -> bool:
+        return page_number in self._pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+def _extract_page_words(page, bands: Optional[HeaderFooterBands] = None) -> PageWords:
+    words = page.extract_words(use_text_flow=False, keep_blank_chars=False) or []
+    # pdfplumber hält das geparste Layout jeder Seite sonst bis zum Schließen des PDFs im Speicher
+    # (Peak-RSS wächst mit der Seitenzahl); die WordTable ist eine eigenständige Kopie
+    page.close()
+    table = WordTable.from_words(words)
+    if bands:
+        table = bands.filter_table(page.page_number, table)
+    return PageWords(page.page_number, float(page.width or 0.0), table)
+
+def _learn_crop_bands(pdf) -> Tuple[HeaderFooterBands, List[PageWords]]:
+    """
+    Extrahiert die ersten Seiten (übersprungene + Lernseiten) ungefiltert, lernt daraus die
+    Kopf-/Fußzeilen-Bänder und entfernt deren Wörter nachträglich aus den Lernseiten.
+    """
+    n_learn = min(len(pdf.pages), HF_SKIP_FIRST_N_PAGES + HF_CROP_LEARN_PAGES)
+    entries = [_extract_page_words(pdf.pages[i]) for i in range(n_learn)]
+    bands = learn_bands(
+        [(e.page, e.words) for e in entries], _normalize_for_header_footer,
+        min_share=HF_MIN_SHARE, skip_first_n_pages=HF_SKIP_FIRST_N_PAGES, learn_footer=HF_CROP_FOOTERS
+    )
+    if bands:
+        entries = [PageWords(e.page, e.width, bands.filter_table(e.page, e.words)) for e in entries]
+    return bands, entries
+
 # ------------------------- extract_lines_fixed_mid -------------------------
 
-def extract_lines_fixed_mid(pdf_path: Path) -> Tuple[List[List[str]], List[PageMeta]]:
+def _layout_page_fixed_mid(pw_entry: PageWords) -> Tuple[List[str], PageMeta]:
+    return _layout_page_split(pw_entry, pw_entry.width * 0.5, "two-column-fixed-mid")
+
+def _layout_page_split(pw_entry: PageWords, split_x: Optional[float],
+                       method: str) -> Tuple[List[str], PageMeta]:
+    """Zeilen einer Seite bei gegebenem Split (split_x=None: einspaltig)."""
+    pw = pw_entry.width
+    words = pw_entry.words
+    if not len(words):
+        return [], PageMeta(pw_entry.page, "empty", 0.0, 2, 0.0, 0.0, 0, pw)
+
+    if split_x is None:
+        lines = _words_to_lines_text(words)
+        meta = PageMeta(pw_entry.page, method, 0.0, 1, 1.0, 0.0, len(words), float(round(pw, 2)))
+        return _merge_hyphenation(_normalize_layout_lines(lines)), meta
+
+    left_words, right_words = split_by_mid(words, split_x)
+
+    left_lines = _words_to_lines_text(words, left_words)
+    right_lines = _words_to_lines_text(words, right_words)
+
+    lines = left_lines + [""] + right_lines
+    norm = _normalize_layout_lines(lines)
+
+    total = max(1, len(words))
+    meta = PageMeta(
+        page=pw_entry.page,
+        method=method,
+        split_x=float(round(split_x, 2)),
+        columns=2,
+        left_fraction=float(round(len(left_words) / total, 3)),
+        right_fraction=float(round(len(right_words) / total, 3)),
+        words=len(words),
+        page_width=float(round(pw, 2))
+    )
+    return _merge_hyphenation(norm), meta
+
+def _normalize_layout_lines(lines: List[str]) -> List[str]:
+    norm: List[str] = []
+    for l in lines:
+        if l == "":
+            norm.append("")
+            continue
+        l2 = l.replace(ELLIPSIS, ".")
+        l2 = DOT_LEADERS.sub(" ", l2)
+        l2 = collapse_ws(l2)
+        norm.append(l2)
+    return norm
+
+def _extract_page_range_fixed_mid(pdf_path: str, first: int, last: int,
+                                  retain: Optional[Any] = None,
+                                  with_layout: bool = True,
+                                  bands: Optional[HeaderFooterBands] = None) -> List[Tuple[Optional[List[str]], Optional[PageMeta], Optional[PageWords]]]:
+    """
+    Worker: öffnet das PDF selbst und serialisiert die Seiten [first, last) (0-basiert).
+    Wörter werden nur für Seiten zurückgegeben, die der Wort-Speicher behalten will.
+    with_layout=False: nur Wörter extrahieren (Zeilen/Meta bleiben None).
+    bands: Wörter in den Kopf-/Fußzeilen-Bändern direkt nach der Extraktion verwerfen.
+    """
+    out: List[Tuple[Optional[List[str]], Optional[PageMeta], Optional[PageWords]]] = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for i in range(first, last):
+            entry = _extract_page_words(pdf.pages[i], bands)
+            lines, meta = _layout_page_fixed_mid(entry) if with_layout else (None, None)
+            keep = retain is None or entry.page in retain
+            out.append((lines, meta, entry if keep else None))
+    return out
+
+def _page_ranges(n_pages: int, n_chunks: int) -> List[Tuple[int, int]]:
+    """Teilt 0..n_pages in höchstens n_chunks zusammenhängende, möglichst gleich große Bereiche."""
+    n_chunks = max(1, min(n_chunks, n_pages))
+    size, rest = divmod(n_pages, n_chunks)
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    for k in range(n_chunks):
+        end = start + size + (1 if k < rest else 0)
+        if end > start:
+            ranges.append((start, end))
+        start = end
+    return ranges
+
+class _PageEntries:
+    """
+    Iteriert (lines, meta, entry) in Seitenreihenfolge, seriell oder per Prozess-Pool; entry ist None,
+    wenn retain die Seite nicht behalten will. n_pages und bands stehen nach der ersten Seite fest.
+    """
+    def __init__(self, pdf_path: Path, workers: int, retain: Optional[Any],
+                 with_layout: bool = True, crop_header_footer: bool = False):
+        self.pdf_path = pdf_path
+        self.workers = workers
+        self.retain = retain
+        self.with_layout = with_layout
+        self.crop_header_footer = crop_header_footer
+        self.n_pages: Optional[int] = None
+        self.bands: Optional[HeaderFooterBands] = None
+
+    def _item(self, entry: PageWords) -> Tuple[Optional[List[str]], Optional[PageMeta], Optional[PageWords]]:
+        lines, meta = _layout_page_fixed_mid(entry) if self.with_layout else (None, None)
+        keep = self.retain is None or entry.page in self.retain
+        return lines, meta, entry if keep else None
+
+    def __iter__(self):
+        pdf_path, workers = self.pdf_path, self.workers
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            n_pages = self.n_pages = len(pdf.pages)
+            learned: List[PageWords] = []
+            if self.crop_header_footer:
+                self.bands, learned = _learn_crop_bands(pdf)
+                for entry in learned:
+                    yield self._item(entry)
+            first = len(learned)
+            crop = self.bands if self.bands else None
+            if workers <= 1 or n_pages - first <= 1:
+                for page in pdf.pages[first:]:
+                    yield self._item(_extract_page_words(page, crop))
+                return
+
+        # Mehr Bereiche als Worker, damit ungleich teure Seiten sich besser verteilen
+        ranges = [(a + first, b + first) for a, b in _page_ranges(n_pages - first, workers * 2)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            chunks = pool.map(
+                _extract_page_range_fixed_mid,
+                [str(pdf_path)] * len(ranges),
+                [a for a, _ in ranges],
+                [b for _, b in ranges],
+                [self.retain] * len(ranges),
+                [self.with_layout] * len(ranges),
+                [crop] * len(ranges),
+            )
+            for chunk in chunks:
+                yield from chunk
+
+def _extract_entries(pdf_path: Path, workers: int, retain: Optional[Any], on_entry,
+                     with_layout: bool = True,
+                     crop_header_footer: bool = False) -> Tuple[List[List[str]], List[PageMeta], int, Optional[HeaderFooterBands]]:
     pages_text: List[List[str]] = []
     metas: List[PageMeta] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page in pdf.pages:
-            pw = float(page.width or 0.0)
-            words = page.extract_words(use_text_flow=False, keep_blank_chars=False) or []
-            if not words:
-                pages_text.append([])
-                metas.append(PageMeta(page.page_number, "empty", 0.0, 2, 0.0, 0.0, 0, pw))
-                continue
+    stream = _PageEntries(pdf_path, workers, retain, with_layout, crop_header_footer)
+    for lines, meta, entry in stream:
+        if with_layout:
+            pages_text.append(lines)
+            metas.append(meta)
+        if entry is not None:
+            on_entry(entry)
+    return pages_text, metas, stream.n_pages, stream.bands
+
+def iter_lines_fixed_mid(pdf_path: Path, workers: int = 1,
+                         word_store: Optional[DocumentWords] = None,
+                         word_cache: Optional[WordCache] = None,
+                         crop_header_footer: bool = False) -> Iterator[Tuple[List[str], PageMeta]]:
+    """
+    Serialisiert alle Seiten mit fester Mittel-Splittung und liefert sie einzeln (lines, meta).
+    workers > 1: Seitenbereiche werden auf einen Prozess-Pool verteilt; jeder Worker öffnet das PDF
+    selbst, die Ergebnisse kommen in Seitenreihenfolge (identisch zum seriellen Pfad).
+    word_store: wird mit den extrahierten Wörtern gefüllt (jede Seite wird nur einmal geparst);
+    page_count/hf_bands sind gesetzt, sobald der Generator erschöpft ist.
+    word_cache: persistenter Wort-Cache; bei einem Treffer wird pdfplumber gar nicht aufgerufen.
+    crop_header_footer: Kopfzeilen-Bänder auf den ersten Seiten lernen und deren Wörter auf allen
+    übrigen Seiten vor der Zeilenbildung verwerfen (parser_core.hfbands); die Bänder landen in
+    word_store.hf_bands.
+    """
+    cache_key, cached, cached_bands = _word_cache_lookup(word_cache, pdf_path, crop_header_footer)
+    if cached is not None:
+        if word_store is not None:
+            word_store.page_count = len(cached)
+            word_store.hf_bands = cached_bands
+        for entry in cached:
+            if word_store is not None:
+                word_store.put(entry)
+            yield _layout_page_fixed_mid(entry)
+        return
+
+    # Für den Cache werden alle Seiten gebraucht, sonst nur die, die der Wort-Speicher behält
+    to_cache: List[Tuple[int, float, WordTable]] = []
+    if cache_key is not None:
+        retain = None
+    else:
+        retain = () if word_store is None else word_store.retain
+    stream = _PageEntries(pdf_path, workers, retain, crop_header_footer=crop_header_footer)
+    for lines, meta, entry in stream:
+        if entry is not None:
+            if cache_key is not None:
+                to_cache.append((entry.page, entry.width, entry.words))
+            if word_store is not None:
+                word_store.put(entry)
+        yield lines, meta
+    if word_store is not None:
+        word_store.page_count = stream.n_pages
+        word_store.hf_bands = stream.bands
+    _word_cache_store(word_cache, cache_key, to_cache, stream.bands)
+
+def extract_lines_fixed_mid(pdf_path: Path, workers: int = 1,
+                            word_store: Optional[DocumentWords] = None,
+                            word_cache: Optional[WordCache] = None,
+                            crop_header_footer: bool = False) -> Tuple[List[List[str]], List[PageMeta]]:
+    """Wie iter_lines_fixed_mid, aber alle Seiten auf einmal: (pages_text, metas)."""
+    pages_text: List[List[str]] = []
+    metas: List[PageMeta] = []
+    for lines, meta in iter_lines_fixed_mid(pdf_path, workers=workers, word_store=word_store,
+                                            word_cache=word_cache, crop_header_footer=crop_header_footer):
+        pages_text.append(lines)
+        metas.append(meta)
+    return pages_text, metas
 
-            split_x = pw * 0.5
-            mids = [((float(w.get("x0", 0.0)) + float(w.get("x1", 0.0))) / 2.0) for w in words]
-            left_words = [w for w, m in zip(words, mids) if m < split_x]
-            right_words = [w for w, m in zip(words, mids) if m >= split_x]
+def _word_cache_lookup(word_cache: Optional[WordCache], pdf_path: Path,
+                       crop_header_footer: bool = False) -> Tuple[Optional[str], Optional[List[PageWords]], Optional[HeaderFooterBands]]:
+    if word_cache is None:
+        return None, None, None
+    # Gefilterte Wörter sind ein anderer Cache-Eintrag als ungefilterte
+    version = pdfplumber.__version__ + (f"+hfcrop{HF_CROP_VERSION}" if crop_header_footer else "")
+    # Blobs aus dem PdfStore tragen ihren Inhalts-Hash im Namen, die PDF muss nicht erneut gehasht werden
+    cache_key = word_cache.key_for(pdf_path, version, content_hash=content_hash_for_path(pdf_path))
+    cached = word_cache.load_entry(cache_key)
+    if cached is None:
+        return cache_key, None, None
+    pages, meta = cached
+    bands = HeaderFooterBands.from_meta(meta["hf_bands"]) if "hf_bands" in meta else None
+    return cache_key, [PageWords(page_number, width, words) for page_number, width, words in pages], bands
+
+def _word_cache_store(word_cache: Optional[WordCache], cache_key: Optional[str],
+                      pages: List[Tuple[int, float, WordTable]],
+                      bands: Optional[HeaderFooterBands] = None) -> None:
+    if word_cache is None or cache_key is None:
+        return
+    try:
+        word_cache.store(cache_key, pages, {"hf_bands": bands.to_meta()} if bands is not None else None)
+    except OSError as e:
+        print(f"[WARN] Wort-Cache nicht geschrieben: {e}", file=sys.stderr)
 
-            left_lines = _words_to_lines_text(left_words)
-            right_lines = _words_to_lines_text(right_words)
+# ------------------------- Konfigurierbare Layout-Engines -------------------------
 
-            lines = left_lines + [""] + right_lines
+def extract_document_words(pdf_path: Path, workers: int = 1,
+                           word_cache: Optional[WordCache] = None,
+                           crop_header_footer: bool = False) -> Tuple[List[PageWords], Optional[HeaderFooterBands]]:
+    """
+    Wörter aller Seiten (Cache-Treffer ohne pdfplumber, sonst seriell oder per Prozess-Pool) und
+    die ggf. gelernten Kopf-/Fußzeilen-Bänder.
+    """
+    cache_key, cached, bands = _word_cache_lookup(word_cache, pdf_path, crop_header_footer)
+    if cached is not None:
+        return cached, bands
+    entries: List[PageWords] = []
+    _n, _m, _p, bands = _extract_entries(pdf_path, workers, None, entries.append, with_layout=False,
+                                         crop_header_footer=crop_header_footer)
+    _word_cache_store(word_cache, cache_key, [(e.page, e.width, e.words) for e in entries], bands)
+    return entries, bands
+
+def _layout_page_from_result(entry: PageWords, result: PageLayoutResult) -> Tuple[List[str], PageMeta]:
+    if result.columns == 2 and result.split_x is not None:
+        return _layout_page_split(entry, result.split_x, result.method)
+    return _layout_page_split(entry, None, result.method)
+
+def iter_layout_document(entries: List[PageWords], layout: LayoutConfig) -> Iterator[Tuple[List[str], PageMeta]]:
+    """
+    Split-Entscheidung je Seite durch parser_core.layout (engine=histogram: volle Erkennung auf jeder
+    Seite; engine=sampled: Template aus layout.sample_pages Stichprobenseiten, volle Erkennung nur,
+    wenn die Validierung scheitert). Die Zeilen entstehen wie bei fixed-mid (_layout_page_split);
+    PageMeta.method hält fest, welcher Weg pro Seite genommen wurde.
+    """
+    params = layout.page_params()
+    sampled: Dict[int, PageLayoutResult] = {}
+    template = None
+    if layout.engine == ENGINE_SAMPLED:
+        samples = []
+        for page_number in sample_page_numbers(len(entries), layout.sample_pages):
+            entry = entries[page_number - 1]
+            words = entry.words.to_words()
+            result = layout_page_words(words, entry.width, **params)
+            samples.append((entry.page, words, entry.width, result))
+            sampled[entry.page] = result
+        template = build_layout_template(samples, layout.max_straddle_fraction, min_gap=layout.min_gap)
+
+    for entry in entries:
+        result = sampled.get(entry.page)
+        if result is None:
+            result = layout_page_words(entry.words.to_words(), entry.width, template=template, **params)
+        yield _layout_page_from_result(entry, result)
+
+def layout_document(entries: List[PageWords], layout: LayoutConfig) -> Tuple[List[List[str]], List[PageMeta]]:
+    """Wie iter_layout_document, aber alle Seiten auf einmal: (pages_text, metas)."""
+    pages_text: List[List[str]] = []
+    metas: List[PageMeta] = []
+    for lines, meta in iter_layout_document(entries, layout):
+        pages_text.append(lines)
+        metas.append(meta)
+    return pages_text, metas
 
-            norm: List[str] = []
-            for l in lines:
-                if l == "":
-                    norm.append("")
-                    continue
-                l2 = l.replace(ELLIPSIS, ".")
-                l2 = DOT_LEADERS.sub(" ", l2)
-                l2 = re.sub(r"\s+", " ", l2).strip()
-                norm.append(l2)
-            pages_text.append(_merge_hyphenation(norm))
-
-            total = max(1, len(words))
-            metas.append(PageMeta(
-                page=page.page_number,
-                method="two-column-fixed-mid",
-                split_x=float(round(split_x, 2)),
-                columns=2,
-                left_fraction=float(round(len(left_words) / total, 3)),
-                right_fraction=float(round(len(right_words) / total, 3)),
-                words=len(words),
-                page_width=float(round(pw, 2))
-            ))
+def iter_lines(pdf_path: Path, layout: LayoutConfig, workers: int = 1,
+               word_store: Optional[DocumentWords] = None,
+               word_cache: Optional[WordCache] = None) -> Iterator[Tuple[List[str], PageMeta]]:
+    """
+    Serialisiert alle Seiten mit der konfigurierten Layout-Engine, Seite für Seite.
+    fixed-mid extrahiert und liefert inkrementell; histogram/sampled brauchen die Wörter des ganzen
+    Dokuments (Stichprobenseiten), halten aber nur die kompakten Wort-Tabellen, keine pdfplumber-Seiten.
+    """
+    if layout.engine == ENGINE_FIXED_MID:
+        yield from iter_lines_fixed_mid(pdf_path, workers=workers, word_store=word_store, word_cache=word_cache,
+                                        crop_header_footer=layout.crop_header_footer)
+        return
+    entries, bands = extract_document_words(pdf_path, workers=workers, word_cache=word_cache,
+                                            crop_header_footer=layout.crop_header_footer)
+    if word_store is not None:
+        word_store.page_count = len(entries)
+        word_store.hf_bands = bands
+        for entry in entries:
+            word_store.put(entry)
+    yield from iter_layout_document(entries, layout)
+
+def extract_lines(pdf_path: Path, layout: LayoutConfig, workers: int = 1,
+                  word_store: Optional[DocumentWords] = None,
+                  word_cache: Optional[WordCache] = None) -> Tuple[List[List[str]], List[PageMeta]]:
+    """Serialisiert alle Seiten mit der konfigurierten Layout-Engine."""
+    pages_text: List[List[str]] = []
+    metas: List[PageMeta] = []
+    for lines, meta in iter_lines(pdf_path, layout, workers=workers, word_store=word_store, word_cache=word_cache):
+        pages_text.append(lines)
+        metas.append(meta)
     return pages_text, metas
 
 # ------------------------- Header/Footer-Filter -------------------------
 
 _HF_SANITIZE_NUMBERS = re.compile(r"\b\d{1,5}\b")
 
-def _nfkc(s: str) -> str:
-    return unicodedata.normalize("NFKC", s or "")
-
 def _normalize_for_header_footer(s: str) -> str:
-    s = _nfkc(s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = collapse_ws(nfkc(s))
     s = _HF_SANITIZE_NUMBERS.sub("", s)
     s = s.strip(" –—-•,.;:")
     return s
 
+class HeaderFooterLearner:
+    """
+    Textbasierter Kopf-/Fußzeilen-Filter in zwei Durchgängen: observe() sieht nur die obersten top_n
+    und untersten bottom_n Zeilen jeder Seite (Zählung normalisierter Zeilen), finish() bestimmt die
+    Schlüssel, die auf mindestens min_share der Seiten wiederkehren, filter_page() entfernt sie.
+    Der Speicherbedarf hängt nur von der Zahl verschiedener Randzeilen ab, nicht von der Seitenzahl.
+    Schlüssel werden je Randzeile einmal berechnet (observe) und in filter_page wiederverwendet;
+    Zeilen außerhalb der Randbereiche werden nie normalisiert.
+    """
+    def __init__(self, top_n: int = 3, bottom_n: int = 3, min_share: float = 0.6,
+                 skip_first_n_pages: int = 0):
+        self.top_n = top_n
+        self.bottom_n = bottom_n
+        self.min_share = min_share
+        self.skip_first_n_pages = skip_first_n_pages
+        self.total_pages = 0
+        self.top_counts: Dict[str, int] = {}
+        self.bottom_counts: Dict[str, int] = {}
+        self.raw_examples_top: Dict[str, str] = {}
+        self.raw_examples_bottom: Dict[str, str] = {}
+        self.header_keys: set = set()
+        self.footer_keys: set = set()
+        self._keys: Dict[str, str] = {}     # Randzeile -> _normalize_for_header_footer
+
+    def _key(self, ln: str) -> str:
+        key = self._keys.get(ln)
+        if key is None:
+            key = self._keys[ln] = _normalize_for_header_footer(ln)
+        return key
+
+    def observe(self, lines: List[str]) -> None:
+        self.total_pages += 1
+        if self.total_pages <= self.skip_first_n_pages:
+            return
+        tops = [ln for ln in lines[:self.top_n] if ln.strip()]
+        bots = [ln for ln in lines[-self.bottom_n:] if ln.strip()]
+        for ln in tops:
+            key = self._key(ln)
+            if not key:
+                continue
+            self.top_counts[key] = self.top_counts.get(key, 0) + 1
+            self.raw_examples_top.setdefault(key, ln)
+        for ln in bots:
+            key = self._key(ln)
+            if not key:
+                continue
+            self.bottom_counts[key] = self.bottom_counts.get(key, 0) + 1
+            self.raw_examples_bottom.setdefault(key, ln)
+
+    def finish(self) -> Dict[str, Any]:
+        """Legt header_keys/footer_keys fest; Rückgabe: Debug-Info (Beispielzeilen)."""
+        pages = max(1, self.total_pages - self.skip_first_n_pages)
+        self.header_keys = {k for k, c in self.top_counts.items() if c / pages >= self.min_share}
+        self.footer_keys = {k for k, c in self.bottom_counts.items() if c / pages >= self.min_share}
+        return {
+            "headers": [self.raw_examples_top[k] for k in self.header_keys],
+            "footers": [self.raw_examples_bottom[k] for k in self.footer_keys],
+        }
+
+    def filter_page(self, page_number: int, lines: List[str]) -> List[str]:
+        if page_number <= self.skip_first_n_pages:
+            return list(lines)
+        n = len(lines)
+        bottom_start = max(0, n - self.bottom_n)
+        drop = {idx for idx in range(min(self.top_n, n)) if self._key(lines[idx]) in self.header_keys}
+        drop.update(idx for idx in range(bottom_start, n) if self._key(lines[idx]) in self.footer_keys)
+        if not drop:
+            return list(lines)
+        return [ln for idx, ln in enumerate(lines) if idx not in drop]
+
 def filter_repeating_headers_footers(
     pages_lines: List[List[str]],
     top_n: int = 3,
@@ -251,54 +650,11 @@ def filter_repeating_headers_footers(
     if not pages_lines:
         return pages_lines, {"headers": [], "footers": []}
 
-    total_pages = len(pages_lines)
-    top_counts: Dict[str, int] = {}
-    bottom_counts: Dict[str, int] = {}
-    raw_examples_top: Dict[str, str] = {}
-    raw_examples_bottom: Dict[str, str] = {}
-
-    for pi, lines in enumerate(pages_lines, start=1):
-        if pi <= skip_first_n_pages:
-            continue
-        tops = [ln for ln in lines[:top_n] if ln.strip()]
-        bots = [ln for ln in lines[-bottom_n:] if ln.strip()]
-        for ln in tops:
-            key = _normalize_for_header_footer(ln)
-            if not key:
-                continue
-            top_counts[key] = top_counts.get(key, 0) + 1
-            raw_examples_top.setdefault(key, ln)
-        for ln in bots:
-            key = _normalize_for_header_footer(ln)
-            if not key:
-                continue
-            bottom_counts[key] = bottom_counts.get(key, 0) + 1
-            raw_examples_bottom.setdefault(key, ln)
-
-    header_keys = {k for k, c in top_counts.items() if c / max(1, total_pages - skip_first_n_pages) >= min_share}
-    footer_keys = {k for k, c in bottom_counts.items() if c / max(1, total_pages - skip_first_n_pages) >= min_share}
-
-    filtered: List[List[str]] = []
-    for pi, lines in enumerate(pages_lines, start=1):
-        if pi <= skip_first_n_pages:
-            filtered.append(list(lines))
-            continue
-        new_lines: List[str] = []
-        for idx, ln in enumerate(lines):
-            key = _normalize_for_header_footer(ln)
-            is_top_region = idx < top_n
-            is_bottom_region = idx >= max(0, len(lines) - bottom_n)
-            if is_top_region and key in header_keys:
-                continue
-            if is_bottom_region and key in footer_keys:
-                continue
-            new_lines.append(ln)
-        filtered.append(new_lines)
-
-    debug = {
-        "headers": [raw_examples_top[k] for k in header_keys],
-        "footers": [raw_examples_bottom[k] for k in footer_keys],
-    }
+    learner = HeaderFooterLearner(top_n, bottom_n, min_share, skip_first_n_pages)
+    for lines in pages_lines:
+        learner.observe(lines)
+    debug = learner.finish()
+    filtered = [learner.filter_page(pi, lines) for pi, lines in enumerate(pages_lines, start=1)]
     return filtered, debug
 
 # ------------------------- Nachgelagerte Cleanup-Pipeline -------------------------
@@ -320,7 +676,7 @@ def post_cleanup_headers_footers(pages_lines: List[List[str]]) -> List[List[str]
     for page in pages_lines:
         new_lines = []
         for ln in page:
-            t = _nfkc(ln).strip()
+            t = nfkc(ln).strip()
             if not t:
                 continue
             if any(pat.search(t) for pat in POST_HF_PATTERNS):
@@ -352,13 +708,13 @@ INHALT_HEADING_RE = re.compile(r"^\s*I\s*N\s*H\s*A\s*L\s*T\s*$", re.IGNORECASE)
 PROTOKOLL_HEADING_RE = re.compile(r"^\s*Protokoll(\b|$)", re.IGNORECASE)
 
 def looks_like_inhalt_heading(line: str) -> bool:
-    t = _nfkc(line).strip()
+    t = nfkc(line).strip()
     if INHALT_HEADING_RE.match(t):
         return True
     return t.upper() == "INHALT"
 
 def is_body_start_line(line: str) -> bool:
-    t = _nfkc(line).rstrip()
+    t = nfkc(line).rstrip()
     if PROTOKOLL_HEADING_RE.match(t):
         return True
     if HEADER_LINE_RE.match(t):
@@ -368,12 +724,19 @@ def is_body_start_line(line: str) -> bool:
 NUMBERED_START_RE = re.compile(r"^\s*(\d+)\.\s+(.*)$")
 
 def split_toc_and_body(
-    flat_lines: List[Dict[str, Any]],
+    flat_lines: FlatLines,
     stop_at_first_body_header: bool = True
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
-    toc_lines: List[Dict[str, Any]] = []
-    body_lines: List[Dict[str, Any]] = []
-    in_toc = False
+) -> Tuple[FlatLines, FlatLines, Dict[str, Any]]:
+    """
+    TOC- und Body-Zeilen als Sichten auf flat_lines (ohne Kopie); nur Leerzeilen vor dem TOC, die
+    dem Body vorangestellt werden, erzwingen eine Kopie (take). Liste von Zeilen-Dicts geht auch.
+    """
+    flat_lines = FlatLines.coerce(flat_lines)
+    n = len(flat_lines)
+    norm = flat_lines.norm
+    pages = flat_lines.page_numbers()
+    toc_start: Optional[int] = None
+    leading_blank: List[int] = []      # Leerzeilen vor TOC-/Body-Beginn gehören zum Body
     body_start_idx: Optional[int] = None
     body_start_reason: Optional[str] = None
 
@@ -381,55 +744,54 @@ def split_toc_and_body(
         cnt = 0
         for j in range(1, max_ahead + 1):
             k = idx + j
-            if k >= len(flat_lines):
+            if k >= n:
                 break
-            obj2 = flat_lines[k]
-            if obj2.get("page", 9999) > page_limit:
+            if pages[k] > page_limit:
                 break
-            t2 = _nfkc(obj2.get("text") or "")
-            if NUMBERED_START_RE.match(t2):
+            if NUMBERED_START_RE.match(norm(k)):
                 cnt += 1
         return cnt
 
-    for idx, obj in enumerate(flat_lines):
-        text = _nfkc(obj.get("text") or "")
+    for idx in range(n):
+        text = norm(idx)
         if not text.strip():
-            (toc_lines if in_toc else body_lines).append(obj)
+            if toc_start is None:
+                leading_blank.append(idx)
             continue
 
-        if not in_toc:
+        if toc_start is None:
             if looks_like_inhalt_heading(text):
-                in_toc = True
-                toc_lines.append(obj)
+                toc_start = idx
                 continue
-            if obj.get("page", 9999) <= 3 and NUMBERED_START_RE.match(text):
+            if pages[idx] <= 3 and NUMBERED_START_RE.match(text):
                 if _lookahead_numbered(idx, max_ahead=6, page_limit=3) >= 1:
-                    in_toc = True
-                    toc_lines.append(obj)
+                    toc_start = idx
                     continue
             if is_body_start_line(text):
                 body_start_idx = idx
                 body_start_reason = "protokoll" if PROTOKOLL_HEADING_RE.match(text) else "role_header"
-                body_lines.extend(flat_lines[idx:])
                 break
             continue
 
         if PROTOKOLL_HEADING_RE.match(text):
             body_start_idx = idx
             body_start_reason = "protokoll"
-            body_lines.extend(flat_lines[idx:])
             break
 
         if stop_at_first_body_header and HEADER_LINE_RE.match(text):
             body_start_idx = idx
             body_start_reason = "role_header"
-            body_lines.extend(flat_lines[idx:])
             break
 
-        toc_lines.append(obj)
-
-    if not in_toc and not body_lines:
-        body_lines = list(flat_lines)
+    in_toc = toc_start is not None
+    toc_lines = flat_lines[toc_start:body_start_idx if body_start_idx is not None else n] if in_toc else flat_lines[0:0]
+    body_rest = range(body_start_idx, n) if body_start_idx is not None else range(0)
+    if not leading_blank:
+        body_lines = flat_lines[body_rest.start:body_rest.stop] if body_rest else flat_lines[0:0]
+    else:
+        body_lines = flat_lines.take(leading_blank + list(body_rest))
+    if not in_toc and not len(body_lines):
+        body_lines = flat_lines
 
     meta = {
         "inhalt_found": in_toc,
@@ -458,11 +820,10 @@ TRAILING_PAGES_RE = re.compile(r"\s+\d{3,5}(?:\s*,\s*\d{3,5})*\s*$")
 TOC_HEADER_RX = re.compile(r"^\s*(Inhalt|I\s*N\s*H\s*A\s*L\s*T)\s*$", re.IGNORECASE)
 
 def _cleanup_line(s: str) -> str:
-    s = _nfkc(s)
+    s = nfkc(s)
     s = s.replace(ELLIPSIS, ".")
     s = DOT_LEADERS.sub(" ", s)
-    s = re.sub(r"\s+", " ", s)
-    return s.strip()
+    return collapse_ws(s)
 
 def _strip_trailing_pages(s: str) -> str:
     return TRAILING_PAGES_RE.sub("", s).strip(" –—- ").strip()
@@ -471,7 +832,7 @@ def _normalize_party(p: Optional[str]) -> Optional[str]:
     if not p:
         return p
     p = p.replace("GRUENE", "GRÜNE")
-    p = re.sub(r"\s+", " ", p).strip()
+    p = collapse_ws(p)
     return p
 
 def _find_all_drs(text: str) -> List[str]:
@@ -519,14 +880,15 @@ def is_pure_drs_id(s: str) -> bool:
 def is_pure_drucksache_token(s: str) -> bool:
     return bool(re.fullmatch(r"\s*(?:–|—|-)?\s*(?:Drucksache|Drs\.)\s*", s or "", flags=re.IGNORECASE))
 
-def parse_toc(flat_lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+def parse_toc(flat_lines: FlatLines) -> Dict[str, Any]:
+    norms = FlatLines.coerce(flat_lines).norm_texts()
     items: List[Dict[str, Any]] = []
     i = 0
-    n = len(flat_lines)
+    n = len(norms)
     current: Optional[Dict[str, Any]] = None
 
     while i < n:
-        raw = _nfkc(flat_lines[i].get("text") or "")
+        raw = norms[i]
         text = _cleanup_line(raw)
         if not text:
             i += 1
@@ -705,7 +1067,7 @@ def normalize_party_in_name(name_with_party: str) -> Tuple[str, Optional[str]]:
         "AFD": "AfD",
         "AFD.": "AfD",
     }
-    s = remove_fill_dots(_nfkc(name_with_party))
+    s = remove_fill_dots(nfkc(name_with_party))
     tokens = s.split()
     party = None
     for k in range(len(tokens) - 1, -1, -1):
@@ -735,14 +1097,14 @@ def _cleanup_toc_title_noise(title: str) -> str:
     return s.strip()
 
 def looks_like_real_toc_entry(raw_header: str, title: str, raw_lines: List[str]) -> bool:
-    t = (_nfkc(raw_header) + " " + _nfkc(title)).lower()
+    t = (nfkc(raw_header) + " " + nfkc(title)).lower()
     if "wahlperiode" in t or "inhalt" in t:
         return False
     for ln in raw_lines or []:
-        tl = _nfkc(ln).lower()
+        tl = nfkc(ln).lower()
         if "haus des landtags" in tl or "schluss:" in tl:
             return False
-    m = re.match(r"^\s*(\d{1,2})\.\s+", _nfkc(raw_header))
+    m = re.match(r"^\s*(\d{1,2})\.\s+", nfkc(raw_header))
     if not m:
         return False
     num = int(m.group(1))
@@ -758,12 +1120,12 @@ def normalize_toc_items(toc: Dict[str, Any]) -> Dict[str, Any]:
         title_in = it.get("title") or ""
         raw_lines = it.get("raw_lines") or []
 
-        title = _cleanup_toc_title_noise(remove_fill_dots(_nfkc(title_in)))
+        title = _cleanup_toc_title_noise(remove_fill_dots(nfkc(title_in)))
 
         if not looks_like_real_toc_entry(raw_header, title, raw_lines):
             continue
 
-        m = re.match(r"^\s*(\d{1,2})\.", _nfkc(raw_header))
+        m = re.match(r"^\s*(\d{1,2})\.", nfkc(raw_header))
         if not m:
             continue
         num = int(m.group(1))
@@ -834,19 +1196,6 @@ def normalize_toc_items(toc: Dict[str, Any]) -> Dict[str, Any]:
 
     return {"items": norm_items}
 
-def attach_agenda_numbers(speeches: List[Dict[str, Any]]) -> None:
-    current = None
-    for sp in speeches:
-        text = sp.get("text") or ""
-        m = RE_ICH_RUFE_TOP.search(text) or RE_ICH_RUFE_PUNKT.search(text)
-        if m:
-            try:
-                current = int(m.group(1))
-            except ValueError:
-                pass
-        if current is not None:
-            sp["agenda_item_number"] = current
-
 # ------------------------- Speeches (Body) -------------------------
 
 # Erweitert um 'after' zum Einfangen des Textes nach dem Doppelpunkt
@@ -883,22 +1232,6 @@ EVENT_INLINE_SPEAKER_RX = re.compile(
     re.IGNORECASE
 )
 
-def _strip_inline_headers_from_text(text: str) -> str:
-    lines = text.splitlines()
-    out = []
-    for ln in lines:
-        t = _nfkc(ln).strip()
-        if not t:
-            continue
-        if any(rx.search(t) for rx in INLINE_HEADER_NOISE):
-            for rx in INLINE_HEADER_NOISE:
-                t = rx.sub("", t)
-            t = re.sub(r"\s{2,}", " ", t).strip(" –—- ")
-            if not t:
-                continue
-        out.append(t)
-    return "\n".join(out).strip()
-
 def mask_parenthetical_events(text: str) -> str:
     # Ersetzt alles, was in Klammern steht, durch ein Platzhalter-Token (gleiche Länge, damit Indizes bleiben)
     def repl(m):
@@ -971,34 +1304,6 @@ def segment_speeches_from_pages(pages: List[List[str]]) -> List[Dict[str, Any]]:
         sp["index"] = i
     return speeches
 
-def segment_speeches_from_text(full_text: str) -> List[Dict[str, Any]]:
-    # Maskiere Klammer-Events
-    masked_text = mask_parenthetical_events(full_text)
-
-    speeches = []
-    matches = list(HEADER_RX.finditer(masked_text))
-    for i, m in enumerate(matches):
-        start = m.end()
-        end = matches[i+1].start() if i+1 < len(matches) else len(masked_text)
-        # Hole den echten Textausschnitt aus dem Original-Text, nicht dem maskierten
-        orig_start = m.end()
-        orig_end = matches[i+1].start() if i+1 < len(matches) else len(full_text)
-        speeches.append({
-            "index": i,
-            "speaker": m.group("name"),
-            "role": m.group("role"),
-            "party": m.group("party"),
-            "text": m.group("after") + full_text[orig_start:orig_end]
-        })
-    return speeches
-
-def normalize_speech_text(text: str) -> str:
-    t = remove_fill_dots(_nfkc(text))
-    t = _strip_inline_headers_from_text(t)
-    t = re.sub(r"[ \t]+", " ", t)
-    t = re.sub(r"(\n)[ \t]+", r"\1", t)
-    return t.strip()
-
 def _canonical_event_label_from_text(seg: str) -> str:
     """
     Ermittelt den Event-Typ aus einem Segment:
@@ -1070,81 +1375,382 @@ def _flatten_events(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                 e = dict(p)
                 e["group_ref"] = group_ref
                 e["line_index"] = line_ix
+                if "source" in ev:
+                    e["source"] = ev["source"]
                 flat.append(e)
         else:
             flat.append(ev)
     return flat
-  
-def cleanup_speech_events_in_text(sp: Dict[str, Any]) -> None:
+
+# --- Spannen-Modell (SessionText): Reden, Absätze und Events als Spannen über einem Sitzungstext ---
+
+# Vorprüfung wie any(rx.search(...) for rx in INLINE_HEADER_NOISE), ein Suchlauf statt vier
+_INLINE_HEADER_NOISE_ANY = re.compile("|".join(rx.pattern for rx in INLINE_HEADER_NOISE), re.IGNORECASE)
+# Kein INLINE_HEADER_NOISE-Muster trifft ohne eines dieser Wörter in s.lower(); sie enthalten kein
+# i, k oder s, die re.IGNORECASE auch mit ı, K (Kelvin) und ſ gleichsetzt
+_INLINE_HEADER_NOISE_WORDS = re.compile("landtag|wahlper|tzung|plenarproto")
+
+def _has_inline_header_noise(s: str, low: Optional[str] = None) -> bool:
+    """low: s.lower(), falls schon berechnet."""
+    if _INLINE_HEADER_NOISE_WORDS.search(s.lower() if low is None else low) is None:
+        return False
+    return _INLINE_HEADER_NOISE_ANY.search(s) is not None
+
+def _remove_inline_header_noise(s: str) -> str:
+    for rx in INLINE_HEADER_NOISE:
+        s = rx.sub("", s)
+    return re.sub(r"\s{2,}", " ", s).strip(" –—- ")
+
+def _fill_dot_sources(t: str) -> List[Tuple[int, int]]:
     """
-    - Entfernt Event-Zeilen aus dem Redetext
-    - Erzeugt events (inkl. CompositeEvent mit parts) und die flache Sicht events_flat
-    - Mehrzeilige Klammer-Events werden bis zur schließenden Klammer gesammelt
+    (erste, letzte Zeile von t) je Zeile von RE_FILL_DOTS.sub(" ", t): Füllpunkte über Zeilenenden
+    hinweg verschmelzen Zeilen.
     """
-    text = sp.get("text") or ""
-    lines = text.splitlines()
-    body_lines: List[str] = []
-    events: List[Dict[str, Any]] = []
-
-    i = 0
-    while i < len(lines):
-        raw = lines[i]
-        ln = raw.strip()
-
-        # 1) Klammer-Events (möglicherweise mehrzeilig)
-        if ln.startswith("("):
-            start = i
-            buf = [ln]
-            balance = ln.count("(") - ln.count(")")
-            j = i + 1
-            while balance > 0 and j < len(lines):
-                nxt = lines[j].strip()
-                buf.append(nxt)
-                balance += nxt.count("(") - nxt.count(")")
-                j += 1
-            full = " ".join(buf).strip()
-            parts = _split_parenthetical_event_parts(full)
-            ev = {
-                "type": "CompositeEvent",
-                "text": full,
-                "line_index": start,
-                "span": {"start_line_index": start, "end_line_index": j - 1},
-                "parts": parts,
-                "group_id": f"pevt_{start}"
-            }
-            events.append(ev)
-            i = j
-            continue
+    sources: List[Tuple[int, int]] = []
+    first = src = pos = 0
+    for m in RE_FILL_DOTS.finditer(t):
+        for _ in range(t.count("\n", pos, m.start())):
+            sources.append((first, src))
+            src += 1
+            first = src
+        src += t.count("\n", m.start(), m.end())
+        pos = m.end()
+    for _ in range(t.count("\n", pos)):
+        sources.append((first, src))
+        src += 1
+        first = src
+    sources.append((first, src))
+    return sources
+
+class _SessionTokenizer:
+    """
+    Zustand von tokenize_session: Quellzeilen der laufenden Rede werden beim Lesen normalisiert
+    (items), Zeilen, über deren Ende ein Füllpunkt-Lauf gehen kann, warten in window. Am Redeende
+    schreibt speech_end Zeilen nach norm/lines und die Token der Rede nach session.tokens.
+    """
+    def __init__(self, session: SessionText):
+        self.session = session
+        self.chunks: List[str] = []     # Teile von norm, eine je Zeile
+        self.offset = 0                 # Beginn der nächsten Zeile in norm
+        self.head = -1                  # Nummer des laufenden Kopfes, -1 = Vorspann vor dem ersten Kopf
+        self.start = 0                  # Redebeginn in text
+        self.items: List[Tuple[str, int, int]] = []     # (Zeile, Quellbeginn, Quellende in text)
+        self.window: List[Tuple[str, int, int]] = []
+        self.single_dot = False         # window[0] endet mit genau einem Punkt
+        self.callouts: List[int] = []   # items mit "rufe": Kandidaten für den Tagesordnungsaufruf
+
+    def header(self, m: "re.Match[str]") -> None:
+        session = self.session
+        self.head = len(session.speakers)
+        self.start = m.start("after")
+        session.tokens.append(m.start(), self.start, kind=TOKEN_HEADER, speech=self.head, value=m.start("role"))
+        session.speakers.append(m.group("name"))
+        session.roles.append(m.group("role"))
+        session.parties.append(m.group("party"))
+        after = m.group("after")
+        if not session.text.startswith(after, self.start):
+            session.masked_heads[self.head] = after
+        self.line(after, self.start, m.end())
+
+    def line(self, raw: str, a: int, b: int) -> None:
+        """Quellzeile [a, b) der laufenden Rede (die erste ist der Text nach dem Doppelpunkt)."""
+        t = nfkc(raw)
+        r = t.rstrip()
+        window = self.window
+        if window:
+            if r and self.single_dot and len(window) == 1 and not t.lstrip().startswith("."):
+                # ein Punkt vor dem Zeilenende, keiner danach: kein Füllpunkt-Lauf über die Grenze
+                line, a0, b0 = window.pop()
+                self._push(RE_FILL_DOTS.sub(" ", line) if line.count(".") > 1 else line, a0, b0)
+            else:
+                window.append((t, a, b))
+                if r and r[-1] != ".":
+                    self._flush_window()
+                return
+        if not r:
+            return
+        if r[-1] == ".":
+            window.append((t, a, b))
+            self.single_dot = not r[:-1].rstrip().endswith(".")
+        else:
+            self._push(RE_FILL_DOTS.sub(" ", t) if t.count(".") > 1 else t, a, b)
+
+    def _flush_window(self) -> None:
+        window, self.window = self.window, []
+        t = "\n".join(line for line, _a, _b in window)
+        if t.count(".") < 2:
+            for line, a, b in window:
+                self._push(line, a, b)
+            return
+        for line, (first, last) in zip(RE_FILL_DOTS.sub(" ", t).split("\n"), _fill_dot_sources(t)):
+            self._push(line, window[first][1], window[last][2])
+
+    def _push(self, line: str, a: int, b: int) -> None:
+        # line ist NFKC, Füllpunkte sind ersetzt; Teilzeilen gestrippt, Kopfzeilen-Reste (INLINE_HEADER_NOISE)
+        # entfernt, was danach leer ist oder nur aus Leerraum besteht, entfällt
+        for ln in line.splitlines():
+            s = ln.strip()
+            if not s:
+                continue
+            low = s.lower()
+            if _has_inline_header_noise(s, low):
+                s = _remove_inline_header_noise(s)
+                if not s or s.isspace():
+                    continue
+                low = s.lower()
+            if "rufe" in low:
+                self.callouts.append(len(self.items))
+            self.items.append((s, a, b))
+
+    def speech_end(self) -> None:
+        if self.window:
+            self._flush_window()
+        self._write(self.items, self.callouts)
+        self.items, self.callouts = [], []
+
+    def _write(self, items: List[Tuple[str, int, int]], callouts: List[int]) -> None:
+        session = self.session
+        line_starts, line_ends = session.lines.starts, session.lines.ends
+        src_starts, src_ends = session.lines.column("src_start"), session.lines.column("src_end")
+        chunks = self.chunks
+        base, offset = len(chunks), self.offset
+        tokens: List[Tuple[int, int, int]] = []     # (Art, erste, letzte Zeile relativ zur Rede)
+        depth = 0           # offene Klammern des laufenden Klammer-Events
+        event = para = -1   # erste Zeile des offenen Klammer-Events / Absatzes
+        has_text = False
+        last = len(items) - 1
+        for k, (s, a, b) in enumerate(items):
+            # Leerraum: [ \t]+ -> " ", Zeilenanfänge und Anfang/Ende der Rede gestrippt
+            if k == 0:
+                s = s.lstrip()
+            if k == last:
+                s = s.rstrip()
+            s = squeeze_blanks(s)
+            if k:
+                s = s.lstrip(" \t")
+            chunks.append(s)
+            line_starts.append(offset)
+            offset += len(s)
+            line_ends.append(offset)
+            offset += 1
+            src_starts.append(a)
+            src_ends.append(b)
+
+            # Events: "(" am Zeilenanfang bis zur ausgeglichenen Klammer, Dash-Events (DASH_EVENT_RE)
+            ln = s.strip()
+            if depth > 0:
+                depth += ln.count("(") - ln.count(")")
+                if depth <= 0:
+                    tokens.append((TOKEN_PAREN, event, k))
+                continue
+            if ln.startswith("("):
+                kind, depth, event = TOKEN_PAREN, ln.count("(") - ln.count(")"), k
+            elif ln[:1] in "–-" and DASH_EVENT_RE.match(ln):
+                kind = TOKEN_DASH
+            else:
+                if para < 0:
+                    para = k
+                has_text = has_text or bool(ln)
+                continue
+            if para >= 0:
+                tokens.append((TOKEN_TEXT, para, k - 1))
+                para = -1
+            if depth <= 0:
+                tokens.append((kind, k, k))
+        if depth > 0:
+            tokens.append((TOKEN_PAREN, event, last))
+        if para >= 0:
+            tokens.append((TOKEN_TEXT, para, last))
+
+        if not has_text:
+            # Rede ohne Redetext (nur Events): entfällt, nur der Kopf bleibt im Tokenstrom
+            del chunks[base:], line_starts[base:], line_ends[base:], src_starts[base:], src_ends[base:]
+            return
+        self.offset = offset
+        out = session.tokens
+        cols = out.columns
+        for kind, first, last in tokens:
+            out.starts.append(src_starts[base + first])
+            out.ends.append(src_ends[base + last])
+            cols["kind"].append(kind)
+            cols["speech"].append(self.head)
+            cols["first_line"].append(base + first)
+            cols["last_line"].append(base + last)
+            cols["value"].append(0)
+        if callouts:
+            rows = [base + k for kind, first, last in tokens if kind == TOKEN_TEXT for k in range(first, last + 1)]
+            self._agenda(rows, [base + k for k in callouts])
+
+    def _agenda(self, rows: List[int], callouts: List[int]) -> None:
+        """
+        Erster Tagesordnungsaufruf (RE_ICH_RUFE_TOP, sonst RE_ICH_RUFE_PUNKT) im Redetext, d. h. in den
+        Absatzzeilen ohne Events (rows), verbunden mit "\\n". Ein
+        Treffer enthält "rufe" und reicht über höchstens einen Zeilenumbruch je Leerraum; da keine Zeile
+        leer ist, liegt er in den Zeilen um eine "rufe"-Zeile herum.
+        """
+        chunks = self.chunks
+        position = {k: i for i, k in enumerate(rows)}
+        windows = [(max(position[k] - 1, 0), position[k] + 3) for k in callouts if k in position]
+        for lo, hi in windows:
+            text = "\n".join(chunks[k] for k in rows[lo:hi])
+            m = RE_ICH_RUFE_TOP.search(text) or RE_ICH_RUFE_PUNKT.search(text)
+            if m:
+                break
+        else:
+            return
+        first = last = -1
+        pos = 0
+        for k in rows[lo:hi]:
+            pos += len(chunks[k]) + 1
+            if first < 0 and m.start() < pos:
+                first = k
+            if m.end() <= pos:
+                last = k
+                break
+        lines = self.session.lines.columns
+        self.session.tokens.append(lines["src_start"][first], lines["src_end"][last], kind=TOKEN_AGENDA,
+                                   speech=self.head, first_line=first, last_line=last, value=int(m.group(1)))
 
-        # 2) Dash-Events: – Label …
-        m_dash = DASH_EVENT_RE.match(ln)
-        if m_dash:
-            # label aus dem Text (mit „Anhaltender Beifall“-Heuristik)
-            label = _canonical_event_label_from_text(ln.lstrip("–- ").strip())
-            events.append({"type": label, "text": ln, "line_index": i})
-            i += 1
-            continue
+def tokenize_session(full_text: str, page_starts: Optional[Sequence[int]] = None) -> SessionText:
+    """
+    Ein Durchlauf über full_text, Zeile für Zeile: an jedem nicht maskierten Zeilenanfang wird HEADER_RX
+    versucht (wie finditer auf mask_parenthetical_events(full_text), das nur dort treffen kann), die
+    übrigen Zeilen werden als Redezeilen normalisiert (NFKC, Füllpunkte, Kopfzeilen-Reste, Leerraum) und
+    als Absatz- oder Event-Zeilen klassifiziert, mit der Klammertiefe über die Zeilen hinweg.
+    Ergebnis: norm/lines aller nicht leeren Reden und der Tokenstrom session.tokens – je Kopf ein
+    TOKEN_HEADER, danach Absätze (TOKEN_TEXT), Events (TOKEN_PAREN, TOKEN_DASH) in Zeilenfolge und ggf.
+    ein TOKEN_AGENDA. build_speech_spans baut daraus Reden, Absätze und Events.
+    page_starts: Seitenanfänge in full_text (page_start_offsets) für die Herkunftsangaben.
+    """
+    session = SessionText(full_text, PageIndex(full_text, page_starts))
+    masked = mask_parenthetical_events(full_text)
+    tok = _SessionTokenizer(session)
+    n = len(full_text)
+    q = pos = 0     # q: Kopf-Kandidat ("\n" vor der Zeile ab pos, bzw. Textanfang)
+    while True:
+        m = HEADER_RX.match(masked, q) if q == 0 or masked[q] == "\n" else None
+        if m:
+            if tok.head >= 0:
+                tok.speech_end()
+            tok.header(m)
+            q = m.end()
+        else:
+            q = full_text.find("\n", pos)
+            if q < 0:
+                q = n
+            if tok.head >= 0:
+                tok.line(full_text[pos:q], pos, q)
+        if q >= n:
+            break
+        pos = q + 1
+    if tok.head >= 0:
+        tok.speech_end()
+    session.norm = "\n".join(tok.chunks)
+    return session
 
-        # 3) Normale Redezeile
-        body_lines.append(raw)
-        i += 1
+def build_speech_spans(session: SessionText) -> SessionText:
+    """
+    Verbraucht den Tokenstrom von tokenize_session: je TOKEN_HEADER eine Rede bis zum nächsten Kopf
+    (ohne Zeilen-Token entfällt sie, die übrigen werden neu nummeriert), Absätze aus TOKEN_TEXT, Events
+    aus TOKEN_PAREN/TOKEN_DASH, Tagesordnungspunkt aus TOKEN_AGENDA (gilt für die folgenden Reden bis zum
+    nächsten Aufruf). norm und lines werden übernommen, nicht kopiert.
+    """
+    out = SessionText(session.text, session.pages, norm=session.norm, lines=session.lines)
+    tokens = session.tokens
+    cols = tokens.columns
+    kinds, heads, firsts, lasts, values = (cols["kind"], cols["speech"], cols["first_line"], cols["last_line"],
+                                           cols["value"])
+    line_starts, line_ends = session.lines.starts, session.lines.ends
+    agenda: Optional[int] = None
+    n = len(tokens)
+    i = 0
+    while i < n:
+        j = i + 1
+        while j < n and kinds[j] != TOKEN_HEADER:
+            j += 1
+        if j > i + 1:
+            idx = len(out)
+            first_line = end_line = firsts[i + 1]
+            first_paragraph, first_event = len(out.paragraphs), len(out.events)
+            for t in range(i + 1, j):
+                kind, a, b = kinds[t], firsts[t], lasts[t]
+                if kind == TOKEN_AGENDA:
+                    agenda = values[t]
+                    continue
+                end_line = b + 1
+                if kind == TOKEN_TEXT:
+                    out.paragraphs.append(line_starts[a], line_ends[b], speech=idx)
+                else:
+                    out.events.append(line_starts[a], line_ends[b], speech=idx, first_line=a - first_line,
+                                      last_line=b - first_line, kind=EVENT_PAREN if kind == TOKEN_PAREN else EVENT_DASH)
+            h = heads[i]
+            out.speeches.append(tokens.ends[i], tokens.starts[j] if j < n else len(session.text), head=values[i],
+                                first_line=first_line, end_line=end_line,
+                                first_paragraph=first_paragraph, end_paragraph=len(out.paragraphs),
+                                first_event=first_event, end_event=len(out.events))
+            out.speakers.append(session.speakers[h])
+            out.roles.append(session.roles[h])
+            out.parties.append(session.parties[h])
+            out.agenda_items.append(agenda)
+            if h in session.masked_heads:
+                out.masked_heads[idx] = session.masked_heads[h]
+        i = j
+    return out
 
-    sp["text"] = "\n".join(body_lines).strip()
-    if events:
-        sp["events"] = events
-        sp["events_flat"] = _flatten_events(events)
+def _span_event_dict(session: SessionText, pages: PageIndex, e: int) -> Dict[str, Any]:
+    cols = session.events.columns
+    first, last = cols["first_line"][e], cols["last_line"][e]
+    base = session.speeches.columns["first_line"][cols["speech"][e]]
+    source = pages.source(*session.source_span(base + first, base + last))
+    if cols["kind"][e] == EVENT_DASH:
+        ln = session.line(base + first).strip()
+        return {"type": _canonical_event_label_from_text(ln.lstrip("–- ").strip()), "text": ln, "line_index": first,
+                "source": source}
+    full = " ".join(session.line(k).strip() for k in range(base + first, base + last + 1)).strip()
+    return {
+        "type": "CompositeEvent",
+        "text": full,
+        "line_index": first,
+        "span": {"start_line_index": first, "end_line_index": last},
+        "parts": _split_parenthetical_event_parts(full),
+        "group_id": f"pevt_{first}",
+        "source": source
+    }
 
-def _normalize_speeches(speeches: List[Dict[str, Any]]) -> None:
-    for sp in speeches:
-        sp["text"] = normalize_speech_text(sp.get("text") or "")
-        cleanup_speech_events_in_text(sp)
-    attach_agenda_numbers(speeches)
+def _speech_source(session: SessionText, pages: PageIndex, i: int) -> Dict[str, int]:
+    """Von der Kopfzeile bis zum letzten Zeichen vor dem nächsten Kopf (ohne Leerraum am Ende)."""
+    head = session.speeches.columns["head"][i]
+    end = session.speeches.ends[i]
+    text = session.text
+    while end > head and text[end - 1].isspace():
+        end -= 1
+    return pages.source(head, end)
 
-def prune_empty_speeches(speeches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    pruned = [sp for sp in speeches if (sp.get("text") or "").strip()]
-    for i, sp in enumerate(pruned):
-        sp["index"] = i
-    return pruned
+def speech_dicts(session: SessionText) -> List[Dict[str, Any]]:
+    """
+    Serialisierungsform (Liste von Rede-Dicts wie bisher); Redetext und Events werden erst hier erzeugt.
+    Reden und Events tragen zusätzlich "source": PDF-Seite (ab 1) und Zeile (ab 0, bereinigte Seite wie
+    post_cleaned_pages im Sidecar) von Anfang und Ende sowie Zeichen-Offsets im Volltext.
+    """
+    pages = session.pages or PageIndex(session.text)
+    speeches: List[Dict[str, Any]] = []
+    for i in range(len(session)):
+        sp = {
+            "index": i,
+            "speaker": session.speakers[i],
+            "role": session.roles[i],
+            "party": session.parties[i],
+            "text": session.speech_text(i),
+            "source": _speech_source(session, pages, i),
+        }
+        events = [_span_event_dict(session, pages, e) for e in session.speech_events(i)]
+        if events:
+            sp["events"] = events
+            sp["events_flat"] = _flatten_events(events)
+        if session.agenda_items[i] is not None:
+            sp["agenda_item_number"] = session.agenda_items[i]
+        speeches.append(sp)
+    return speeches
 
 # ------------------------- Metadata helpers -------------------------
 
@@ -1224,21 +1830,58 @@ def parse_breaks(all_text: str) -> List[Dict[str, Any]]:
 
 # ------------------------- Flat-lines helper -------------------------
 
-def pages_to_flat_lines(pages: List[List[str]]) -> List[Dict[str, Any]]:
-    flat: List[Dict[str, Any]] = []
-    for pi, lines in enumerate(pages, start=1):
-        for li, t in enumerate(lines):
-            flat.append({"page": pi, "line_index": li, "text": t})
-    return flat
+def pages_to_flat_lines(pages: List[List[str]]) -> FlatLines:
+    return FlatLines.from_pages(pages)
+
+# split_toc_and_body schaut für nummerierte TOC-Starts nur auf Seiten <= 3 voraus
+TOC_LOOKAHEAD_MAX_PAGE = 3
+
+class TocLineCollector:
+    """
+    Inkrementelles Gegenstück zu split_toc_and_body(pages_to_flat_lines(pages)) für den Streaming-Modus:
+    Flache Zeilen werden nur gesammelt, bis der Body-Start feststeht. Sobald eine Seite eine mögliche
+    Body-Start-Zeile enthält (und die Vorausschau-Seiten vollständig sind), wird der Split auf dem
+    bisherigen Präfix ausgeführt; ein dort gefundener Body-Start ist auch der des ganzen Dokuments.
+    """
+    def __init__(self, stop_at_first_body_header: bool = True):
+        self.stop_at_first_body_header = stop_at_first_body_header
+        self.flat = FlatLines()
+        self._pending_candidate = False
+        self._result: Optional[Tuple[FlatLines, Dict[str, Any]]] = None
+
+    @staticmethod
+    def _is_candidate(t: str) -> bool:
+        """t: bereits NFKC-normalisiert (FlatLines.norm)."""
+        return bool(PROTOKOLL_HEADING_RE.match(t) or HEADER_LINE_RE.match(t) or is_body_start_line(t))
+
+    def feed(self, page_number: int, lines: List[str]) -> None:
+        if self._result is not None:
+            return
+        first = len(self.flat)
+        self.flat.extend_page(page_number, lines)
+        self._pending_candidate = self._pending_candidate or any(
+            self._is_candidate(self.flat.norm(i)) for i in range(first, len(self.flat)))
+        if self._pending_candidate and page_number >= TOC_LOOKAHEAD_MAX_PAGE:
+            self._pending_candidate = False
+            toc_lines, _body, meta = split_toc_and_body(self.flat, self.stop_at_first_body_header)
+            if meta["body_start_index"] is not None:
+                self._result = (toc_lines.compact(), meta)
+                self.flat = FlatLines()
+
+    def finish(self) -> Tuple[FlatLines, Dict[str, Any]]:
+        """(toc_lines, meta) wie split_toc_and_body; body_lines werden nicht aufbewahrt."""
+        if self._result is None:
+            toc_lines, _body, meta = split_toc_and_body(self.flat, self.stop_at_first_body_header)
+            self._result = (toc_lines.compact(), meta)
+            self.flat = FlatLines()
+        return self._result
 
 # ------------------------- Party enrichment & TOC backfill -------------------------
 
 def _normalize_person_name(n: Optional[str]) -> Optional[str]:
     if not n:
         return n
-    n2 = unicodedata.normalize("NFKC", n)
-    n2 = re.sub(r"\s+", " ", n2).strip()
-    return n2
+    return collapse_ws(nfkc(n))
 
 def enrich_toc_parties_from_speeches(toc: Dict[str, Any], speeches: List[Dict[str, Any]]) -> None:
     idx: Dict[str, str] = {}
@@ -1287,26 +1930,80 @@ def backfill_toc_speakers_from_speeches(toc: Dict[str, Any], speeches: List[Dict
             continue
         item["speakers"] = [{"role": r, "name": n, "party": p, "pages": None} for (r, n, p) in seq]
 
+def link_toc_to_speeches(toc: Dict[str, Any], speeches: List[Dict[str, Any]]) -> None:
+    """
+    Verknüpft TOC-Items mit ihren Reden (agenda_item_number) über deren "source": das Item bekommt
+    die Spanne von der ersten bis zur letzten Rede des Punkts, jeder Redner speech_index und source
+    seiner ersten Rede darin.
+    """
+    by_agenda: Dict[int, List[Dict[str, Any]]] = {}
+    for sp in speeches:
+        num = sp.get("agenda_item_number")
+        if isinstance(num, int) and sp.get("source"):
+            by_agenda.setdefault(num, []).append(sp)
+    for item in toc.get("items", []):
+        num = item.get("number")
+        matched = by_agenda.get(num) if isinstance(num, int) else None
+        if not matched:
+            continue
+        first, last = matched[0]["source"], matched[-1]["source"]
+        item["source"] = {
+            "first_speech": matched[0]["index"],
+            "last_speech": matched[-1]["index"],
+            "start_page": first["start_page"],
+            "start_line": first["start_line"],
+            "end_page": last["end_page"],
+            "end_line": last["end_line"],
+        }
+        first_by_name: Dict[str, Dict[str, Any]] = {}
+        for sp in matched:
+            name = _normalize_person_name(sp.get("speaker"))
+            if name and name not in first_by_name:
+                first_by_name[name] = sp
+        for s in item.get("speakers") or []:
+            sp = first_by_name.get(_normalize_person_name(s.get("name")) or "")
+            if sp is not None:
+                s["speech_index"] = sp["index"]
+                s["source"] = sp["source"]
+
 # ------------------------- TOC Fallback (interleaved) -------------------------
 
-def extract_toc_interleaved_flat_lines(pdf_path: Path, first_page: int = 1, last_page: int = 3) -> List[Dict[str, Any]]:
-    """Extrahiert die ersten Seiten spaltenübergreifend in (y,x)-Lesereihenfolge für robustes TOC-Parsen."""
-    flat: List[Dict[str, Any]] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        last = min(len(pdf.pages), max(1, last_page))
+def _interleaved_flat_lines_for_page(entry: PageWords, flat: FlatLines) -> None:
+    if not len(entry.words):
+        return
+    split_x = entry.width * 0.5
+    left, right, full = _assign_columns(entry.words, split_x=split_x, margin=COLUMN_MARGIN_PTS)
+    lines_xy = _words_to_lines_with_xy(entry.words, full + left + right)
+    for li, (_y, _x, text) in enumerate(lines_xy):
+        if text.strip():
+            flat.append(entry.page, li, text)
+
+def extract_toc_interleaved_flat_lines(pdf_path: Path, first_page: int = 1, last_page: int = 3,
+                                       word_store: Optional[DocumentWords] = None) -> FlatLines:
+    """
+    Extrahiert die ersten Seiten spaltenübergreifend in (y,x)-Lesereihenfolge für robustes TOC-Parsen.
+    Liegen die Wörter bereits im word_store, wird das PDF nicht erneut geöffnet.
+    """
+    def _page_span(n_pages: int) -> range:
+        last = min(n_pages, max(1, last_page))
         first = max(1, min(first_page, last))
-        for pidx in range(first, last + 1):
-            page = pdf.pages[pidx - 1]
-            pw = float(page.width or 0.0)
-            split_x = pw * 0.5
-            words = page.extract_words(use_text_flow=False, keep_blank_chars=False) or []
-            if not words:
-                continue
-            left, right, full = _assign_columns(words, split_x=split_x, margin=COLUMN_MARGIN_PTS)
-            lines_xy = _words_to_lines_with_xy(full + left + right)
-            for li, (_y, _x, text) in enumerate(lines_xy):
-                if text.strip():
-                    flat.append({"page": pidx, "line_index": li, "text": text})
+        return range(first, last + 1)
+
+    if word_store is not None and word_store.page_count is not None:
+        span = _page_span(word_store.page_count)
+        if all(pidx in word_store for pidx in span):
+            flat = FlatLines()
+            for pidx in span:
+                _interleaved_flat_lines_for_page(word_store.get(pidx), flat)
+            return flat
+
+    flat = FlatLines()
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        for pidx in _page_span(len(pdf.pages)):
+            entry = _extract_page_words(pdf.pages[pidx - 1])
+            if word_store is not None:
+                word_store.put(entry)
+            _interleaved_flat_lines_for_page(entry, flat)
     return flat
 
 def pick_better_toc(primary: Dict[str, Any], fallback: Dict[str, Any]) -> Dict[str, Any]:
@@ -1368,9 +2065,9 @@ def extract_next_meeting_from_toc_and_strip(toc: Dict[str, Any]) -> Tuple[Option
         raw_lines = it.get("raw_lines") or []
         stripped_raw = []
         skip_from_here = False
-        for ln in raw_lines:
+        for pos, ln in enumerate(raw_lines):
             if not skip_from_here and NEXT_MEETING_RE.search(ln):
-                nm2 = _extract_next_meeting_from_text(" ".join(raw_lines[raw_lines.index(ln):]))
+                nm2 = _extract_next_meeting_from_text(" ".join(raw_lines[pos:]))
                 if nm2 and not next_meeting:
                     next_meeting = nm2
                 skip_from_here = True
@@ -1400,23 +2097,109 @@ def build_session_filename(payload: Dict[str, Any]) -> str:
     short = hashlib.sha256(url).hexdigest()[:8] if url else "na"
     return f"session_unknown_{short}.json"
 
-def process_pdf(url: str, force_download: bool) -> Dict[str, Any]:
-    pdf_path = download_pdf(url, force=force_download)
+@dataclass
+class PageStage:
+    """Ergebnis der Seitenstufen (Layout, Header/Footer-Filter, Cleanup) für die Dokument-Stufen."""
+    text: str                           # Volltext: bereinigte Seiten, zeilenweise mit "\n" verbunden
+    page_starts: Sequence[int]          # Beginn jeder Seite im Volltext (page_start_offsets)
+    toc_lines: FlatLines
+    metas: List[PageMeta]
+    hf_debug: Dict[str, Any]
+    n_pages: int
+    debug_pages: Dict[str, Any]         # normalized/filtered/post_cleaned: Listen oder PageSpools
+
+def _page_stage_streaming(pdf_path: Path, layout_cfg: LayoutConfig, workers: int,
+                          word_store: DocumentWords, word_cache: Optional[WordCache]) -> PageStage:
+    """
+    Dasselbe Ergebnis wie stage_layout -> stage_header_footer -> stage_cleanup, aber Seite für Seite:
+    1. Durchgang: Layout-Generator -> Seiten in einen PageSpool (Temp-Datei), der Header/Footer-Lerner
+       sieht nur die Randzeilen.
+    2. Durchgang: Seiten aus dem Spool filtern, entbinden, bereinigen; der TOC-Sammler behält nur die
+       Zeilen bis zum Body-Start, die Debug-Seiten gehen in eigene Spools.
+    Im Speicher bleiben der Volltext (Rede-Segmentierung und Metadaten arbeiten dokumentweit) und die
+    PageMeta-Liste, nicht mehr die Seitenlisten der einzelnen Stufen.
+    """
+    learner = HeaderFooterLearner(HF_TOP_N, HF_BOTTOM_N, HF_MIN_SHARE, HF_SKIP_FIRST_N_PAGES)
+    pages_raw = PageSpool()
+    metas: List[PageMeta] = []
+    for lines, meta in iter_lines(pdf_path, layout_cfg, workers=workers, word_store=word_store,
+                                  word_cache=word_cache):
+        learner.observe(lines)
+        pages_raw.append(lines)
+        metas.append(meta)
+    hf_debug = learner.finish() if len(pages_raw) else {"headers": [], "footers": []}
+
+    pages_filtered = PageSpool()
+    pages_prepped = PageSpool()
+    toc = TocLineCollector(stop_at_first_body_header=True)
+    page_texts: List[str] = []
+    page_lengths: List[int] = []
+    for pi, lines in enumerate(pages_raw, start=1):
+        filtered = learner.filter_page(pi, lines)
+        prepped = post_cleanup_headers_footers([dehyphenate_block(filtered)])[0]
+        pages_filtered.append(filtered)
+        pages_prepped.append(prepped)
+        toc.feed(pi, prepped)
+        page_texts.append("\n".join(prepped))
+        page_lengths.append(len(page_texts[-1]))
+    text = "\n".join(page_texts)
+    del page_texts
+    toc_lines, _meta_split = toc.finish()
+    return PageStage(text, page_start_offsets(page_lengths), toc_lines, metas, hf_debug, len(pages_prepped), {
+        "normalized_pages": pages_raw,
+        "filtered_pages": pages_filtered,
+        "post_cleaned_pages": pages_prepped,
+    })
+
+# ------------------------- Stufen (memoisierbar, parser_core.stages) -------------------------
 
-    pages_raw, metas = extract_lines_fixed_mid(pdf_path)
-    pages_filtered, hf_debug = filter_repeating_headers_footers(
-        pages_raw, top_n=HF_TOP_N, bottom_n=HF_BOTTOM_N, min_share=HF_MIN_SHARE, skip_first_n_pages=3
+def _toc_words(word_store: DocumentWords) -> Dict[str, Any]:
+    """Behaltene Wörter der TOC-Seiten für den Interleave-Fallback (auch aus dem Stufen-Cache nutzbar)."""
+    return {
+        "page_count": word_store.page_count,
+        "pages": [word_store.get(p) for p in range(1, TOC_FALLBACK_MAX_PAGE + 1) if p in word_store],
+    }
+
+def _page_counts(pages: List[List[str]]) -> Dict[str, int]:
+    return {"pages": len(pages), "lines": sum(len(p) for p in pages)}
+
+def _page_text_length(lines: List[str]) -> int:
+    """len("\\n".join(lines)) ohne den Seitentext zu bauen."""
+    return sum(len(l) for l in lines) + max(len(lines) - 1, 0)
+
+def _speech_counts(speeches: List[Dict[str, Any]]) -> Dict[str, int]:
+    return {"speeches": len(speeches), "events": sum(len(sp.get("events_flat") or []) for sp in speeches)}
+
+def _span_counts(session: SessionText) -> Dict[str, int]:
+    return {"speeches": len(session), "lines": len(session.lines), "event_spans": len(session.events)}
+
+def stage_layout(pdf_path: Path, layout_cfg: LayoutConfig, workers: int,
+                 word_cache: Optional[WordCache]) -> Dict[str, Any]:
+    word_store = DocumentWords(retain=range(1, TOC_FALLBACK_MAX_PAGE + 1))
+    pages, metas = extract_lines(pdf_path, layout_cfg, workers=workers, word_store=word_store, word_cache=word_cache)
+    return {
+        "pages": pages,
+        "metas": metas,
+        "crop_bands": word_store.hf_bands.to_meta() if word_store.hf_bands is not None else None,
+        "toc_words": _toc_words(word_store),
+    }
+
+def stage_header_footer(layout: Dict[str, Any]) -> Dict[str, Any]:
+    pages, debug = filter_repeating_headers_footers(
+        layout["pages"], top_n=HF_TOP_N, bottom_n=HF_BOTTOM_N, min_share=HF_MIN_SHARE,
+        skip_first_n_pages=HF_SKIP_FIRST_N_PAGES
     )
-    pages_prepped = _secondary_pipeline_after_layout(pages_filtered)
+    return {"pages": pages, "debug": debug}
 
-    all_text = "\n".join("\n".join(p) for p in pages_prepped)
-    meta = parse_session_info(all_text)
-    meta["source_pdf_url"] = url
-    meta["extracted_at"] = dt.datetime.utcnow().isoformat() + "Z"
+def stage_cleanup(header_footer: Dict[str, Any]) -> List[List[str]]:
+    return _secondary_pipeline_after_layout(header_footer["pages"])
 
-    flat = pages_to_flat_lines(pages_prepped)
-    toc_lines, _body_lines, meta_split = split_toc_and_body(flat, stop_at_first_body_header=True)
+def stage_toc_split(cleanup: List[List[str]]) -> FlatLines:
+    toc_lines, _body_lines, _meta_split = split_toc_and_body(pages_to_flat_lines(cleanup), stop_at_first_body_header=True)
+    return toc_lines.compact()
 
+def stage_toc(toc_lines: FlatLines, toc_words: Dict[str, Any], pdf_path: Path) -> Dict[str, Any]:
+    """TOC parsen/normalisieren, bei Items ohne Redner mit dem Interleave-Fallback vergleichen."""
     toc = {"items": []}
     if toc_lines:
         toc = parse_toc(toc_lines)
@@ -1427,34 +2210,125 @@ def process_pdf(url: str, force_download: bool) -> Dict[str, Any]:
     if needs_fallback:
         try:
             if toc_lines:
-                pmin = min(obj.get("page", 9999) for obj in toc_lines)
-                pmax = max(obj.get("page", 0) for obj in toc_lines)
+                pmin = min(toc_lines.page_numbers())
+                pmax = max(toc_lines.page_numbers())
                 pmin = max(1, pmin)
-                pmax = max(pmin, min(3, pmax))
+                pmax = max(pmin, min(TOC_FALLBACK_MAX_PAGE, pmax))
             else:
-                pmin, pmax = 1, 3
-            inter_flat = extract_toc_interleaved_flat_lines(pdf_path, first_page=pmin, last_page=pmax)
+                pmin, pmax = 1, TOC_FALLBACK_MAX_PAGE
+            word_store = DocumentWords(retain=range(1, TOC_FALLBACK_MAX_PAGE + 1))
+            word_store.page_count = toc_words["page_count"]
+            for entry in toc_words["pages"]:
+                word_store.put(entry)
+            inter_flat = extract_toc_interleaved_flat_lines(
+                pdf_path, first_page=pmin, last_page=pmax, word_store=word_store
+            )
             if inter_flat:
                 toc2 = parse_toc(inter_flat)
                 toc2 = normalize_toc_items(toc2)
                 toc = pick_better_toc(toc, toc2)
         except Exception:
             pass
+    return {"toc": toc, "fallback_used": needs_fallback}
 
-    full_text = "\n".join("\n".join(p) for p in pages_prepped)
-    speeches = segment_speeches_from_text(full_text)
-    _normalize_speeches(speeches)
-    speeches = prune_empty_speeches(speeches)
+def stage_speeches(text: str, page_starts: Optional[Sequence[int]] = None) -> SessionText:
+    return tokenize_session(text, page_starts)
 
-    # Parteien aus Reden übernehmen + Backfill
-    enrich_toc_parties_from_speeches(toc, speeches)
-    backfill_toc_speakers_from_speeches(toc, speeches)
+def stage_events(speeches: SessionText) -> SessionText:
+    return build_speech_spans(speeches)
 
+def stage_enrich(toc: Dict[str, Any], events: SessionText) -> Dict[str, Any]:
+    toc = toc["toc"]
+    events = speech_dicts(events)
+    # Parteien aus Reden übernehmen + Backfill
+    enrich_toc_parties_from_speeches(toc, events)
+    backfill_toc_speakers_from_speeches(toc, events)
     # Nächste Sitzung aus TOC extrahieren und TOC-Extras säubern
     next_meeting, toc = extract_next_meeting_from_toc_and_strip(toc)
+    # Seiten-/Zeilenherkunft der Reden an die TOC-Items
+    link_toc_to_speeches(toc, events)
+    return {"toc": toc, "speeches": events, "next_meeting": next_meeting}
 
+def stage_session(text: str) -> Dict[str, Any]:
     # Pausen (z. B. Mittagspause)
-    breaks = parse_breaks(all_text)
+    return {"meta": parse_session_info(text), "breaks": parse_breaks(text)}
+
+def process_pdf(url: str, force_download: bool, workers: int = 1,
+                word_cache: Optional[WordCache] = None,
+                config: Optional[ParserConfig] = None,
+                stream: bool = False,
+                pdf_cache: Optional[PdfStore] = None,
+                stages: Optional[StageRunner] = None,
+                pdf_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Stufenkette layout -> header_footer -> cleanup -> toc_split -> toc, speeches -> events -> enrich,
+    session; stages: StageRunner mit Stufen-Cache (Default: ohne Cache), danach stehen in
+    stages.events Treffer/Fehltreffer, Zeiten, Speicher und Mengen je Stufe (auch im Sidecar unter
+    "instrumentation").
+    stream=True: Seitenstufen als Generator-Pipeline mit begrenztem Speicher (_page_stage_streaming,
+    nicht memoisiert); das Ergebnis ist identisch, die Debug-Seiten des Sidecars liegen dann in Temp-Dateien.
+    pdf_cache: PDF-Cache für URLs (Default: .cache/pdfs ohne Größengrenze).
+    pdf_path: bereits aufgelöste PDF (der Aufrufer hat den Download gemessen), sonst wird url geladen.
+    """
+    stages = stages or StageRunner()
+    if pdf_path is None:
+        with stages.measure("download"):
+            pdf_path = download_pdf(url, force=force_download, store=pdf_cache)
+    layout_cfg = (config or ParserConfig()).layout
+
+    if stream:
+        # Wörter der möglichen TOC-Seiten bleiben für den Interleave-Fallback im Speicher
+        word_store = DocumentWords(retain=range(1, TOC_FALLBACK_MAX_PAGE + 1))
+        with stages.measure("pages_stream") as event:
+            page = _page_stage_streaming(pdf_path, layout_cfg, workers, word_store, word_cache)
+            event.counts = {"pages": page.n_pages, "toc_lines": len(page.toc_lines)}
+        crop_bands = word_store.hf_bands.to_meta() if word_store.hf_bands is not None else None
+        text = stages.wrap(page.text)
+        page_starts = stages.wrap(page.page_starts)
+        toc_lines = stages.wrap(page.toc_lines)
+        toc_words = stages.wrap(_toc_words(word_store))
+        metas, hf_debug, n_pages, debug_pages = page.metas, page.hf_debug, page.n_pages, page.debug_pages
+    else:
+        params = None
+        if stages.enabled:
+            params = {"pdf_sha256": pdf_content_hash(pdf_path), "layout": asdict(layout_cfg),
+                      "pdfplumber": pdfplumber.__version__}
+        layout = stages.run("layout", stage_layout, params=params, counts=lambda v: _page_counts(v["pages"]),
+                            pdf_path=pdf_path, layout_cfg=layout_cfg, workers=workers, word_cache=word_cache)
+        header_footer = stages.run("header_footer", stage_header_footer, {"layout": layout},
+                                   counts=lambda v: _page_counts(v["pages"]))
+        cleanup = stages.run("cleanup", stage_cleanup, {"header_footer": header_footer}, counts=_page_counts)
+        toc_lines = stages.run("toc_split", stage_toc_split, {"cleanup": cleanup},
+                               counts=lambda v: {"toc_lines": len(v)})
+        text = stages.wrap("\n".join("\n".join(p) for p in cleanup.value))
+        page_starts = stages.wrap(page_start_offsets(_page_text_length(p) for p in cleanup.value))
+        toc_words = stages.wrap(layout.value["toc_words"])
+        crop_bands = layout.value["crop_bands"]
+        metas, hf_debug, n_pages = layout.value["metas"], header_footer.value["debug"], len(cleanup.value)
+        debug_pages = {
+            "normalized_pages": layout.value["pages"],
+            "filtered_pages": header_footer.value["pages"],
+            "post_cleaned_pages": cleanup.value,
+        }
+    if crop_bands is not None:
+        hf_debug = {**hf_debug, "crop_bands": crop_bands}
+
+    toc = stages.run("toc", stage_toc, {"toc_lines": toc_lines, "toc_words": toc_words},
+                     counts=lambda v: {"toc_items": len(v["toc"].get("items", []))}, pdf_path=pdf_path)
+    speeches = stages.run("speeches", stage_speeches, {"text": text, "page_starts": page_starts}, counts=lambda v: {"speeches": len(v), "tokens": len(v.tokens)})
+    events = stages.run("events", stage_events, {"speeches": speeches}, counts=_span_counts)
+    enriched = stages.run("enrich", stage_enrich, {"toc": toc, "events": events},
+                          counts=lambda v: {"toc_items": len(v["toc"].get("items", [])), **_speech_counts(v["speeches"])})
+    session = stages.run("session", stage_session, {"text": text},
+                         counts=lambda v: {"breaks": len(v["breaks"] or [])})
+
+    meta = session.value["meta"]
+    meta["source_pdf_url"] = url
+    meta["extracted_at"] = dt.datetime.utcnow().isoformat() + "Z"
+    toc_value = enriched.value["toc"]
+    speeches_value = enriched.value["speeches"]
+    next_meeting = enriched.value["next_meeting"]
+    breaks = session.value["breaks"]
 
     payload: Dict[str, Any] = {
         "session": {
@@ -1471,58 +2345,128 @@ def process_pdf(url: str, force_download: bool) -> Dict[str, Any]:
             "location": meta.get("location"),
             "breaks": breaks or None
         },
-        "stats": {"pages": len(pages_prepped), "speeches": len(speeches)},
+        "stats": {"pages": n_pages, "speeches": len(speeches_value)},
         "layout": {
             "applied": True,
-            "reason": "fixed-mid-split + header/footer-filter + post-cleanup (+ TOC interleave fallback)"
+            "reason": f"{layout_cfg.engine}-split + header/footer-filter + post-cleanup (+ TOC interleave fallback)"
         },
-        "toc": toc,
-        "speeches": speeches
+        "toc": toc_value,
+        "speeches": speeches_value
     }
     payload["_layout_debug_internal"] = {
         "layout_metadata": [m.__dict__ for m in metas],
-        "normalized_pages": pages_raw,
-        "filtered_pages": pages_filtered,
-        "post_cleaned_pages": pages_prepped,
+        **debug_pages,
         "header_footer_filter": hf_debug,
-        "toc_fallback_used": needs_fallback
+        "toc_fallback_used": toc.value["fallback_used"],
+        # Liste der Stufen-Messungen; write_outputs ergänzt das Schreiben und die Summen
+        "instrumentation": [e.to_dict() for e in stages.events],
     }
 
     try:
-        expected_toc = max((it.get("number", 0) for it in toc.get("items", [])), default=0)
+        expected_toc = max((it.get("number", 0) for it in toc_value.get("items", [])), default=0)
         payload["_qa"] = {
-            "toc_items": len(toc.get("items", [])),
+            "toc_items": len(toc_value.get("items", [])),
             "toc_max_number": expected_toc,
-            "speeches_with_agenda": sum(1 for s in speeches if "agenda_item_number" in s),
-            "toc_total_speakers": sum(len(it.get("speakers") or []) for it in toc.get("items", []))
+            "speeches_with_agenda": sum(1 for s in speeches_value if "agenda_item_number" in s),
+            "toc_total_speakers": sum(len(it.get("speakers") or []) for it in toc_value.get("items", []))
         }
     except Exception:
         pass
 
     return payload
 
+# ------------------------- Parse-Manifest -------------------------
+
+# Ausgabewirksame parser_core-Module; Download, Caches und Batch-Steuerung ändern keine Ausgabe
+FINGERPRINT_MODULES = ("config.py", "flatlines.py", "hfbands.py", "layout.py", "normalize.py", "pagestream.py",
+                       "spans.py", "wordtable.py")
+
+def parser_fingerprint(config: ParserConfig) -> str:
+    """Fingerabdruck für das Parse-Manifest: dieses Skript, FINGERPRINT_MODULES, pdfplumber, Layout-Konfiguration."""
+    here = Path(__file__).resolve()
+    core = here.parent / "parser_core"
+    return code_fingerprint([here] + [core / m for m in FINGERPRINT_MODULES],
+                            {"pdfplumber": pdfplumber.__version__, "layout": asdict(config.layout)})
+
+def pdf_content_hash(pdf_path: Path) -> str:
+    return content_hash_for_path(pdf_path) or file_sha256(pdf_path)
+
+def _known_pdf_hash(url: str, pdf_cache: Optional[PdfStore]) -> Optional[str]:
+    """Inhalts-Hash ohne Netzwerk: lokale Datei hashen bzw. URL-Index des PDF-Caches; sonst None."""
+    p = Path(url)
+    if p.exists():
+        return file_sha256(p)
+    entry = (pdf_cache or PdfStore()).lookup_url(url)
+    return entry.sha256 if entry is not None else None
+
+def plan_rebuild(urls: List[str], manifest: ParseManifest, fingerprint: str,
+                 pdf_cache: Optional[PdfStore] = None, force: bool = False,
+                 force_download: bool = False) -> List[Tuple[str, Optional[str]]]:
+    """(url, Grund) je Quelle; Grund None = Ausgaben aktuell, wird übersprungen."""
+    plan: List[Tuple[str, Optional[str]]] = []
+    for url in urls:
+        if force:
+            plan.append((url, REASON_FORCED))
+            continue
+        # --force-download: Inhalt erst nach dem erneuten Laden bekannt
+        sha = None if force_download and not Path(url).exists() else _known_pdf_hash(url, pdf_cache)
+        plan.append((url, manifest.rebuild_reason(url, sha, fingerprint)))
+    return plan
+
+def _output_paths(session_path: Path, sidecar_path: Optional[Path]) -> List[Path]:
+    return [session_path] + ([sidecar_path] if sidecar_path is not None else [])
+
 # ------------------------- IO / CLI -------------------------
 
-def write_outputs(payload: Dict[str, Any], out_dir: Path) -> Tuple[Path, Optional[Path]]:
+def write_outputs(payload: Dict[str, Any], out_dir: Path,
+                  stages: Optional[StageRunner] = None) -> Tuple[Path, Optional[Path]]:
+    """stages: Protokoll des Dokuments, erhält die Messung des Schreibens der Session-JSON."""
     out_dir.mkdir(parents=True, exist_ok=True)
     base = build_session_filename(payload)
     session_path = out_dir / base
     layout_file = base.replace(".json", ".layout.json")
     sidecar = payload.pop("_layout_debug_internal", None)
     payload["schema_version"] = "1.0-minimal"
-    with session_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    with measure("write_session") as event:
+        with session_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+    if stages is not None:
+        stages.events.append(event)
     sidecar_path = None
     if sidecar is not None:
+        if isinstance(sidecar.get("instrumentation"), list):
+            # Der Sidecar selbst kann seine eigene Schreibdauer nicht enthalten
+            sidecar["instrumentation"] = instrumentation_summary(sidecar["instrumentation"] + [event.to_dict()])
         sidecar_path = session_path.parent / layout_file
         with sidecar_path.open("w", encoding="utf-8") as f:
-            json.dump({
+            # dump_json entspricht json.dump(indent=2), streamt aber PageSpool-Seiten (Streaming-Modus)
+            dump_json({
                 "session_ref": session_path.name,
                 "schema_version": "1.0-layout-debug",
                 "layout_debug": sidecar
-            }, f, ensure_ascii=False, indent=2)
+            }, f)
     return session_path, sidecar_path
 
+@contextmanager
+def _profiled(enabled: bool) -> Iterator[Optional[cProfile.Profile]]:
+    if not enabled:
+        yield None
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
+
+def _dump_profile(prof: Optional[cProfile.Profile], session_path: Path) -> Optional[Path]:
+    """pstats-Dump neben der Session-JSON (auswerten: python -m pstats <datei>)."""
+    if prof is None:
+        return None
+    path = session_path.with_suffix(".pstats")
+    prof.dump_stats(str(path))
+    return path
+
 def parse_args():
     p = argparse.ArgumentParser(description="Parser: Feste Mittel-Splittung (Zweispalter), robuster TOC + Speeches, Header/Footer-Filter.")
     g = p.add_mutually_exclusive_group(required=True)
@@ -1530,6 +2474,60 @@ def parse_args():
     g.add_argument("--list-file", help="Datei mit Zeilenweise URLs")
     p.add_argument("--force-download", action="store_true")
     p.add_argument("--out-dir", default="data", help="Ausgabeverzeichnis (Default: data)")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Prozesse für die Seiten-Extraktion (Default: 1 = seriell)")
+    p.add_argument("--word-cache-dir", default=".cache/words",
+                   help="Verzeichnis des Wort-Caches (Default: .cache/words)")
+    p.add_argument("--word-cache-max-mb", type=int, default=512,
+                   help="Maximale Größe des Wort-Caches in MB (LRU-Eviction, Default: 512)")
+    p.add_argument("--no-word-cache", action="store_true", help="Wort-Cache nicht verwenden")
+    p.add_argument("--pdf-cache-dir", default=".cache/pdfs",
+                   help="Verzeichnis des inhaltsadressierten PDF-Caches (Default: .cache/pdfs); "
+                        "Statistik/Aufräumen: python -m scripts.parser_core.pdfcache stats|gc")
+    p.add_argument("--pdf-cache-max-mb", type=int, default=2048,
+                   help="Maximale Größe des PDF-Caches in MB (LRU-Eviction, Default: 2048; 0 = unbegrenzt)")
+    p.add_argument("--config", default=None,
+                   help="Pfad zur parser_config.json (Default: parser_config.json im Repo, falls vorhanden)")
+    p.add_argument("--layout-engine", choices=ENGINES, default=None,
+                   help="Überschreibt layout.engine (fixed-mid | histogram | sampled)")
+    p.add_argument("--layout-sample-pages", type=int, default=None,
+                   help="Überschreibt layout.sample_pages (Stichprobenseiten für engine=sampled)")
+    p.add_argument("--layout-min-words", type=int, default=None,
+                   help="Überschreibt layout.min_words")
+    p.add_argument("--layout-min-gap", type=float, default=None,
+                   help="Überschreibt layout.min_gap (Mindestbreite des Spaltenzwischenraums in pt)")
+    p.add_argument("--crop-header-footer", action=argparse.BooleanOptionalAction, default=None,
+                   help="Überschreibt layout.crop_header_footer (Kopfzeilen-Bänder geometrisch vorfiltern)")
+    p.add_argument("--stream", action="store_true",
+                   help="Seiten als Generator-Pipeline verarbeiten (begrenzter Speicher, Debug-Seiten in "
+                        "Temp-Dateien); meldet je PDF den Peak-RSS")
+    p.add_argument("--trace-memory", action="store_true",
+                   help="Zusätzlich tracemalloc-Peak je PDF melden (verlangsamt die Verarbeitung)")
+    p.add_argument("--jobs", type=int, default=1,
+                   help="Batch-Modus: so viele PDFs parallel, je PDF ein eigener Prozess (Default: 1 = seriell)")
+    p.add_argument("--doc-timeout", type=float, default=600.0,
+                   help="Batch-Modus: Zeitlimit pro PDF in Sekunden, danach wird der Worker beendet "
+                        "(Default: 600; 0 = unbegrenzt)")
+    p.add_argument("--batch-summary", default=None,
+                   help="Batch-Modus: Zusammenfassung (Status, Zeit, Seiten/s je PDF) zusätzlich als JSON schreiben")
+    p.add_argument("--stage-cache", action="store_true",
+                   help="Zwischenergebnisse der Stufen (Layout, Header/Footer, Cleanup, TOC, Reden, Events, "
+                        "Anreicherung) cachen; nach Code-Änderungen laufen nur betroffene Stufen neu")
+    p.add_argument("--stage-cache-dir", default=".cache/stages",
+                   help="Verzeichnis des Stufen-Caches (Default: .cache/stages); "
+                        "Statistik/Leeren: python -m scripts.parser_core.stages stats|clear")
+    p.add_argument("--stage-cache-max-mb", type=int, default=1024,
+                   help="Maximale Größe des Stufen-Caches in MB (LRU-Eviction, Default: 1024)")
+    p.add_argument("--stage-report", action="store_true",
+                   help="Je PDF Treffer/Fehltreffer und Laufzeit der Stufen ausgeben")
+    p.add_argument("--profile", action="store_true",
+                   help="Je PDF einen cProfile-Dump <session>.pstats neben die Ausgaben schreiben "
+                        "(Hauptprozess; Seiten-Worker von --workers sind nicht enthalten)")
+    p.add_argument("--force", action="store_true",
+                   help="Parse-Manifest ignorieren und alle Dokumente neu parsen (Default: nur geänderte PDFs "
+                        "bzw. nach Parser-Änderungen)")
+    p.add_argument("--dry-run", action="store_true",
+                   help="Nur auflisten, welche Dokumente neu geparst würden (mit Grund), nichts schreiben")
 
     return p.parse_args()
 
@@ -1548,13 +2546,159 @@ def main():
     args = parse_args()
     out_dir = Path(args.out_dir)
     urls = gather_urls(args)
-    for url in urls:
-        try:
-            payload = process_pdf(url, args.force_download)
-            session_path, sidecar_path = write_outputs(payload, out_dir)
-            print(f"[OK] {url} -> {session_path.name}" + (f" (+ {sidecar_path.name})" if sidecar_path else ""))
-        except Exception as e:
-            print(f"[ERROR] {url}: {e}", file=sys.stderr)
+    try:
+        config = apply_overrides(
+            load_parser_config(args.config),
+            engine=args.layout_engine,
+            sample_pages=args.layout_sample_pages,
+            min_words=args.layout_min_words,
+            min_gap=args.layout_min_gap,
+            crop_header_footer=args.crop_header_footer,
+        )
+    except ValueError as e:
+        print(f"[ERROR] Konfiguration: {e}", file=sys.stderr)
+        sys.exit(2)
+    word_cache = None
+    if not args.no_word_cache:
+        word_cache = WordCache(args.word_cache_dir, max_bytes=args.word_cache_max_mb * 1024 * 1024)
+    pdf_cache = PdfStore(args.pdf_cache_dir,
+                         max_bytes=args.pdf_cache_max_mb * 1024 * 1024 if args.pdf_cache_max_mb > 0 else None)
+    manifest = ParseManifest(out_dir)
+    fingerprint = parser_fingerprint(config)
+    plan = plan_rebuild(urls, manifest, fingerprint, pdf_cache, force=args.force,
+                        force_download=args.force_download)
+    todo = [(url, reason) for url, reason in plan if reason is not None]
+    for url, reason in plan:
+        if reason is None:
+            print(f"[SKIP] {url}: unverändert")
+        elif args.dry_run:
+            print(f"[REBUILD] {url}: {reason}")
+    if args.dry_run:
+        print(f"{len(todo)} von {len(plan)} Dokumenten würden neu geparst.")
+        return
+    if not todo:
+        return
+
+    stage_cache = None
+    if args.stage_cache:
+        stage_cache = StageCache(args.stage_cache_dir, max_bytes=args.stage_cache_max_mb * 1024 * 1024)
+    probe = MemoryProbe(trace=args.trace_memory) if (args.stream or args.trace_memory) else None
+    if args.jobs > 1:
+        run_batch_cli(todo, args, out_dir, word_cache, config, pdf_cache, manifest, fingerprint, stage_cache)
+        return
+    try:
+        for url, reason in todo:
+            try:
+                if probe is not None:
+                    probe.start()
+                stages = StageRunner(stage_cache)
+                with _profiled(args.profile) as prof:
+                    with stages.measure("download"):
+                        pdf_path = download_pdf(url, force=args.force_download, store=pdf_cache)
+                        pdf_sha = pdf_content_hash(pdf_path)
+                    if reason == REASON_PDF_UNKNOWN and manifest.unchanged_pdf(url, pdf_sha):
+                        print(f"[SKIP] {url}: unverändert (nach Download)")
+                        continue
+                    payload = process_pdf(url, False, workers=args.workers, word_cache=word_cache, config=config,
+                                          stream=args.stream, pdf_cache=pdf_cache, stages=stages, pdf_path=pdf_path)
+                    session_path, sidecar_path = write_outputs(payload, out_dir, stages)
+                manifest.record(url, pdf_sha, fingerprint, _output_paths(session_path, sidecar_path))
+                print(f"[OK] {url} -> {session_path.name}" + (f" (+ {sidecar_path.name})" if sidecar_path else ""))
+                profile_path = _dump_profile(prof, session_path)
+                if profile_path is not None:
+                    print(f"[PROFILE] {url}: {profile_path}", file=sys.stderr)
+                if probe is not None:
+                    print(f"[MEM] {url}: {format_memory_report(probe.report())}", file=sys.stderr)
+                if args.stage_report:
+                    print(f"[STAGES] {url}\n{format_stage_report([e.to_dict() for e in stages.events])}", file=sys.stderr)
+            except Exception as e:
+                print(f"[ERROR] {url}: {e}", file=sys.stderr)
+    finally:
+        if probe is not None:
+            probe.stop()
+
+# ------------------------- Batch-Modus -------------------------
+
+def _batch_worker(url: str, out_dir: Path, force_download: bool, workers: int,
+                  word_cache: Optional[WordCache], config: ParserConfig, stream: bool,
+                  trace_memory: bool, pdf_cache: Optional[PdfStore] = None,
+                  recorded_sha: Optional[Dict[str, str]] = None,
+                  stage_cache: Optional[StageCache] = None, profile: bool = False) -> Dict[str, Any]:
+    """
+    Läuft in einem eigenen Prozess (parser_core.batch): ein PDF parsen und die Ausgaben schreiben.
+    recorded_sha: Manifest-Hash für Quellen, bei denen nur die PDF unbekannt war – gleicher Inhalt
+    nach dem Download = übersprungen.
+    """
+    probe = MemoryProbe(trace=trace_memory).start() if (stream or trace_memory) else None
+    try:
+        stages = StageRunner(stage_cache)
+        with _profiled(profile) as prof:
+            with stages.measure("download"):
+                pdf_path = download_pdf(url, force=force_download, store=pdf_cache)
+                pdf_sha = pdf_content_hash(pdf_path)
+            if recorded_sha and recorded_sha.get(url) == pdf_sha:
+                return {"skipped": True, "pdf_sha256": pdf_sha}
+            payload = process_pdf(url, False, workers=workers, word_cache=word_cache, config=config,
+                                  stream=stream, pdf_cache=pdf_cache, stages=stages, pdf_path=pdf_path)
+            pages = payload.get("stats", {}).get("pages")
+            session_path, sidecar_path = write_outputs(payload, out_dir, stages)
+        result: Dict[str, Any] = {"pages": pages, "output": session_path.name, "pdf_sha256": pdf_sha,
+                                  "stages": [e.to_dict() for e in stages.events]}
+        if sidecar_path is not None:
+            result["sidecar"] = sidecar_path.name
+        profile_path = _dump_profile(prof, session_path)
+        if profile_path is not None:
+            result["profile"] = profile_path.name
+        if probe is not None:
+            result["memory"] = probe.report()
+        return result
+    finally:
+        if probe is not None:
+            probe.stop()
+
+def run_batch_cli(todo: List[Tuple[str, Optional[str]]], args, out_dir: Path, word_cache: Optional[WordCache],
+                  config: ParserConfig, pdf_cache: Optional[PdfStore] = None,
+                  manifest: Optional[ParseManifest] = None, fingerprint: Optional[str] = None,
+                  stage_cache: Optional[StageCache] = None) -> None:
+    """
+    --jobs N: jedes PDF in einem eigenen Worker-Prozess mit Zeitlimit (--doc-timeout); Ergebnisse
+    werden ausgegeben, sobald sie fertig sind, am Ende folgt die Zusammenfassung. --workers gilt
+    weiterhin pro PDF (Seiten-Pool im Worker), jobs * workers sollte die Kernzahl nicht übersteigen.
+    todo: (url, Grund) aus plan_rebuild; das Manifest schreibt nur dieser Prozess.
+    """
+    recorded_sha = {}
+    if manifest is not None:
+        recorded_sha = {url: manifest.get(url).pdf_sha256 for url, reason in todo if reason == REASON_PDF_UNKNOWN}
+    worker = functools.partial(
+        _batch_worker, out_dir=out_dir, force_download=args.force_download, workers=args.workers,
+        word_cache=word_cache, config=config, stream=args.stream, trace_memory=args.trace_memory,
+        pdf_cache=pdf_cache, recorded_sha=recorded_sha, stage_cache=stage_cache, profile=args.profile,
+    )
+    timeout = args.doc_timeout if args.doc_timeout and args.doc_timeout > 0 else None
+    t0 = time.monotonic()
+    results = []
+    for res in run_batch([url for url, _reason in todo], worker, jobs=args.jobs, timeout=timeout):
+        results.append(res)
+        if res.status == "ok" and res.extra.get("skipped"):
+            print(f"[SKIP] {res.item}: unverändert (nach Download)")
+        elif res.status == "ok":
+            sidecar = res.extra.get("sidecar")
+            if manifest is not None and fingerprint is not None:
+                outputs = [out_dir / res.output] + ([out_dir / sidecar] if sidecar else [])
+                manifest.record(res.item, res.extra["pdf_sha256"], fingerprint, outputs)
+            pps = res.pages_per_sec
+            print(f"[OK] {res.item} -> {res.output}" + (f" (+ {sidecar})" if sidecar else "")
+                  + f" [{res.pages} S., {res.wall_time:.1f} s" + (f", {pps:.1f} S./s]" if pps else "]"))
+            if "memory" in res.extra:
+                print(f"[MEM] {res.item}: {format_memory_report(res.extra['memory'])}", file=sys.stderr)
+            if args.stage_report:
+                print(f"[STAGES] {res.item}\n{format_stage_report(res.extra['stages'])}", file=sys.stderr)
+        else:
+            print(f"[{res.status.upper()}] {res.item}: {res.error}", file=sys.stderr)
+    summary = summarize(results, time.monotonic() - t0)
+    print(format_summary(summary))
+    if args.batch_summary:
+        Path(args.batch_summary).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+"""
+Batch-Engine: viele Dokumente parallel, ein Prozess pro Dokument.
+
+Höchstens jobs Worker-Prozesse laufen gleichzeitig; jeder bearbeitet genau ein Dokument und meldet
+ein kleines Ergebnis-Dict über eine Pipe zurück (die eigentlichen Ausgaben schreibt der Worker selbst).
+Ergebnisse kommen in Fertigstellungsreihenfolge. Ein Worker, der sein Zeitlimit überschreitet, wird
+beendet (kill) und als "timeout" gemeldet, ein abgestürzter als "crashed" – der Rest des Laufs
+läuft weiter. Ein ProcessPoolExecutor kann einzelne hängende Aufgaben nicht abbrechen, deshalb
+eigene Prozesse statt eines langlebigen Pools.
+
+fn(item) -> Dict, optional mit "pages" (für Seiten/s) und "output"; Ausnahmen ergeben "error".
+"""
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CRASHED = "crashed"
+
+
+@dataclass
+class BatchResult:
+    item: str
+    status: str
+    wall_time: float
+    pages: Optional[int] = None
+    output: Optional[str] = None
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def pages_per_sec(self) -> Optional[float]:
+        if not self.pages or self.wall_time <= 0:
+            return None
+        return self.pages / self.wall_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        pps = self.pages_per_sec
+        return {
+            "item": self.item,
+            "status": self.status,
+            "wall_time_s": round(self.wall_time, 3),
+            "pages": self.pages,
+            "pages_per_sec": round(pps, 2) if pps is not None else None,
+            "output": self.output,
+            "error": self.error,
+            **self.extra,
+        }
+
+
+def _child(fn: Callable[[str], Dict[str, Any]], item: str, conn) -> None:
+    if hasattr(os, "setpgrp"):
+        # Eigene Prozessgruppe: ein Timeout beendet auch Enkel (z. B. den Seiten-Pool bei --workers)
+        os.setpgrp()
+    try:
+        value = fn(item) or {}
+        conn.send((STATUS_OK, value))
+    except BaseException as e:
+        conn.send((STATUS_ERROR, {"error": f"{type(e).__name__}: {e}",
+                                  "traceback": traceback.format_exc(limit=5)}))
+    finally:
+        conn.close()
+
+
+def _kill(process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        # Windows oder Gruppe noch nicht angelegt
+        process.kill()
+    process.join()
+
+
+@dataclass
+class _Running:
+    item: str
+    process: Any
+    conn: Any
+    started: float
+
+
+def _result(run: _Running, status: str, value: Optional[Dict[str, Any]] = None,
+            error: Optional[str] = None) -> BatchResult:
+    value = dict(value or {})
+    value.pop("traceback", None)
+    return BatchResult(
+        item=run.item,
+        status=status,
+        wall_time=time.monotonic() - run.started,
+        pages=value.pop("pages", None),
+        output=value.pop("output", None),
+        error=error or value.pop("error", None),
+        extra=value,
+    )
+
+
+def run_batch(items: Iterable[str], fn: Callable[[str], Dict[str, Any]], jobs: int,
+              timeout: Optional[float] = None, mp_context=None) -> Iterator[BatchResult]:
+    """
+    Führt fn für jedes Element in eigenen Prozessen aus (höchstens jobs gleichzeitig) und liefert die
+    Ergebnisse, sobald sie fertig sind. timeout: Sekunden pro Dokument (None = unbegrenzt).
+    """
+    ctx = mp_context or multiprocessing.get_context()
+    pending = deque(items)
+    running: List[_Running] = []
+    jobs = max(1, jobs)
+    try:
+        while pending or running:
+            while pending and len(running) < jobs:
+                item = pending.popleft()
+                recv, send = ctx.Pipe(duplex=False)
+                proc = ctx.Process(target=_child, args=(fn, item, send), name=f"batch-{item}")
+                proc.start()
+                send.close()
+                running.append(_Running(item, proc, recv, time.monotonic()))
+
+            wait_for = None
+            if timeout is not None:
+                now = time.monotonic()
+                wait_for = max(0.0, min(r.started + timeout - now for r in running))
+            ready = wait([r.conn for r in running], timeout=wait_for)
+
+            still: List[_Running] = []
+            for run in running:
+                if run.conn in ready:
+                    try:
+                        status, value = run.conn.recv()
+                        result = _result(run, status, value)
+                    except EOFError:
+                        run.process.join()
+                        result = _result(run, STATUS_CRASHED,
+                                         error=f"Worker beendet (exitcode {run.process.exitcode})")
+                    run.process.join()
+                    run.conn.close()
+                    yield result
+                elif timeout is not None and time.monotonic() - run.started >= timeout:
+                    _kill(run.process)
+                    run.conn.close()
+                    yield _result(run, STATUS_TIMEOUT, error=f"Zeitlimit {timeout:g} s überschritten")
+                else:
+                    still.append(run)
+            running = still
+    finally:
+        # Abbruch (z. B. KeyboardInterrupt im Aufrufer): keine verwaisten Worker zurücklassen
+        for run in running:
+            if run.process.is_alive():
+                _kill(run.process)
+            run.process.join()
+            run.conn.close()
+
+
+def summarize(results: List[BatchResult], wall_time: float) -> Dict[str, Any]:
+    """Gesamtübersicht eines Laufs (Status-Zählung, Seiten, Durchsatz) plus Einzelergebnisse."""
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    pages = sum(r.pages or 0 for r in results if r.status == STATUS_OK)
+    return {
+        "documents": len(results),
+        "status": counts,
+        "pages": pages,
+        "wall_time_s": round(wall_time, 3),
+        "pages_per_sec": round(pages / wall_time, 2) if wall_time > 0 else None,
+        "results": [r.to_dict() for r in results],
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [f"{'Status':<8} {'Zeit/s':>8} {'Seiten':>6} {'S./s':>7}  Dokument"]
+    for r in summary["results"]:
+        pps = f"{r['pages_per_sec']:.2f}" if r["pages_per_sec"] is not None else "-"
+        pages = r["pages"] if r["pages"] is not None else "-"
+        lines.append(f"{r['status']:<8} {r['wall_time_s']:>8.2f} {pages:>6} {pps:>7}  {r['item']}")
+    status = ", ".join(f"{k}={v}" for k, v in sorted(summary["status"].items()))
+    lines.append(f"{summary['documents']} Dokumente ({status}), {summary['pages']} Seiten in "
+                 f"{summary['wall_time_s']:.2f} s" + (f" = {summary['pages_per_sec']:.2f} S./s"
+                                                      if summary["pages_per_sec"] is not None else ""))
+    return "\n".join(lines)
@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+"""
+Lädt parser_config.json und leitet daraus die Layout-Strategie ab.
+
+Abschnitt "layout":
+  engine:        fixed-mid (feste Mittel-Splittung, Default) | histogram (volle Erkennung je Seite,
+                 parser_core.layout) | sampled (Template aus Stichprobenseiten, Erkennung nur bei
+                 fehlgeschlagener Validierung)
+  mode:          always (immer zweispaltig erzwingen) | auto (einspaltige Seiten zulassen)
+  sample_pages:  Anzahl Stichprobenseiten für engine=sampled
+  min_words:     Mindestanzahl Wörter für die Spaltenerkennung einer Seite
+  min_gap:       Mindestbreite (pt) des Spaltenzwischenraums, damit ein Template gebildet wird
+  max_straddle_fraction: zulässiger Anteil Wörter, die den Template-Split kreuzen
+  crop_header_footer: Kopfzeilen-Bänder auf den ersten Seiten lernen und deren Wörter auf allen
+                 Seiten vor der Zeilenbildung verwerfen (parser_core.hfbands); der Text-Filter
+                 bleibt als Fallback aktiv
+
+CLI-Argumente überschreiben Werte aus der Datei (apply_overrides); fehlt die Datei, gelten die
+Defaults, die dem bisherigen Verhalten (fixed-mid) entsprechen.
+"""
+
+ENGINE_FIXED_MID = "fixed-mid"
+ENGINE_HISTOGRAM = "histogram"
+ENGINE_SAMPLED = "sampled"
+ENGINES = (ENGINE_FIXED_MID, ENGINE_HISTOGRAM, ENGINE_SAMPLED)
+MODES = ("always", "auto")
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "parser_config.json"
+
+
+@dataclass(frozen=True)
+class LayoutConfig:
+    engine: str = ENGINE_FIXED_MID
+    mode: str = "always"
+    sample_pages: int = 3
+    min_words: int = 25
+    min_gap: float = 0.0
+    max_straddle_fraction: float = 0.02
+    crop_header_footer: bool = False
+
+    def __post_init__(self):
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unbekannte Layout-Engine '{self.engine}' (erlaubt: {', '.join(ENGINES)})")
+        if self.mode not in MODES:
+            raise ValueError(f"Unbekannter Layout-Modus '{self.mode}' (erlaubt: {', '.join(MODES)})")
+        if self.sample_pages < 1:
+            raise ValueError("layout.sample_pages muss >= 1 sein")
+        if self.min_words < 0 or self.min_gap < 0:
+            raise ValueError("layout.min_words und layout.min_gap dürfen nicht negativ sein")
+
+    @property
+    def force_two_column(self) -> bool:
+        return self.mode == "always"
+
+    def page_params(self) -> Dict[str, Any]:
+        """Keyword-Argumente für parser_core.layout.layout_page_words."""
+        return {
+            "force_two_column": self.force_two_column,
+            "min_words_for_detection": self.min_words,
+        }
+
+
+@dataclass(frozen=True)
+class ParserConfig:
+    layout: LayoutConfig = field(default_factory=LayoutConfig)
+    source: Optional[str] = None
+
+
+def _coerce_section(cls, data: Dict[str, Any], section: str):
+    if not isinstance(data, dict):
+        raise ValueError(f"Abschnitt '{section}' muss ein Objekt sein")
+    known = {f.name: f for f in fields(cls)}
+    unknown = sorted(set(data) - set(known))
+    if unknown:
+        raise ValueError(f"Unbekannte Schlüssel in '{section}': {', '.join(unknown)}")
+    values = {}
+    for key, value in data.items():
+        default = known[key].default
+        if isinstance(default, bool) and not isinstance(value, bool):
+            raise ValueError(f"Ungültiger Wert für {section}.{key}: {value!r} (true/false erwartet)")
+        try:
+            values[key] = type(default)(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Ungültiger Wert für {section}.{key}: {value!r}")
+    return cls(**values)
+
+
+def load_parser_config(path: Optional[str] = None) -> ParserConfig:
+    """
+    Liest die Konfiguration. path=None: parser_config.json im Repo-Wurzelverzeichnis, falls
+    vorhanden, sonst Defaults. Ein explizit angegebener, fehlender Pfad ist ein Fehler.
+    """
+    cfg_path = Path(path) if path else DEFAULT_CONFIG_PATH
+    if not cfg_path.exists():
+        if path:
+            raise ValueError(f"Konfigurationsdatei nicht gefunden: {cfg_path}")
+        return ParserConfig()
+    try:
+        data = json.loads(cfg_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Konfigurationsdatei {cfg_path} ist kein gültiges JSON: {e}")
+    layout = _coerce_section(LayoutConfig, data.get("layout", {}), "layout")
+    return ParserConfig(layout=layout, source=str(cfg_path))
+
+
+def apply_overrides(config: ParserConfig, **layout_overrides: Any) -> ParserConfig:
+    """Überschreibt Layout-Werte; None bedeutet „nicht gesetzt“ (z. B. fehlendes CLI-Argument)."""
+    changes = {k: v for k, v in layout_overrides.items() if v is not None}
+    if not changes:
+        return config
+    return replace(config, layout=replace(config.layout, **changes))
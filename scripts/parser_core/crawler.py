@@ -0,0 +1,289 @@
+import asyncio
+import datetime as dt
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from .downloader import HostRateLimiter, new_session
+
+"""
+Inkrementeller Crawler für die Plenarprotokoll-Listen des Landtags.
+
+Die Listen (ajax/filterlist, HTML-Seite) sind neueste zuerst sortiert. CrawlState merkt sich als
+Hochwassermarke die Schlüssel der HIGH_WATER_KEYS neuesten Einträge (mehrere, damit ein gelöschter
+oder umbenannter Eintrag die Marke nicht entwertet) und alle bereits gemeldeten PDF-URLs.
+
+crawl_filterlist:
+- inkrementell: Seiten ab offset 0 nacheinander, Abbruch beim ersten bekannten Eintrag – ein
+  täglicher Lauf kostet typischerweise eine Anfrage
+- Backfill (kein Zustand oder full=True): erste Seite bestimmt die Seitengröße, danach werden die
+  weiteren Offsets in Wellen zu je concurrency Anfragen parallel geholt (Pro-Host-Drosselung wie im
+  Downloader), bis eine Seite leer oder kürzer ist
+crawl_html: bedingte Anfrage (ETag/Last-Modified aus dem Zustand); 304 = nichts Neues.
+
+Neue PDFs landen im Manifest (write_manifest): eine URL pro Zeile für parse_landtag_pdf.py
+--list-file, daneben <manifest>.json mit Titel/Fundzeitpunkt.
+"""
+
+HIGH_WATER_KEYS = 10
+
+FetchJson = Callable[[str], Any]
+
+
+def _now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """Stabiler Schlüssel eines Listeneintrags: id, sonst erste Dokument-URL, sonst Titel."""
+    if item.get("id") is not None:
+        return f"id:{item['id']}"
+    for doc in item.get("documents") or []:
+        if doc.get("url"):
+            return f"url:{doc['url']}"
+    return f"title:{item.get('title', '')}|{item.get('subtitle', '')}"
+
+
+@dataclass
+class CrawlState:
+    path: Optional[Path] = None
+    high_water: List[str] = field(default_factory=list)
+    pdf_urls: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    last_run: Optional[str] = None
+
+    @classmethod
+    def load(cls, path) -> "CrawlState":
+        p = Path(path)
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path=p)
+        return cls(
+            path=p,
+            high_water=list(data.get("high_water") or []),
+            pdf_urls=list(data.get("pdf_urls") or []),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            last_run=data.get("last_run"),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.high_water and not self.pdf_urls
+
+    def advance(self, newest_keys: List[str]) -> None:
+        """Neue Spitzenschlüssel vor die alten setzen, auf HIGH_WATER_KEYS kürzen."""
+        merged: List[str] = []
+        for k in newest_keys + self.high_water:
+            if k not in merged:
+                merged.append(k)
+        self.high_water = merged[:HIGH_WATER_KEYS]
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.last_run = _now_iso()
+        tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps({
+            "high_water": self.high_water,
+            "pdf_urls": self.pdf_urls,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "last_run": self.last_run,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class CrawlResult:
+    new_items: List[Dict[str, Any]]
+    requests: int
+    mode: str                     # incremental | backfill | not-modified
+
+
+# ------------------------- Filterlist (JSON, paginiert) -------------------------
+
+def _session_fetch_json(session: requests.Session, timeout: float = 60.0) -> FetchJson:
+    def fetch(url: str) -> Any:
+        r = session.get(url, timeout=timeout)
+        r.raise_for_status()
+        return r.json() if r.content.strip() else {}
+    return fetch
+
+
+def _items(data: Any) -> List[Dict[str, Any]]:
+    if isinstance(data, dict):
+        return list(data.get("result") or [])
+    return list(data or [])
+
+
+async def _fetch_offsets(url_template: str, offsets: List[int], fetch: FetchJson,
+                         limiter: HostRateLimiter, executor: ThreadPoolExecutor) -> List[List[Dict[str, Any]]]:
+    host = urlsplit(url_template).netloc
+    loop = asyncio.get_running_loop()
+
+    async def one(offset: int) -> List[Dict[str, Any]]:
+        async with limiter.slot(host):
+            await limiter.wait_turn(host)
+            data = await loop.run_in_executor(executor, fetch, url_template.format(offset=offset))
+            return _items(data)
+
+    return list(await asyncio.gather(*(one(o) for o in offsets)))
+
+
+def _backfill(url_template: str, fetch: FetchJson, concurrency: int,
+              per_host_interval: float) -> Tuple[List[Dict[str, Any]], int]:
+    first = _items(fetch(url_template.format(offset=0)))
+    n_requests = 1
+    if not first:
+        return [], n_requests
+    page_size = len(first)
+    pages = [first]
+    limiter = HostRateLimiter(per_host_interval, per_host_concurrency=concurrency)
+
+    async def run() -> int:
+        count = 0
+        next_page = 1
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crawl") as executor:
+            while True:
+                offsets = [(next_page + k) * page_size for k in range(concurrency)]
+                wave = await _fetch_offsets(url_template, offsets, fetch, limiter, executor)
+                count += len(offsets)
+                next_page += concurrency
+                for items in wave:
+                    if not items:
+                        return count
+                    pages.append(items)
+                    if len(items) < page_size:
+                        return count
+    n_requests += asyncio.run(run())
+    return [it for page in pages for it in page], n_requests
+
+
+def crawl_filterlist(url_template: str, state: CrawlState, fetch: Optional[FetchJson] = None,
+                     full: bool = False, concurrency: int = 4,
+                     per_host_interval: float = 0.5) -> CrawlResult:
+    """
+    url_template mit {offset}. fetch: URL -> JSON (Default: gepoolte requests-Session).
+    Liefert die Einträge, die neuer als die Hochwassermarke sind (neueste zuerst), und schreibt die
+    Marke fort; gespeichert wird erst mit state.save().
+    """
+    session = None
+    if fetch is None:
+        session = new_session(pool_size=concurrency)
+        fetch = _session_fetch_json(session)
+    try:
+        known = set(state.high_water)
+        if full or state.is_empty:
+            items, n_requests = _backfill(url_template, fetch, concurrency, per_host_interval)
+            new_items = [it for it in items if item_key(it) not in known] if not full else items
+            mode = "backfill"
+        else:
+            new_items = []
+            n_requests = 0
+            offset = 0
+            while True:
+                items = _items(fetch(url_template.format(offset=offset)))
+                n_requests += 1
+                if not items:
+                    break
+                hit = False
+                for it in items:
+                    if item_key(it) in known:
+                        hit = True
+                        break
+                    new_items.append(it)
+                if hit:
+                    break
+                offset += len(items)
+            mode = "incremental"
+        state.advance([item_key(it) for it in new_items[:HIGH_WATER_KEYS]])
+        return CrawlResult(new_items, n_requests, mode)
+    finally:
+        if session is not None:
+            session.close()
+
+
+# ------------------------- HTML-Liste (eine Seite) -------------------------
+
+def crawl_html(page_url: str, state: CrawlState, extract_links: Callable[[bytes], List[str]],
+               session: Optional[requests.Session] = None, timeout: float = 60.0) -> Tuple[List[str], CrawlResult]:
+    """
+    Holt die Seite bedingt; extract_links(html_bytes) -> PDF-URLs. Rückgabe: (alle Links der Seite,
+    CrawlResult mit den noch unbekannten Links als new_items = [{"url": ...}]).
+    """
+    own = session is None
+    session = session or new_session(pool_size=1)
+    headers: Dict[str, str] = {}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    try:
+        r = session.get(page_url, headers=headers, timeout=timeout)
+        if r.status_code == 304:
+            return [], CrawlResult([], 1, "not-modified")
+        r.raise_for_status()
+        links = extract_links(r.content)
+        state.etag = r.headers.get("ETag")
+        state.last_modified = r.headers.get("Last-Modified")
+        known = set(state.pdf_urls)
+        new = []
+        for u in links:
+            if u not in known:
+                known.add(u)
+                new.append({"url": u})
+        return links, CrawlResult(new, 1, "incremental")
+    finally:
+        if own:
+            session.close()
+
+
+# ------------------------- Manifest -------------------------
+
+def new_pdf_links(items: List[Dict[str, Any]], state: CrawlState,
+                  pdf_links: Callable[[List[Dict[str, Any]]], List[str]]) -> List[str]:
+    """PDF-URLs der neuen Einträge, die noch nicht gemeldet wurden; merkt sie im Zustand vor."""
+    seen = set(state.pdf_urls)
+    out: List[str] = []
+    for url in pdf_links(items):
+        if url not in seen:
+            seen.add(url)
+            out.append(url)
+    state.pdf_urls.extend(out)
+    return out
+
+
+def save_unless_failed(state: CrawlState, results: List[Any]) -> List[str]:
+    """
+    Speichert den Zustand nur, wenn keiner der Downloads (DownloadResult) fehlgeschlagen ist; sonst
+    bleiben Hochwassermarke, gemeldete URLs und ETag beim alten Stand, und der nächste Lauf findet die
+    Einträge erneut (bereits geladene PDFs zählen dann als cached). Rückgabe: URLs der Fehlschläge.
+    """
+    failed = [r.url for r in results if not r.ok]
+    if not failed:
+        state.save()
+    return failed
+
+
+def write_manifest(path, urls: List[str], items: Optional[Dict[str, Dict[str, Any]]] = None) -> Path:
+    """
+    Schreibt die neuen PDF-URLs (eine pro Zeile, direkt als --list-file nutzbar) und daneben
+    <path>.json mit Fundzeitpunkt und optionalen Details pro URL.
+    """
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text("".join(u + "\n" for u in urls), encoding="utf-8")
+    now = _now_iso()
+    details = [{"url": u, "discovered_at": now, **((items or {}).get(u) or {})} for u in urls]
+    p.with_name(p.name + ".json").write_text(json.dumps(details, ensure_ascii=False, indent=2), encoding="utf-8")
+    return p
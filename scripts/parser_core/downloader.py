@@ -1,17 +1,320 @@
+import asyncio
 import hashlib
+import json
 import os
-import requests
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-
-def download_pdf(url: str, cache_dir: str = ".cache/pdfs", force: bool = False) -> Path:
-    Path(cache_dir).mkdir(parents=True, exist_ok=True)
-    # Simple hash of URL for filename
-    h = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
-    out = Path(cache_dir) / f"{h}.pdf"
-    if out.exists() and not force:
-        return out
-    r = requests.get(url, timeout=60)
-    r.raise_for_status()
-    out.write_bytes(r.content)
-    return out
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .pdfcache import DEFAULT_ROOT, PdfStore
+
+"""
+Download-Engine für Protokoll-PDFs.
+
+AsyncDownloader lädt viele URLs nebenläufig:
+- begrenzte Parallelität (concurrency) und höchstens per_host_concurrency gleichzeitige Anfragen
+  pro Host, Anfragestarts pro Host mindestens per_host_interval Sekunden auseinander (landtag-bw.de)
+- HTTP über requests-Sessions mit Connection-Pool (Keep-Alive), eine Session pro Worker-Thread;
+  asyncio steuert Planung und Limits, die blockierenden Aufrufe laufen im Thread-Pool
+- bedingte Anfragen: ETag/Last-Modified (URL-Index des PdfStore bzw. <datei>.meta.json) werden als
+  If-None-Match/If-Modified-Since mitgeschickt; 304 lässt die Datei unverändert
+- der Body wird gestreamt in eine Temp-Datei geschrieben und dabei gehasht (SHA-256), erst danach
+  atomar übernommen – kein ganzes PDF im Speicher, keine halben Dateien im Cache
+
+Standardziel ist der inhaltsadressierte PdfStore (parser_core.pdfcache); download_pdf bleibt die
+synchrone Einzel-Variante (bekannte URL gilt ohne Anfrage als aktuell).
+"""
+
+USER_AGENT = "landtag-protokoll-parser (+https://www.landtag-bw.de)"
+CHUNK_SIZE = 1 << 16
+
+STATUS_DOWNLOADED = "downloaded"
+STATUS_NOT_MODIFIED = "not-modified"
+STATUS_CACHED = "cached"
+STATUS_ERROR = "error"
+
+
+@dataclass
+class DownloadResult:
+    url: str
+    path: Optional[Path]
+    status: str
+    sha256: Optional[str] = None
+    size: Optional[int] = None
+    http_status: Optional[int] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != STATUS_ERROR
+
+
+def _meta_path(dest: Path) -> Path:
+    return dest.with_name(dest.name + ".meta.json")
+
+
+def read_meta(dest: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(_meta_path(dest).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_meta(dest: Path, meta: Dict[str, Any]) -> None:
+    tmp = _meta_path(dest).with_suffix(f".tmp{os.getpid()}-{threading.get_ident()}")
+    tmp.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, _meta_path(dest))
+
+
+def new_session(pool_size: int = 4) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def _stream_body(r: requests.Response, fd: int, tmp_name: str, chunk_size: int):
+    """Schreibt den Body gestreamt nach fd und hasht ihn dabei; (sha256, Bytes). Fehler: Temp-Datei weg."""
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    h.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return h.hexdigest(), size
+
+
+def fetch_to_file(session: requests.Session, url: str, dest: Path, force: bool = False,
+                  revalidate: bool = True, timeout: float = 60.0,
+                  chunk_size: int = CHUNK_SIZE) -> DownloadResult:
+    """
+    Blockierender Einzel-Download nach dest.
+    Vorhandene Datei: ohne force und mit bekannten Validatoren (und revalidate) bedingte Anfrage,
+    sonst ohne Anfrage "cached". Fehler werden als Ausnahme weitergereicht.
+    """
+    t0 = time.monotonic()
+    meta = read_meta(dest) if dest.exists() else {}
+    headers: Dict[str, str] = {}
+    if dest.exists() and not force:
+        if not revalidate or not (meta.get("etag") or meta.get("last_modified")):
+            return DownloadResult(url, dest, STATUS_CACHED, meta.get("sha256"), dest.stat().st_size,
+                                  elapsed=time.monotonic() - t0)
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code == 304:
+            return DownloadResult(url, dest, STATUS_NOT_MODIFIED, meta.get("sha256"), dest.stat().st_size,
+                                  http_status=304, elapsed=time.monotonic() - t0)
+        r.raise_for_status()
+        fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=dest.name + ".", suffix=".part")
+        digest, size = _stream_body(r, fd, tmp_name, chunk_size)
+        os.replace(tmp_name, dest)
+        _write_meta(dest, {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "sha256": digest,
+            "size": size,
+        })
+        return DownloadResult(url, dest, STATUS_DOWNLOADED, digest, size, http_status=r.status_code,
+                              elapsed=time.monotonic() - t0)
+
+
+def fetch_to_store(session: requests.Session, url: str, store: PdfStore, force: bool = False,
+                   revalidate: bool = True, timeout: float = 60.0,
+                   chunk_size: int = CHUNK_SIZE) -> DownloadResult:
+    """
+    Wie fetch_to_file, Ziel ist aber der inhaltsadressierte PdfStore: Validatoren kommen aus dessen
+    URL-Index, gleicher Inhalt unter neuer URL wird nicht doppelt abgelegt.
+    """
+    t0 = time.monotonic()
+    known = None if force else store.lookup_url(url)
+    headers: Dict[str, str] = {}
+    if known is not None:
+        if not revalidate or not (known.etag or known.last_modified):
+            store.touch(known.sha256)
+            path = store.blob_path(known.sha256)
+            return DownloadResult(url, path, STATUS_CACHED, known.sha256, path.stat().st_size,
+                                  elapsed=time.monotonic() - t0)
+        if known.etag:
+            headers["If-None-Match"] = known.etag
+        if known.last_modified:
+            headers["If-Modified-Since"] = known.last_modified
+
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code == 304 and known is not None:
+            store.touch(known.sha256)
+            path = store.blob_path(known.sha256)
+            return DownloadResult(url, path, STATUS_NOT_MODIFIED, known.sha256, path.stat().st_size,
+                                  http_status=304, elapsed=time.monotonic() - t0)
+        r.raise_for_status()
+        fd, tmp_name = store.new_temp_file()
+        digest, size = _stream_body(r, fd, tmp_name, chunk_size)
+        path = store.put_file(tmp_name, digest, size)
+        store.record_url(url, digest, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        return DownloadResult(url, path, STATUS_DOWNLOADED, digest, size, http_status=r.status_code,
+                              elapsed=time.monotonic() - t0)
+
+
+def download_pdf(url: str, cache_dir: str = DEFAULT_ROOT, force: bool = False,
+                 max_bytes: Optional[int] = None, store: Optional[PdfStore] = None) -> Path:
+    """
+    Einzel-Download in den PdfStore (store oder PdfStore(cache_dir, max_bytes)); bekannte URLs
+    werden ohne Anfrage aus dem Store bedient.
+    """
+    store = store or PdfStore(cache_dir, max_bytes=max_bytes)
+    if not force:
+        path = store.path_for_url(url)
+        if path is not None:
+            return path
+    with new_session(pool_size=1) as session:
+        return fetch_to_store(session, url, store, force=force, revalidate=False).path
+
+
+# ------------------------- Asynchrone Engine -------------------------
+
+class HostRateLimiter:
+    """Pro Host: höchstens per_host_concurrency gleichzeitig, Starts mindestens interval Sekunden auseinander."""
+
+    def __init__(self, interval: float = 1.0, per_host_concurrency: int = 2):
+        self.interval = interval
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._last_start: Dict[str, float] = {}
+
+    def slot(self, host: str) -> asyncio.Semaphore:
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._slots[host]
+
+    async def wait_turn(self, host: str, gate: Optional[asyncio.Semaphore] = None) -> None:
+        """
+        Wartet, bis der Host wieder an der Reihe ist. gate (globaler Slot) wird erst nach dieser Wartezeit
+        belegt, damit ein gedrosselter Host keine Slots anderer Hosts blockiert; der Start zählt ab der
+        Belegung, freigeben muss der Aufrufer.
+        """
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            last = self._last_start.get(host)
+            if last is not None:
+                delay = last + self.interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if gate is not None:
+                await gate.acquire()
+            self._last_start[host] = time.monotonic()
+
+
+class AsyncDownloader:
+    """
+    Ziel: der PdfStore in cache_dir (max_bytes: Größengrenze, LRU) oder – mit dest_for (URL -> Pfad) –
+    frei benannte Dateien mit <datei>.meta.json. revalidate=False: bekannte URLs bzw. vorhandene
+    Dateien gelten ohne Anfrage als aktuell (wie download_pdf).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_ROOT, concurrency: int = 4,
+                 per_host_concurrency: int = 2, per_host_interval: float = 1.0,
+                 timeout: float = 60.0, revalidate: bool = True,
+                 dest_for: Optional[Callable[[str], Path]] = None,
+                 session_factory: Optional[Callable[[], requests.Session]] = None,
+                 max_bytes: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.revalidate = revalidate
+        self.dest_for = dest_for
+        self.store = PdfStore(cache_dir, max_bytes=max_bytes) if dest_for is None else None
+        self.limiter = HostRateLimiter(per_host_interval, per_host_concurrency)
+        self._session_factory = session_factory or (lambda: new_session(pool_size=per_host_concurrency))
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._session_factory()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _fetch_blocking(self, url: str, force: bool) -> DownloadResult:
+        if self.store is not None:
+            return fetch_to_store(self._session(), url, self.store, force=force,
+                                  revalidate=self.revalidate, timeout=self.timeout)
+        return fetch_to_file(self._session(), url, self.dest_for(url), force=force,
+                             revalidate=self.revalidate, timeout=self.timeout)
+
+    async def _fetch(self, url: str, force: bool, executor: ThreadPoolExecutor,
+                     gate: asyncio.Semaphore) -> DownloadResult:
+        host = urlsplit(url).netloc
+        t0 = time.monotonic()
+        # Erst Host-Slot und Host-Wartezeit, dann der globale Slot: Wartende auf einen Host blockieren
+        # keine anderen Hosts
+        async with self.limiter.slot(host):
+            await self.limiter.wait_turn(host, gate)
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(executor, self._fetch_blocking, url, force)
+            except (requests.RequestException, OSError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                return DownloadResult(url, None, STATUS_ERROR, http_status=status,
+                                      elapsed=time.monotonic() - t0, error=f"{type(e).__name__}: {e}")
+            finally:
+                gate.release()
+
+    async def fetch_all(self, urls: Iterable[str], force: bool = False,
+                        on_result: Optional[Callable[[DownloadResult], None]] = None) -> List[DownloadResult]:
+        """Lädt alle URLs; Ergebnisse in Eingabereihenfolge, on_result sofort bei Fertigstellung."""
+        gate = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="download") as executor:
+
+            async def one(url: str) -> DownloadResult:
+                result = await self._fetch(url, force, executor, gate)
+                if on_result is not None:
+                    on_result(result)
+                return result
+
+            try:
+                return list(await asyncio.gather(*(one(u) for u in urls)))
+            finally:
+                self.close()
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+        self._local = threading.local()
+
+
+def download_all(urls: Iterable[str], force: bool = False,
+                 on_result: Optional[Callable[[DownloadResult], None]] = None,
+                 **downloader_kwargs: Any) -> List[DownloadResult]:
+    """Synchroner Einstieg für Skripte: asyncio.run(AsyncDownloader(**kwargs).fetch_all(...))."""
+    return asyncio.run(AsyncDownloader(**downloader_kwargs).fetch_all(urls, force=force, on_result=on_result))
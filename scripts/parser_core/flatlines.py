@@ -0,0 +1,186 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .normalize import nfkc
+
+"""
+Spaltenorientierte flache Zeilenliste (Seite, Zeilenindex, Text) für TOC-Split und TOC-Parser.
+
+Statt eines Dicts {"page", "line_index", "text"} pro Dokumentzeile liegen Seiten und Zeilenindizes in
+uint32-Arrays, Rohtexte und NFKC-normalisierte Texte in zwei parallelen Listen. Die Normalisierung
+läuft höchstens einmal je Zeile, beim ersten Zugriff (norm/norm_texts) – der TOC-Split bricht am
+Body-Beginn ab und normalisiert den Rest des Dokuments nie. Ist eine Zeile bereits normalisiert,
+zeigen beide Listen auf dasselbe String-Objekt.
+
+Slicing mit step 1 liefert eine Sicht auf dieselben Spalten (keine Kopie) – so entstehen TOC- und
+Body-Teil beim Split. Eine Sicht hält die ganze Spaltenablage am Leben; wer nur einen kleinen Teil
+aufbewahrt (Stufen-Ergebnis, Cache), nimmt compact(). Pickle speichert nur die sichtbaren Zeilen, ohne
+normalisierte Texte.
+
+Kompatibilität: lines[i] und die Iteration liefern die bisherigen Dicts, == vergleicht auch mit einer
+Liste solcher Dicts, from_dicts() übernimmt sie.
+"""
+
+
+class FlatLines:
+    __slots__ = ("pages", "line_indices", "texts", "norms", "start", "stop")
+
+    def __init__(self):
+        self.pages = array("I")
+        self.line_indices = array("I")
+        self.texts: List[str] = []
+        self.norms: List[Optional[str]] = []     # None = noch nicht normalisiert
+        self.start = 0
+        self.stop = 0
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Sequence[str]], first_page: int = 1) -> "FlatLines":
+        flat = cls()
+        for pi, lines in enumerate(pages, start=first_page):
+            flat.extend_page(pi, lines)
+        return flat
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> "FlatLines":
+        flat = cls()
+        for row in rows:
+            flat.append(int(row.get("page", 0)), int(row.get("line_index", 0)), row.get("text") or "")
+        return flat
+
+    @classmethod
+    def coerce(cls, lines: Union["FlatLines", Iterable[Dict[str, Any]]]) -> "FlatLines":
+        return lines if isinstance(lines, FlatLines) else cls.from_dicts(lines)
+
+    # --- Aufbau (nur auf der ganzen Ablage, nicht auf Sichten) ---
+
+    def _check_owner(self) -> None:
+        if self.start != 0 or self.stop != len(self.texts):
+            raise ValueError("FlatLines-Sicht ist nicht erweiterbar")
+
+    def append(self, page: int, line_index: int, text: str) -> None:
+        self._check_owner()
+        self.pages.append(page)
+        self.line_indices.append(line_index)
+        self.texts.append(text)
+        self.norms.append(None)
+        self.stop += 1
+
+    def extend_page(self, page: int, lines: Sequence[str]) -> None:
+        self._check_owner()
+        n = len(lines)
+        self.pages.extend([page] * n)
+        self.line_indices.extend(range(n))
+        self.texts.extend(lines)
+        self.norms.extend([None] * n)
+        self.stop += n
+
+    # --- Zugriff (Indizes relativ zur Sicht) ---
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def page(self, i: int) -> int:
+        return self.pages[self.start + i]
+
+    def line_index(self, i: int) -> int:
+        return self.line_indices[self.start + i]
+
+    def text(self, i: int) -> str:
+        return self.texts[self.start + i]
+
+    def norm(self, i: int) -> str:
+        """NFKC-normalisierter Text (normalize.nfkc, einmal berechnet)."""
+        k = self.start + i
+        t = self.norms[k]
+        if t is None:
+            t = self.norms[k] = nfkc(self.texts[k])
+        return t
+
+    def page_numbers(self) -> array:
+        return self.pages[self.start:self.stop]
+
+    def norm_texts(self) -> List[str]:
+        norms, texts = self.norms, self.texts
+        for k in range(self.start, self.stop):
+            if norms[k] is None:
+                norms[k] = nfkc(texts[k])
+        return norms[self.start:self.stop]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        k = self.start + i
+        return {"page": self.pages[k], "line_index": self.line_indices[k], "text": self.texts[k]}
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict[str, Any], "FlatLines"]:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return self.take(range(start, stop, step))
+            view = FlatLines.__new__(FlatLines)
+            view.pages, view.line_indices, view.texts, view.norms = self.pages, self.line_indices, self.texts, self.norms
+            view.start = self.start + start
+            view.stop = self.start + max(start, stop)
+            return view
+        n = len(self)
+        if key < 0:
+            key += n
+        if not 0 <= key < n:
+            raise IndexError("FlatLines index out of range")
+        return self.row(key)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    def take(self, rows: Iterable[int]) -> "FlatLines":
+        """Kopie mit den Zeilen rows (relativ zur Sicht), z. B. für nicht zusammenhängende Auswahlen."""
+        out = FlatLines()
+        base = self.start
+        for i in rows:
+            k = base + i
+            out.pages.append(self.pages[k])
+            out.line_indices.append(self.line_indices[k])
+            out.texts.append(self.texts[k])
+            out.norms.append(self.norms[k])
+        out.stop = len(out.texts)
+        return out
+
+    def compact(self) -> "FlatLines":
+        """Eigene Spalten nur mit den sichtbaren Zeilen (gibt die übrige Ablage frei)."""
+        if self.start == 0 and self.stop == len(self.texts):
+            return self
+        out = FlatLines()
+        out.pages = self.pages[self.start:self.stop]
+        out.line_indices = self.line_indices[self.start:self.stop]
+        out.texts = self.texts[self.start:self.stop]
+        out.norms = self.norms[self.start:self.stop]
+        out.stop = len(out.texts)
+        return out
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, list):
+            return self.to_dicts() == other
+        if not isinstance(other, FlatLines):
+            return NotImplemented
+        return (self.page_numbers() == other.page_numbers()
+                and self.line_indices[self.start:self.stop] == other.line_indices[other.start:other.stop]
+                and self.texts[self.start:self.stop] == other.texts[other.start:other.stop])
+
+    def __reduce__(self):
+        # norms bleiben draußen: sie sind ableitbar, und Pickle (Stufen-Digest) hängt so nicht davon ab,
+        # welche Zeilen schon normalisiert wurden
+        c = self.compact()
+        return (_restore, (c.pages, c.line_indices, c.texts))
+
+    def __repr__(self) -> str:
+        return f"FlatLines({len(self)} Zeilen)"
+
+
+def _restore(pages: array, line_indices: array, texts: List[str]) -> FlatLines:
+    flat = FlatLines()
+    flat.pages, flat.line_indices, flat.texts = pages, line_indices, texts
+    flat.norms = [None] * len(texts)
+    flat.stop = len(texts)
+    return flat
@@ -0,0 +1,161 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .wordtable import WordTable, group_lines_by_y
+
+"""
+Geometrischer Vorfilter für Kopf-/Fußzeilen.
+
+Aus einigen Lernseiten wird pro Seitenparität (gerade/ungerade – Kolumnentitel sitzen im Protokoll
+abwechselnd auf unterschiedlicher Höhe) ein y-Band für die laufende Kopfzeile und eines für die
+Fußzeile bestimmt: Die oberste bzw. unterste Zeile muss auf mindestens min_share der Lernseiten
+derselben Parität denselben Text (Zahlen entfernt) auf derselben Höhe tragen. Die Bandgrenze liegt
+knapp (Y_TOLERANCE) jenseits dieser Zeile, höchstens in der Mitte des Leerraums zur nächsten Zeile.
+
+Fußzeilen-Bänder sind optional (learn_footer): Im Landtagsprotokoll steht die Seitenzahl in einer
+Spalte, während die andere Spalte auf manchen Seiten darunter weiterläuft.
+
+Auf allen übrigen Seiten werden die Wörter der Bänder direkt nach extract_words verworfen, also vor
+Zeilenbildung und Spaltenzuordnung (filter_table). Verworfen wird nur, was ganz im Band liegt; ein
+Wort, das über die Bandgrenze hinausragt (z. B. größere Schrift im Rumpf direkt darunter), bleibt.
+page.crop spart hier nichts: pdfminer parst die Seite ohnehin vollständig, crop beschneidet danach
+zusätzlich jedes Objekt (gemessen ~10 % mehr CPU-Zeit als ungefilterte Extraktion). Text, der nicht
+in ein gelerntes Band fällt, bleibt dem textbasierten Header/Footer-Filter überlassen.
+"""
+
+# Toleranz (pt) für „gleiche Höhe“ einer Kopf-/Fußzeile über die Lernseiten
+Y_TOLERANCE = 2.0
+_PARITY = {0: "even", 1: "odd"}
+
+
+@dataclass
+class HeaderFooterBands:
+    # Parität (0 = gerade, 1 = ungerade) -> y-Grenze; Wörter mit bottom <= header_bottom bzw.
+    # top >= footer_top liegen im Band, Wörter, die die Grenze nur überlappen, nicht
+    header_bottom: Dict[int, float] = field(default_factory=dict)
+    footer_top: Dict[int, float] = field(default_factory=dict)
+    skip_first_n_pages: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.header_bottom or self.footer_top)
+
+    def applies_to(self, page_number: int) -> bool:
+        return page_number > self.skip_first_n_pages
+
+    def filter_table(self, page_number: int, table: WordTable) -> WordTable:
+        """Entfernt die Wörter der Bänder aus einer extrahierten Tabelle (ohne Band: unverändert)."""
+        if not self.applies_to(page_number):
+            return table
+        header_bottom = self.header_bottom.get(page_number % 2)
+        footer_top = self.footer_top.get(page_number % 2)
+        keep = [i for i in range(len(table))
+                if (header_bottom is None or table.bottom[i] > header_bottom)
+                and (footer_top is None or table.top[i] < footer_top)]
+        if len(keep) == len(table):
+            return table
+        out = WordTable(table.strings)
+        out.text_idx = type(table.text_idx)(table.text_idx.typecode, (table.text_idx[i] for i in keep))
+        for name in ("x0", "x1", "top", "bottom"):
+            col = getattr(table, name)
+            setattr(out, name, type(col)(col.typecode, (col[i] for i in keep)))
+        return out
+
+    def to_meta(self) -> Dict[str, Any]:
+        """JSON-taugliche Darstellung (Debug-Sidecar, Wort-Cache); Umkehrung: from_meta."""
+        return {
+            "header_bottom": {_PARITY[k]: v for k, v in sorted(self.header_bottom.items())},
+            "footer_top": {_PARITY[k]: v for k, v in sorted(self.footer_top.items())},
+            "skip_first_n_pages": self.skip_first_n_pages,
+        }
+
+    @classmethod
+    def from_meta(cls, meta: Dict[str, Any]) -> "HeaderFooterBands":
+        parity = {v: k for k, v in _PARITY.items()}
+        return cls(
+            header_bottom={parity[k]: float(v) for k, v in meta.get("header_bottom", {}).items()},
+            footer_top={parity[k]: float(v) for k, v in meta.get("footer_top", {}).items()},
+            skip_first_n_pages=int(meta.get("skip_first_n_pages", 0)),
+        )
+
+
+def _line_key(table: WordTable, line: List[int], key: Callable[[str], str]) -> str:
+    text = " ".join(table.texts(line))
+    k = key(text)
+    if not k and text.replace(" ", "").isdigit():
+        # Reine Seitenzahlen normalisieren zu "", sollen aber als Fußzeile zählen
+        k = "#"
+    return k
+
+
+def _learn_edge(samples: List[Tuple[str, float, float, float]], n_pages: int, min_share: float,
+                header: bool) -> Optional[float]:
+    """
+    samples: (Schlüssel, top, bottom, Abstand-Grenze) der obersten/untersten Zeile je Lernseite;
+    Abstand-Grenze = top der nächsten (Kopf) bzw. bottom der vorherigen Zeile (Fuß).
+    """
+    keyed = [s for s in samples if s[0]]
+    if not keyed or n_pages <= 0:
+        return None
+    common, count = Counter(s[0] for s in keyed).most_common(1)[0]
+    if count / n_pages < min_share:
+        return None
+    hits = sorted((s for s in keyed if s[0] == common), key=lambda s: s[1])
+    ref_top = hits[len(hits) // 2][1]
+    hits = [s for s in hits if abs(s[1] - ref_top) <= Y_TOLERANCE]
+    if len(hits) / n_pages < min_share:
+        return None
+    if header:
+        edge = max(s[2] for s in hits)
+        neighbour = min(s[3] for s in hits)
+        if neighbour <= edge:
+            return None
+        return min(edge + Y_TOLERANCE, (edge + neighbour) / 2.0)
+    edge = min(s[1] for s in hits)
+    neighbour = max(s[3] for s in hits)
+    if neighbour >= edge:
+        return None
+    return max(edge - Y_TOLERANCE, (edge + neighbour) / 2.0)
+
+
+def learn_bands(pages: Sequence[Tuple[int, WordTable]],
+                key: Callable[[str], str],
+                min_share: float = 0.6,
+                skip_first_n_pages: int = 0,
+                y_quant: float = 3.0,
+                learn_footer: bool = True) -> HeaderFooterBands:
+    """
+    Lernt die Bänder aus (Seitennummer, Wort-Tabelle) der Lernseiten; Seiten <= skip_first_n_pages
+    (Titel/Inhaltsverzeichnis) werden ignoriert und später nicht zugeschnitten.
+    key normalisiert eine Zeile für den Vergleich (z. B. Seitenzahlen/Datum entfernt).
+    """
+    bands = HeaderFooterBands(skip_first_n_pages=skip_first_n_pages)
+    by_parity: Dict[int, List[Tuple[WordTable, List[List[int]]]]] = {0: [], 1: []}
+    for page_number, table in pages:
+        if page_number <= skip_first_n_pages or not len(table):
+            continue
+        by_parity[page_number % 2].append((table, group_lines_by_y(table, None, y_quant)))
+
+    for parity, entries in by_parity.items():
+        heads = []
+        foots = []
+        for table, lines in entries:
+            if len(lines) < 2:
+                continue
+            first, second = lines[0], lines[1]
+            last, before_last = lines[-1], lines[-2]
+            heads.append((_line_key(table, first, key),
+                          min(table.top[i] for i in first),
+                          max(table.bottom[i] for i in first),
+                          min(table.top[i] for i in second)))
+            foots.append((_line_key(table, last, key),
+                          min(table.top[i] for i in last),
+                          max(table.bottom[i] for i in last),
+                          max(table.bottom[i] for i in before_last)))
+        header = _learn_edge(heads, len(entries), min_share, header=True)
+        if header is not None:
+            bands.header_bottom[parity] = round(header, 3)
+        footer = _learn_edge(foots, len(entries), min_share, header=False) if learn_footer else None
+        if footer is not None:
+            bands.footer_top[parity] = round(footer, 3)
+    return bands
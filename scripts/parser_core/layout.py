@@ -1,6 +1,7 @@
 import pdfplumber
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
 import math
 
 @dataclass
@@ -9,6 +10,16 @@ class PageLayoutResult:
     method: str
     columns: int
     meta: Dict[str, Any]
+    # Ungerundeter Split (nur bei zwei Spalten), meta["split_x"] ist gerundet
+    split_x: Optional[float] = None
+
+@dataclass
+class LayoutTemplate:
+    """Dokumentweite Spaltengeometrie, auf einigen Stichprobenseiten ermittelt."""
+    split_x: float
+    page_width: float
+    sample_pages: List[int]
+    max_straddle_fraction: float = 0.02
 
 def extract_pages_with_layout(pdf_path: str,
                               force_two_column: bool = True,
@@ -21,6 +32,9 @@ def extract_pages_with_layout(pdf_path: str,
                               rebalance_target_low: float = 0.42,
                               rebalance_target_high: float = 0.58,
                               rebalance_scan_step: float = 5.0,
+                              template_sample_pages: int = 0,
+                              template_max_straddle_fraction: float = 0.02,
+                              template_min_gap: float = 0.0,
                               # Alias für Abwärtskompatibilität
                               min_peak_sep_rel: float | None = None):
     """
@@ -36,6 +50,14 @@ def extract_pages_with_layout(pdf_path: str,
       line_y_quant: Quantisierung der y-Koordinate zur Zeilenbildung.
       rebalance_target_low/high: Zielbereich für linke Spaltenfraktion nach Rebalancing.
       rebalance_scan_step: Schrittweite beim Rebalancing-Scan.
+      template_sample_pages: > 0 aktiviert den Template-Modus: volle Erkennung nur auf so vielen
+        Stichprobenseiten, die übrigen Seiten übernehmen deren Split (Fallback auf volle Erkennung,
+        wenn mehr als template_max_straddle_fraction der Wörter den Split kreuzen oder eine Seite
+        zu wenig Wörter bekäme). Pro Seite steht der Weg in meta["layout_pass"]
+        (sample | template | template-fallback).
+      template_max_straddle_fraction: zulässiger Anteil Wörter, die den Template-Split kreuzen.
+      template_min_gap: Mindestbreite (pt) des Spaltenzwischenraums auf den Stichprobenseiten,
+        sonst wird kein Template gebildet.
       min_peak_sep_rel: Alias (falls alte Aufrufe noch diesen Namen nutzen).
     """
     # Alias-Handling
@@ -45,26 +67,50 @@ def extract_pages_with_layout(pdf_path: str,
     pages_lines = []
     debug_meta = []
 
+    page_kwargs = dict(
+        force_two_column=force_two_column,
+        min_words_for_detection=min_words_for_detection,
+        min_side_fraction=min_side_fraction,
+        hist_bins=hist_bins,
+        min_peak_sep_rel=min_peak_separation_rel,
+        min_valley_rel_drop=min_valley_rel_drop,
+        line_y_quant=line_y_quant,
+        rebalance_target_low=rebalance_target_low,
+        rebalance_target_high=rebalance_target_high,
+        rebalance_scan_step=rebalance_scan_step
+    )
+
     with pdfplumber.open(pdf_path) as pdf:
-        for page_index, page in enumerate(pdf.pages, start=1):
-            result = _process_page(
-                page,
-                page_index,
-                force_two_column=force_two_column,
-                min_words_for_detection=min_words_for_detection,
-                min_side_fraction=min_side_fraction,
-                hist_bins=hist_bins,
-                min_peak_sep_rel=min_peak_separation_rel,
-                min_valley_rel_drop=min_valley_rel_drop,
-                line_y_quant=line_y_quant,
-                rebalance_target_low=rebalance_target_low,
-                rebalance_target_high=rebalance_target_high,
-                rebalance_scan_step=rebalance_scan_step
+        pages = list(pdf.pages)
+
+        # Template-Modus: volle Erkennung nur auf Stichprobenseiten, übrige Seiten übernehmen
+        # deren Split, solange die Validierung (_apply_template) greift.
+        sampled: Dict[int, PageLayoutResult] = {}
+        template = None
+        if template_sample_pages > 0:
+            template, sampled = _build_layout_template(
+                pages, template_sample_pages, template_max_straddle_fraction, page_kwargs,
+                min_gap=template_min_gap
             )
+
+        for page_index, page in enumerate(pages, start=1):
+            if page_index in sampled:
+                result = sampled[page_index]
+                layout_pass = "sample"
+            else:
+                result = _process_page(page, page_index, template=template, **page_kwargs)
+                if template is None:
+                    layout_pass = "full"
+                elif result.method == "two-column-template":
+                    layout_pass = "template"
+                else:
+                    layout_pass = "template-fallback"
             # Param-Info ergänzen
             result.meta.setdefault("param_min_peak_separation_rel", round(min_peak_separation_rel, 4))
             if min_peak_sep_rel is not None:
                 result.meta.setdefault("param_alias_used", True)
+            if template_sample_pages > 0:
+                result.meta["layout_pass"] = layout_pass
 
             pages_lines.append(result.lines)
             debug_meta.append({
@@ -75,6 +121,145 @@ def extract_pages_with_layout(pdf_path: str,
             })
     return pages_lines, debug_meta
 
+def sample_page_numbers(n_pages: int, n_samples: int) -> List[int]:
+    """Gleichmäßig über das Dokument verteilte Seitennummern (1-basiert, ohne Duplikate)."""
+    if n_pages <= 0 or n_samples <= 0:
+        return []
+    n_samples = min(n_samples, n_pages)
+    return sorted({int((k + 0.5) * n_pages / n_samples) + 1 for k in range(n_samples)})
+
+def _straddle_count(x0s_sorted: List[float], x1s_sorted: List[float], x: float) -> int:
+    """Anzahl Wörter mit x0 < x < x1 (x0/x1 jeweils aufsteigend sortiert)."""
+    # Wörter mit x1 <= x haben auch x0 < x
+    return bisect_left(x0s_sorted, x) - bisect_right(x1s_sorted, x)
+
+def _snap_to_gutter(words, center: float, page_width: float,
+                    window_rel: float = 0.12) -> Tuple[float, float]:
+    """
+    Verschiebt center auf die Mitte des längsten Laufs (nahezu) minimaler Überdeckung (Wörter, die x
+    kreuzen) innerhalb von ±window_rel·page_width – d. h. in den Spaltenzwischenraum der
+    Stichprobenseiten. Einzelne Überschriften über die volle Breite werden toleriert.
+    Rückgabe: (x, Breite des Laufs in pt).
+    """
+    if not words:
+        return center, 0.0
+    x0s = sorted(w["x0"] for w in words)
+    x1s = sorted(w["x1"] for w in words)
+    lo = max(0.0, center - page_width * window_rel)
+    hi = min(page_width, center + page_width * window_rel)
+    positions = [lo + i * 0.5 for i in range(int((hi - lo) / 0.5) + 1)]
+    counts = [_straddle_count(x0s, x1s, x) for x in positions]
+    limit = min(counts) + max(2, int(len(words) * 0.002))
+    run_start = None
+    best_run = (0, center, 0.0)
+    for i, c in enumerate(counts + [limit + 1]):
+        if c <= limit:
+            if run_start is None:
+                run_start = i
+            continue
+        if run_start is not None:
+            length = i - run_start
+            if length > best_run[0]:
+                best_run = (length, (positions[run_start] + positions[i - 1]) / 2.0,
+                            positions[i - 1] - positions[run_start])
+            run_start = None
+    return best_run[1], best_run[2]
+
+def build_layout_template(samples, max_straddle_fraction: float = 0.02,
+                          min_gap: float = 0.0) -> Optional[LayoutTemplate]:
+    """
+    Bildet das Template aus voll erkannten Stichprobenseiten.
+    samples: (page_number, words, page_width, PageLayoutResult) je Stichprobenseite.
+    Template-Split = Median der zweispaltigen Ergebnisse, eingerastet in den Spaltenzwischenraum;
+    None, wenn keine Seite zweispaltig ist oder der Zwischenraum schmaler als min_gap ist.
+    """
+    splits = []
+    sample_words = []
+    widths = []
+    for _page_number, words, page_width, result in samples:
+        if result.columns == 2 and result.split_x is not None:
+            splits.append(result.split_x)
+            sample_words.extend(words or [])
+            widths.append(page_width)
+    if not splits:
+        return None
+    splits.sort()
+    widths.sort()
+    mid = len(splits) // 2
+    median = splits[mid] if len(splits) % 2 else (splits[mid - 1] + splits[mid]) / 2.0
+    page_width = widths[len(widths) // 2]
+    split_x, gap = _snap_to_gutter(sample_words, median, page_width)
+    if gap < min_gap:
+        return None
+    return LayoutTemplate(
+        split_x=split_x,
+        page_width=page_width,
+        sample_pages=sorted(s[0] for s in samples),
+        max_straddle_fraction=max_straddle_fraction
+    )
+
+def _build_layout_template(pages, n_samples: int, max_straddle_fraction: float, page_kwargs,
+                           min_gap: float = 0.0):
+    """
+    Volle Erkennung auf n_samples Stichprobenseiten. Rückgabe: (Template oder None, Ergebnisse
+    der Stichprobenseiten nach Seitennummer).
+    """
+    samples = []
+    for page_number in sample_page_numbers(len(pages), n_samples):
+        page = pages[page_number - 1]
+        try:
+            words = page.extract_words(use_text_flow=False, keep_blank_chars=False)
+        except Exception:
+            words = None
+        result = _process_page(page, page_number, words=words, **page_kwargs)
+        samples.append((page_number, words, float(page.width or 0.0), result))
+    sampled = {s[0]: s[3] for s in samples}
+    template = build_layout_template(samples, max_straddle_fraction, min_gap=min_gap)
+    if template is not None:
+        for result in sampled.values():
+            result.meta["template_split_x"] = round(template.split_x, 2)
+    return template, sampled
+
+def _apply_template(template: LayoutTemplate, mid_word_pairs, words, pw: float,
+                    min_side_fraction: float, line_y_quant: float):
+    """
+    Günstige Validierung + Anwendung des Template-Splits. Rückgabe: (PageLayoutResult, None) oder
+    (None, Ablehnungsgrund als Dict).
+    """
+    if abs(pw - template.page_width) > 1.0:
+        return None, {"reason": "page_width", "page_width": round(pw, 2)}
+    sx = template.split_x
+    straddle = sum(1 for w in words if w["x0"] < sx < w["x1"])
+    straddle_fraction = straddle / len(words)
+    if straddle_fraction > template.max_straddle_fraction:
+        return None, {"reason": "straddle", "straddle_fraction": round(straddle_fraction, 3)}
+    left_words, right_words = _partition(mid_word_pairs, sx)
+    frac_left = len(left_words) / len(words)
+    frac_right = len(right_words) / len(words)
+    if frac_left < min_side_fraction or frac_right < min_side_fraction:
+        return None, {"reason": "min_side_fraction", "frac_left": round(frac_left, 3),
+                      "frac_right": round(frac_right, 3)}
+    merged = _lines_from_words(left_words, line_y_quant) + _lines_from_words(right_words, line_y_quant)
+    meta = {
+        "words": len(words),
+        "page_width": round(pw, 2),
+        "split_x": round(sx, 2),
+        "template_split_x": round(sx, 2),
+        "template_sample_pages": template.sample_pages,
+        "template_straddle_fraction": round(straddle_fraction, 3),
+        "left_count": len(left_words),
+        "right_count": len(right_words),
+        "left_fraction": round(frac_left, 3),
+        "right_fraction": round(frac_right, 3)
+    }
+    return PageLayoutResult(
+        lines=[l for l in merged if l.strip()],
+        method="two-column-template",
+        columns=2,
+        meta=meta,
+        split_x=sx
+    ), None
+
 def _process_page(page,
                   page_number: int,
                   force_two_column: bool,
@@ -86,10 +271,13 @@ def _process_page(page,
                   line_y_quant: float,
                   rebalance_target_low: float,
                   rebalance_target_high: float,
-                  rebalance_scan_step: float) -> PageLayoutResult:
+                  rebalance_scan_step: float,
+                  template: Optional[LayoutTemplate] = None,
+                  words=None) -> PageLayoutResult:
 
     try:
-        words = page.extract_words(use_text_flow=False, keep_blank_chars=False)
+        if words is None:
+            words = page.extract_words(use_text_flow=False, keep_blank_chars=False)
     except Exception as e:
         txt = page.extract_text() or ""
         return PageLayoutResult(
@@ -99,12 +287,72 @@ def _process_page(page,
             meta={"error": str(e)}
         )
 
+    return _layout_words(
+        words, float(page.width or 0.0), lambda: page.extract_text() or "",
+        force_two_column=force_two_column,
+        min_words_for_detection=min_words_for_detection,
+        min_side_fraction=min_side_fraction,
+        hist_bins=hist_bins,
+        min_peak_sep_rel=min_peak_sep_rel,
+        min_valley_rel_drop=min_valley_rel_drop,
+        line_y_quant=line_y_quant,
+        rebalance_target_low=rebalance_target_low,
+        rebalance_target_high=rebalance_target_high,
+        rebalance_scan_step=rebalance_scan_step,
+        template=template
+    )
+
+def layout_page_words(words,
+                      page_width: float,
+                      template: Optional[LayoutTemplate] = None,
+                      force_two_column: bool = True,
+                      min_words_for_detection: int = 25,
+                      min_side_fraction: float = 0.10,
+                      hist_bins: int = 80,
+                      min_peak_sep_rel: float = 0.18,
+                      min_valley_rel_drop: float = 0.30,
+                      line_y_quant: float = 3.0,
+                      rebalance_target_low: float = 0.42,
+                      rebalance_target_high: float = 0.58,
+                      rebalance_scan_step: float = 5.0) -> PageLayoutResult:
+    """
+    Spaltenerkennung für bereits extrahierte Wörter (pdfplumber-Dicts), z. B. aus dem Wort-Cache.
+    Einspaltige Fallbacks setzen den Text aus den Wörtern zusammen statt page.extract_text().
+    """
+    return _layout_words(
+        words, page_width, lambda: "\n".join(_lines_from_words(words, line_y_quant)),
+        force_two_column=force_two_column,
+        min_words_for_detection=min_words_for_detection,
+        min_side_fraction=min_side_fraction,
+        hist_bins=hist_bins,
+        min_peak_sep_rel=min_peak_sep_rel,
+        min_valley_rel_drop=min_valley_rel_drop,
+        line_y_quant=line_y_quant,
+        rebalance_target_low=rebalance_target_low,
+        rebalance_target_high=rebalance_target_high,
+        rebalance_scan_step=rebalance_scan_step,
+        template=template
+    )
+
+def _layout_words(words,
+                  pw: float,
+                  page_text: Callable[[], str],
+                  force_two_column: bool,
+                  min_words_for_detection: int,
+                  min_side_fraction: float,
+                  hist_bins: int,
+                  min_peak_sep_rel: float,
+                  min_valley_rel_drop: float,
+                  line_y_quant: float,
+                  rebalance_target_low: float,
+                  rebalance_target_high: float,
+                  rebalance_scan_step: float,
+                  template: Optional[LayoutTemplate] = None) -> PageLayoutResult:
     if not words:
         return PageLayoutResult(lines=[], method="empty-page", columns=1, meta={})
 
-    pw = float(page.width or 0.0)
     if pw <= 0:
-        txt = page.extract_text() or ""
+        txt = page_text()
         return PageLayoutResult(
             lines=_clean_lines(txt.splitlines()),
             method="fallback-pagewidth-zero",
@@ -113,7 +361,7 @@ def _process_page(page,
         )
 
     if len(words) < min_words_for_detection and not force_two_column:
-        txt = page.extract_text() or ""
+        txt = page_text()
         return PageLayoutResult(
             lines=_clean_lines(txt.splitlines()),
             method="single-low-word-count",
@@ -130,6 +378,16 @@ def _process_page(page,
         "page_width": round(pw, 2)
     }
 
+    if template is not None:
+        if len(words) >= min_words_for_detection:
+            templated, rejected = _apply_template(template, mid_word_pairs, words, pw,
+                                                  min_side_fraction, line_y_quant)
+            if templated is not None:
+                return templated
+        else:
+            rejected = {"reason": "low_word_count"}
+        debug_info["template_rejected"] = rejected
+
     hist_decision = _histogram_split(
         mids, pw, hist_bins,
         min_peak_sep_rel=min_peak_sep_rel,
@@ -173,7 +431,7 @@ def _process_page(page,
             chosen = (*forced, )
 
     if chosen is None:
-        txt = page.extract_text() or ""
+        txt = page_text()
         single_meta = {
             **debug_info,
             "reason": "no_split_candidate",
@@ -228,29 +486,91 @@ def _process_page(page,
         lines=[l for l in merged if l.strip()],
         method=method_name,
         columns=2,
-        meta=meta
+        meta=meta,
+        split_x=split_x
     )
 
+class _SplitSweep:
+    """
+    Sweep-Line über die nach Mittelpunkt sortierten Wörter: Beim Verschieben des Splits nach rechts
+    wandern Wörter von rechts nach links; linke Anzahl und L/R-Belegung je y-Bucket (und damit die
+    Zahl gemischter Zeilen) werden inkrementell gepflegt statt pro Kandidat neu aufgebaut.
+    Kandidaten müssen in aufsteigender Reihenfolge abgefragt werden.
+    """
+
+    def __init__(self, mid_word_pairs, y_quant: float = 3.0):
+        order = sorted(range(len(mid_word_pairs)), key=lambda i: mid_word_pairs[i][0])
+        bucket_ids: Dict[int, int] = {}
+        self._mids: List[float] = []
+        self._buckets: List[int] = []
+        for i in order:
+            m, w = mid_word_pairs[i]
+            yk = round(w["top"] / y_quant)
+            b = bucket_ids.get(yk)
+            if b is None:
+                b = bucket_ids[yk] = len(bucket_ids)
+            self._mids.append(m)
+            self._buckets.append(b)
+        self.n_buckets = len(bucket_ids)
+        self._left = [0] * self.n_buckets
+        self._right = [0] * self.n_buckets
+        for b in self._buckets:
+            self._right[b] += 1
+        self._mixed = 0
+        self.left_count = 0
+
+    def advance(self, x: float) -> None:
+        """Verschiebt den Split auf x: alle Wörter mit Mittelpunkt < x liegen links."""
+        mids = self._mids
+        buckets = self._buckets
+        left = self._left
+        right = self._right
+        n = len(mids)
+        k = self.left_count
+        mixed = self._mixed
+        while k < n and mids[k] < x:
+            b = buckets[k]
+            if left[b] == 0 and right[b] > 1:
+                mixed += 1
+            elif left[b] > 0 and right[b] == 1:
+                mixed -= 1
+            left[b] += 1
+            right[b] -= 1
+            k += 1
+        self.left_count = k
+        self._mixed = mixed
+
+    def penalty(self) -> float:
+        """Entspricht _mixed_line_penalty(links, rechts) für den aktuellen Split."""
+        return self._mixed / self.n_buckets if self.n_buckets else 0.0
+
+def _partition(mid_word_pairs, split_x):
+    left_words = [w for m, w in mid_word_pairs if m < split_x]
+    right_words = [w for m, w in mid_word_pairs if m >= split_x]
+    return left_words, right_words
+
 def _forced_balance_scan(mid_word_pairs, words_all, page_width, min_side_fraction):
     total = len(words_all)
     lo = page_width * 0.35
     hi = page_width * 0.65
     steps = max(1, int((hi - lo) / 10))
+    sweep = _SplitSweep(mid_word_pairs)
+    n_pairs = len(mid_word_pairs)
     best = None
     for i in range(steps + 1):
         x = lo + i * (hi - lo) / steps
-        left_words = [w for m, w in mid_word_pairs if m < x]
-        right_words = [w for m, w in mid_word_pairs if m >= x]
-        fl = len(left_words) / total
-        fr = len(right_words) / total
+        sweep.advance(x)
+        fl = sweep.left_count / total
+        fr = (n_pairs - sweep.left_count) / total
         if fl >= min_side_fraction and fr >= min_side_fraction:
             imbalance = abs(fl - 0.5)
-            penalty = _mixed_line_penalty(left_words, right_words)
+            penalty = sweep.penalty()
             score = imbalance * 2 + penalty * 0.5
             if best is None or score < best[0]:
-                best = (score, x, left_words, right_words, fl, fr, penalty)
+                best = (score, x, fl, fr, penalty)
     if best:
-        _, sx, lws, rws, fl, fr, penalty = best
+        _, sx, fl, fr, penalty = best
+        lws, rws = _partition(mid_word_pairs, sx)
         return (sx, "two-column-forced", {
             "forced_reason": "forced_balance_scan",
             "forced_penalty": round(penalty, 3)
@@ -283,23 +603,24 @@ def _rebalance_split(mid_word_pairs,
 
     candidate_positions.add(round(initial_split_x, 2))
 
+    # Kandidaten aufsteigend: ein Sweep über die sortierten Wörter statt Neuaufbau je Kandidat
+    sweep = _SplitSweep(mid_word_pairs)
     best = None
     for sx in sorted(candidate_positions):
-        lws = [w for m, w in mid_word_pairs if m < sx]
-        rws = [w for m, w in mid_word_pairs if m >= sx]
-        fl = len(lws) / total
-        mp = _mixed_line_penalty(lws, rws)
+        sweep.advance(sx)
+        fl = sweep.left_count / total
+        mp = sweep.penalty()
         imbalance = abs(fl - 0.5)
         score = imbalance * 2 + mp * 0.6
         if best is None or score < best[0]:
-            best = (score, sx, lws, rws, fl, 1 - fl, mp)
+            best = (score, sx, fl, 1 - fl, mp)
         if target_low <= fl <= target_high and mp == 0:
             break
 
     if not best:
         return None
 
-    score, sx, lws, rws, fl, fr, mp = best
+    score, sx, fl, fr, mp = best
     initial_fl = len(left_words_initial) / total
     initial_imb = abs(initial_fl - 0.5)
     improved = abs(fl - 0.5) < initial_imb or (target_low <= fl <= target_high)
@@ -307,6 +628,7 @@ def _rebalance_split(mid_word_pairs,
     if not improved:
         return None
 
+    lws, rws = _partition(mid_word_pairs, sx)
     extra_meta = {
         "rebalance_initial_split_x": round(initial_split_x, 2),
         "rebalance_new_split_x": round(sx, 2),
@@ -337,7 +659,10 @@ def _histogram_split(mids: List[float],
                      min_valley_rel_drop: float):
     if len(mids) < 10 or page_width <= 0:
         return None
-    lo = min(mids); hi = max(mids)
+    # Sortierte Mittelpunkte: Bin-Belegung per bisect statt Vergleich jedes Wortes mit jedem Bin
+    # (O(n + bins·log n) statt O(bins·n)); bei bereits sortierter Eingabe ist sorted() linear.
+    mids_sorted = sorted(mids)
+    lo = mids_sorted[0]; hi = mids_sorted[-1]
     if hi - lo < page_width * 0.3:
         return None
     bin_w = (hi - lo) / bins if bins > 0 else (hi - lo)
@@ -350,11 +675,8 @@ def _histogram_split(mids: List[float],
         start = lo + i * bin_w
         end = start + bin_w
         edges.append((start, end))
-        cnt = 0
-        for m in mids:
-            if start <= m < end:
-                cnt += 1
-        counts.append(cnt)
+        # Anzahl m mit start <= m < end
+        counts.append(bisect_left(mids_sorted, end) - bisect_left(mids_sorted, start))
 
     peaks = []
     for i in range(1, bins - 1):
@@ -0,0 +1,131 @@
+import datetime as dt
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+"""
+Parse-Manifest für inkrementelle Korpus-Läufe.
+
+Im Ausgabeverzeichnis liegt parse_manifest.json; pro Quelle (URL oder Pfad, wie in --list-file):
+  pdf_sha256    SHA-256 der PDF-Bytes, aus denen die Ausgaben entstanden sind
+  fingerprint   Parser-Fingerabdruck (Code der ausgabewirksamen Module, Extraktor-Version, Konfiguration)
+  outputs       erzeugte Dateien relativ zum Ausgabeverzeichnis (Session-JSON, Layout-Sidecar)
+  parsed_at
+
+Eine Quelle wird nur neu geparst, wenn sich PDF oder Fingerabdruck geändert haben oder eine Ausgabe
+fehlt (rebuild_reason). Geschrieben wird nur vom Hauptprozess (im Batch-Modus melden die Worker
+zurück), nach jedem Dokument atomar per Umbenennen – ein abgebrochener Lauf behält den Fortschritt.
+"""
+
+MANIFEST_NAME = "parse_manifest.json"
+MANIFEST_VERSION = 1
+
+REASON_NEW = "new"
+REASON_PDF_CHANGED = "pdf-changed"
+REASON_PARSER_CHANGED = "parser-changed"
+REASON_OUTPUT_MISSING = "output-missing"
+REASON_FORCED = "forced"
+REASON_PDF_UNKNOWN = "pdf-unknown"      # PDF (noch) nicht lokal, Hash erst nach dem Download bekannt
+
+
+def _now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def code_fingerprint(paths: Iterable[Path], extra: Optional[Dict[str, Any]] = None) -> str:
+    """SHA-256 über Dateinamen und Inhalt der Quelldateien plus extra (JSON, sortiert); 16 Hex-Zeichen."""
+    h = hashlib.sha256()
+    for p in sorted(Path(p) for p in paths):
+        h.update(p.name.encode("utf-8") + b"\0")
+        h.update(p.read_bytes())
+        h.update(b"\0")
+    h.update(json.dumps(extra or {}, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+@dataclass
+class ManifestEntry:
+    source: str
+    pdf_sha256: str
+    fingerprint: str
+    outputs: List[str]
+    parsed_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pdf_sha256": self.pdf_sha256,
+            "fingerprint": self.fingerprint,
+            "outputs": self.outputs,
+            "parsed_at": self.parsed_at,
+        }
+
+
+class ParseManifest:
+    def __init__(self, out_dir: Path):
+        self.out_dir = Path(out_dir)
+        self.path = self.out_dir / MANIFEST_NAME
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        for source, e in (data.get("documents") or {}).items():
+            try:
+                self.entries[source] = ManifestEntry(source, e["pdf_sha256"], e["fingerprint"],
+                                                     list(e.get("outputs") or []), e.get("parsed_at", ""))
+            except (KeyError, TypeError):
+                continue
+
+    def get(self, source: str) -> Optional[ManifestEntry]:
+        return self.entries.get(source)
+
+    def rebuild_reason(self, source: str, pdf_sha256: Optional[str], fingerprint: str) -> Optional[str]:
+        """None = Ausgaben aktuell; sonst der Grund für einen Neuaufbau."""
+        entry = self.entries.get(source)
+        if entry is None:
+            return REASON_NEW
+        if entry.fingerprint != fingerprint:
+            return REASON_PARSER_CHANGED
+        if not entry.outputs or any(not (self.out_dir / o).exists() for o in entry.outputs):
+            return REASON_OUTPUT_MISSING
+        if pdf_sha256 is None:
+            # Alles andere aktuell: nach dem Download nur noch den Hash vergleichen (unchanged_pdf)
+            return REASON_PDF_UNKNOWN
+        if entry.pdf_sha256 != pdf_sha256:
+            return REASON_PDF_CHANGED
+        return None
+
+    def unchanged_pdf(self, source: str, pdf_sha256: str) -> bool:
+        """Für REASON_PDF_UNKNOWN: entspricht die heruntergeladene PDF dem Stand im Manifest?"""
+        entry = self.entries.get(source)
+        return entry is not None and entry.pdf_sha256 == pdf_sha256
+
+    def record(self, source: str, pdf_sha256: str, fingerprint: str, outputs: Iterable[Path]) -> ManifestEntry:
+        rel = []
+        for o in outputs:
+            p = Path(o)
+            try:
+                rel.append(str(p.resolve().relative_to(self.out_dir.resolve())))
+            except ValueError:
+                rel.append(str(p))
+        entry = ManifestEntry(source, pdf_sha256, fingerprint, rel, _now_iso())
+        self.entries[source] = entry
+        self.save()
+        return entry
+
+    def save(self) -> None:
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps({
+            "version": MANIFEST_VERSION,
+            "documents": {s: e.to_dict() for s, e in sorted(self.entries.items())},
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
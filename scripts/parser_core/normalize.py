@@ -1,9 +1,103 @@
 import re
+import time
+import unicodedata
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+_unicode_normalize = unicodedata.normalize
+_RE_BLANKS = re.compile(r"[ \t]+")
+
+# active NormProfile while profile() runs; None = no bookkeeping
+_profile: Optional["NormProfile"] = None
+
+
+def _nfkc_plain(s: str) -> str:
+    if not s:
+        return ""
+    return s if s.isascii() else _unicode_normalize("NFKC", s)
+
+
+def _collapse_ws_plain(s: str) -> str:
+    return " ".join(s.split())
+
+
+def _squeeze_blanks_plain(s: str) -> str:
+    if "\t" not in s and "  " not in s:
+        return s
+    return _RE_BLANKS.sub(" ", s)
+
+
+def nfkc(s: Optional[str]) -> str:
+    """
+    NFKC normal form ("" for None). ASCII text is NFKC already and is returned unchanged
+    (same object), so callers can test `nfkc(s) is s`.
+    """
+    if _profile is not None:
+        return _profile.run("nfkc", _nfkc_plain, s, s.isascii() if s else True)
+    if not s:
+        return ""
+    return s if s.isascii() else _unicode_normalize("NFKC", s)
+
+
+def collapse_ws(s: str) -> str:
+    """Same as re.sub(r"\\s+", " ", s).strip(), without the regex pass."""
+    if _profile is not None:
+        return _profile.run("collapse_ws", _collapse_ws_plain, s, False)
+    return " ".join(s.split())
+
+
+def squeeze_blanks(s: str) -> str:
+    """Same as re.sub(r"[ \\t]+", " ", s); lines without tab or double space are returned unchanged."""
+    if _profile is not None:
+        return _profile.run("squeeze_blanks", _squeeze_blanks_plain, s, "\t" not in s and "  " not in s)
+    if "\t" not in s and "  " not in s:
+        return s
+    return _RE_BLANKS.sub(" ", s)
+
+
+class NormProfile:
+    """
+    Calls, fast-path hits and time per normalization primitive while profile() is active.
+    The timing adds overhead per call, so measure stage runtimes in a separate run.
+    """
+    def __init__(self):
+        self.calls: Dict[str, int] = {}
+        self.fast: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def run(self, name: str, fn: Callable[[str], str], s: str, fast: bool) -> str:
+        t0 = time.perf_counter()
+        out = fn(s)
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if fast:
+            self.fast[name] = self.fast.get(name, 0) + 1
+        return out
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: {"calls": self.calls[name], "fast": self.fast.get(name, 0),
+                       "ms": round(self.seconds[name] * 1000, 3)}
+                for name in sorted(self.calls)}
+
+
+@contextmanager
+def profile() -> Iterator[NormProfile]:
+    """Collects a NormProfile for everything normalized inside the with block (not thread-safe)."""
+    global _profile
+    previous, _profile = _profile, NormProfile()
+    try:
+        yield _profile
+    finally:
+        _profile = previous
+
 
 def normalize_line(line: str) -> str:
     # Merge multiple spaces
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+    return collapse_ws(line)
 
 def dehyphenate(lines):
     """
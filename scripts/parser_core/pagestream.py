@@ -0,0 +1,165 @@
+import json
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Dict, IO, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+"""
+Bausteine für den Streaming-Modus (begrenzter Speicher).
+
+PageSpool:  Seiten (Zeilenlisten) als JSON-Zeilen in einer anonymen Temp-Datei. Der Streaming-Modus
+            legt die Seiten der einzelnen Stufen hier ab, statt sie als Listen im Speicher zu halten;
+            gelesen wird seitenweise.
+dump_json:  schreibt ein JSON-Dokument wie json.dump(..., ensure_ascii=False, indent=2), wobei
+            PageSpool-Werte Seite für Seite aus der Datei gestreamt werden (Debug-Sidecar).
+MemoryProbe: Peak-RSS (getrusage) und optional tracemalloc-Peak je Dokument.
+"""
+
+# tracemalloc kennt nur einen Peak; wer ihn für einen Teilabschnitt zurücksetzt (Stufen-Messung),
+# legt den bisherigen hier ab, damit der Dokument-Peak der MemoryProbe stimmt
+_traced_peak_floor = 0
+
+
+class PageSpool:
+    """
+    Append-only Seitenablage. Iteration erst nach dem Schreiben (eine gemeinsame Datei-Position);
+    die Datei verschwindet mit dem Objekt.
+    """
+
+    def __init__(self, dir: Optional[str] = None):
+        self._file = tempfile.TemporaryFile("w+", encoding="utf-8", dir=dir)
+        self._count = 0
+
+    def append(self, lines: List[str]) -> None:
+        self._file.write(json.dumps(lines, ensure_ascii=False))
+        self._file.write("\n")
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[List[str]]:
+        self._file.flush()
+        self._file.seek(0)
+        for _ in range(self._count):
+            yield json.loads(self._file.readline())
+        self._file.seek(0, 2)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ------------------------- JSON-Ausgabe mit gestreamten Seiten -------------------------
+
+def _contains_spool(obj: Any) -> bool:
+    if isinstance(obj, PageSpool):
+        return True
+    if isinstance(obj, dict):
+        return any(_contains_spool(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_contains_spool(v) for v in obj)
+    return False
+
+
+def _write_value(obj: Any, f: IO[str], indent: int, level: int) -> None:
+    pad = " " * (indent * (level + 1))
+    if not _contains_spool(obj):
+        text = json.dumps(obj, ensure_ascii=False, indent=indent)
+        f.write(text.replace("\n", "\n" + " " * (indent * level)))
+        return
+    if isinstance(obj, dict):
+        items = [(json.dumps(k, ensure_ascii=False), v) for k, v in obj.items()]
+        open_, close = "{", "}"
+    else:
+        items = [(None, v) for v in obj]
+        open_, close = "[", "]"
+    if not items:
+        f.write(open_ + close)
+        return
+    f.write(open_)
+    for n, (key, value) in enumerate(items):
+        f.write(("," if n else "") + "\n" + pad)
+        if key is not None:
+            f.write(key + ": ")
+        _write_value(value, f, indent, level + 1)
+    f.write("\n" + " " * (indent * level) + close)
+
+
+def dump_json(obj: Any, f: IO[str], indent: int = 2) -> None:
+    """Wie json.dump(obj, f, ensure_ascii=False, indent=indent); PageSpool wird als Liste geschrieben."""
+    _write_value(obj, f, indent, 0)
+
+
+# ------------------------- Speicher-Messung -------------------------
+
+def reset_traced_peak() -> int:
+    """Setzt den tracemalloc-Peak zurück (bisheriger Peak bleibt für MemoryProbe erhalten); Rückgabe: aktuelle Bytes."""
+    global _traced_peak_floor
+    current, peak = tracemalloc.get_traced_memory()
+    _traced_peak_floor = max(_traced_peak_floor, peak)
+    tracemalloc.reset_peak()
+    return current
+
+
+def traced_peak_since_reset() -> int:
+    return tracemalloc.get_traced_memory()[1]
+
+
+def peak_rss_mb() -> Optional[float]:
+    return _rusage_mb(resource.RUSAGE_SELF) if resource else None
+
+
+def _rusage_mb(who) -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux: KiB, macOS: Bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class MemoryProbe:
+    """
+    Misst ein Dokument: peak_rss_mb ist das Prozess-Maximum (getrusage, monoton über die Laufzeit),
+    peak_rss_children_mb das größte Maximum eines Worker-Prozesses. trace=True startet tracemalloc
+    (merklicher Overhead) und liefert den Peak der Python-Allokationen seit start().
+    """
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self._started_tracing = False
+
+    def start(self) -> "MemoryProbe":
+        global _traced_peak_floor
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            _traced_peak_floor = 0
+        return self
+
+    def report(self) -> Dict[str, Optional[float]]:
+        out: Dict[str, Optional[float]] = {
+            "peak_rss_mb": _rusage_mb(resource.RUSAGE_SELF) if resource else None,
+            "peak_rss_children_mb": _rusage_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        }
+        if self.trace and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, _traced_peak_floor)
+            out["tracemalloc_current_mb"] = round(current / (1024 * 1024), 1)
+            out["tracemalloc_peak_mb"] = round(peak / (1024 * 1024), 1)
+        return out
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def format_memory_report(report: Dict[str, Optional[float]]) -> str:
+    return " ".join(f"{k}={v}" for k, v in report.items() if v is not None)
@@ -0,0 +1,284 @@
+import argparse
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+"""
+Inhaltsadressierter PDF-Cache.
+
+Layout unter root (Default .cache/pdfs):
+  blobs/<sha[:2]>/<sha256>.pdf   PDF-Bytes, benannt nach ihrem SHA-256 (gleicher Inhalt = eine Datei,
+                                 auch wenn der Landtag ihn unter einer neuen Blob-URL veröffentlicht)
+  index.sqlite                   blobs(sha256, size, fetched_at, last_used) und
+                                 urls(url, sha256, etag, last_modified, fetched_at)
+  tmp/                           laufende Downloads (werden beim gc aufgeräumt)
+
+SQLite statt JSON, weil mehrere Prozesse (--jobs) und Download-Threads gleichzeitig schreiben; jede
+Operation öffnet eine eigene Verbindung. Eviction: LRU über last_used, begrenzt auf max_bytes
+(gc; nach jedem neuen Blob automatisch, wenn max_bytes gesetzt ist). Stufen, die nach dem
+Inhalts-Hash schlüsseln (Wort-Cache), lesen ihn über content_hash_for_path direkt aus dem Dateinamen.
+
+Kommandozeile: python -m scripts.parser_core.pdfcache [--root DIR] stats | gc [--max-mb N]
+"""
+
+DEFAULT_ROOT = ".cache/pdfs"
+_SHA_RE = re.compile(r"^[0-9a-f]{64}$")
+# Dateien des früheren URL-Hash-Caches (download_pdf vor dem Blob-Store)
+_LEGACY_RE = re.compile(r"^[0-9a-f]{16}\.pdf(\.meta\.json)?$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_sha256 ON urls (sha256);
+"""
+
+
+def _now_iso() -> str:
+    return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def content_hash_for_path(path) -> Optional[str]:
+    """SHA-256 eines Blobs aus seinem Pfad (blobs/xx/<sha>.pdf), sonst None."""
+    p = Path(path)
+    stem = p.stem
+    if p.suffix == ".pdf" and _SHA_RE.match(stem) and p.parent.name == stem[:2] \
+            and p.parent.parent.name == "blobs":
+        return stem
+    return None
+
+
+@dataclass
+class UrlEntry:
+    url: str
+    sha256: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: str
+
+
+class PdfStore:
+    def __init__(self, root: str = DEFAULT_ROOT, max_bytes: Optional[int] = None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.blob_dir = self.root / "blobs"
+        self.tmp_dir = self.root / "tmp"
+        self.index_path = self.root / "index.sqlite"
+        self._initialized = False
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        if not self._initialized:
+            self.root.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.index_path), timeout=30.0)
+        try:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.pdf"
+
+    # ------------------------- Lesen -------------------------
+
+    def lookup_url(self, url: str) -> Optional[UrlEntry]:
+        """Index-Eintrag der URL, nur wenn der Blob noch vorhanden ist."""
+        with self._db() as db:
+            row = db.execute("SELECT url, sha256, etag, last_modified, fetched_at FROM urls WHERE url = ?",
+                             (url,)).fetchone()
+        if row is None or not self.blob_path(row[1]).exists():
+            return None
+        return UrlEntry(*row)
+
+    def touch(self, sha256: str) -> None:
+        with self._db() as db:
+            db.execute("UPDATE blobs SET last_used = ? WHERE sha256 = ?", (time.time(), sha256))
+
+    def path_for_url(self, url: str) -> Optional[Path]:
+        entry = self.lookup_url(url)
+        if entry is None:
+            return None
+        self.touch(entry.sha256)
+        return self.blob_path(entry.sha256)
+
+    # ------------------------- Schreiben -------------------------
+
+    def new_temp_file(self):
+        """(fd, Pfad) einer Temp-Datei im Store (gleiches Dateisystem wie die Blobs)."""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkstemp(dir=self.tmp_dir, suffix=".part")
+
+    def put_file(self, tmp_path, sha256: str, size: int) -> Path:
+        """Übernimmt eine fertig gehashte Temp-Datei; existiert der Blob schon, wird sie verworfen."""
+        dest = self.blob_path(sha256)
+        if dest.exists():
+            os.unlink(tmp_path)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, dest)
+        with self._db() as db:
+            db.execute(
+                "INSERT INTO blobs (sha256, size, fetched_at, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET last_used = excluded.last_used",
+                (sha256, size, _now_iso(), time.time()),
+            )
+        if self.max_bytes is not None:
+            self.gc(keep=sha256)
+        return dest
+
+    def put_bytes(self, data: bytes) -> Path:
+        sha256 = hashlib.sha256(data).hexdigest()
+        fd, tmp = self.new_temp_file()
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return self.put_file(tmp, sha256, len(data))
+
+    def record_url(self, url: str, sha256: str, etag: Optional[str] = None,
+                   last_modified: Optional[str] = None) -> None:
+        with self._db() as db:
+            db.execute(
+                "INSERT INTO urls (url, sha256, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET sha256 = excluded.sha256, etag = excluded.etag, "
+                "last_modified = excluded.last_modified, fetched_at = excluded.fetched_at",
+                (url, sha256, etag, last_modified, _now_iso()),
+            )
+
+    # ------------------------- Statistik & Eviction -------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._db() as db:
+            n_blobs, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            n_urls = db.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+            dup_urls = db.execute("SELECT COUNT(*) - COUNT(DISTINCT sha256) FROM urls").fetchone()[0]
+            dedup = db.execute(
+                "SELECT COALESCE(SUM(b.size * (c.n - 1)), 0) FROM blobs b "
+                "JOIN (SELECT sha256, COUNT(*) AS n FROM urls GROUP BY sha256) c ON c.sha256 = b.sha256"
+            ).fetchone()[0]
+        legacy = [p for p in self.root.glob("*") if _LEGACY_RE.match(p.name)] if self.root.exists() else []
+        return {
+            "root": str(self.root),
+            "blobs": n_blobs,
+            "urls": n_urls,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "urls_sharing_a_blob": dup_urls,
+            "bytes_saved_by_dedup": dedup,
+            "legacy_files": len(legacy),
+            "legacy_bytes": sum(p.stat().st_size for p in legacy),
+        }
+
+    def gc(self, max_bytes: Optional[int] = None, keep: Optional[str] = None,
+           legacy: bool = False) -> Dict[str, Any]:
+        """
+        Räumt auf: Index-Zeilen ohne Datei, Blob-Dateien ohne Index-Zeile, alte Temp-Dateien; danach
+        LRU-Eviction bis unter max_bytes (Default: self.max_bytes; None = keine Grenze). URL-Einträge
+        verdrängter Blobs werden mit entfernt. legacy=True löscht zusätzlich den alten URL-Hash-Cache.
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        removed: List[str] = []
+        with self._db() as db:
+            rows = db.execute("SELECT sha256, size FROM blobs ORDER BY last_used ASC").fetchall()
+            known = {sha for sha, _ in rows}
+            missing = [sha for sha, _ in rows if not self.blob_path(sha).exists()]
+            for sha in missing:
+                db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+            total = sum(size for sha, size in rows if sha not in missing)
+            for sha, size in rows:
+                if limit is None or total <= limit:
+                    break
+                if sha in missing or sha == keep:
+                    continue
+                try:
+                    self.blob_path(sha).unlink()
+                except FileNotFoundError:
+                    pass
+                db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+                total -= size
+                removed.append(sha)
+            db.execute("DELETE FROM urls WHERE sha256 NOT IN (SELECT sha256 FROM blobs)")
+
+        # Frische Dateien auslassen: ein anderer Prozess kann zwischen Umbenennen und Index-Eintrag stehen
+        cutoff = time.time() - 3600
+        orphans = 0
+        if self.blob_dir.exists():
+            for p in self.blob_dir.glob("*/*.pdf"):
+                try:
+                    if p.stem not in known and p.stat().st_mtime < cutoff:
+                        p.unlink()
+                        orphans += 1
+                except OSError:
+                    continue
+        stale_tmp = 0
+        if self.tmp_dir.exists():
+            for p in self.tmp_dir.glob("*.part"):
+                try:
+                    if p.stat().st_mtime < cutoff:
+                        p.unlink()
+                        stale_tmp += 1
+                except OSError:
+                    continue
+        legacy_removed = 0
+        if legacy and self.root.exists():
+            for p in self.root.glob("*"):
+                if _LEGACY_RE.match(p.name):
+                    p.unlink()
+                    legacy_removed += 1
+        return {
+            "evicted": removed,
+            "missing_index_rows": len(missing),
+            "orphan_files": orphans,
+            "stale_tmp_files": stale_tmp,
+            "legacy_files": legacy_removed,
+            "bytes": total,
+        }
+
+
+# ------------------------- CLI -------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="PDF-Cache (inhaltsadressiert): Statistik und Aufräumen")
+    p.add_argument("--root", default=DEFAULT_ROOT, help=f"Cache-Verzeichnis (Default: {DEFAULT_ROOT})")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Anzahl Blobs/URLs, Größe, Einsparung durch Deduplizierung")
+    gc = sub.add_parser("gc", help="Verwaiste Einträge entfernen und LRU bis unter die Grenze verdrängen")
+    gc.add_argument("--max-mb", type=int, default=None, help="Größengrenze in MB (Default: keine)")
+    gc.add_argument("--legacy", action="store_true", help="Alten URL-Hash-Cache (<hash>.pdf) löschen")
+    args = p.parse_args(argv)
+
+    store = PdfStore(args.root)
+    if args.command == "stats":
+        out = store.stats()
+    else:
+        max_bytes = args.max_mb * 1024 * 1024 if args.max_mb is not None else None
+        out = store.gc(max_bytes=max_bytes, legacy=args.legacy)
+        out["evicted"] = len(out["evicted"])
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
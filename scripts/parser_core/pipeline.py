@@ -3,6 +3,7 @@ import unicodedata
 from typing import List, Dict, Any, Tuple, Optional
 
 # Lokale Imports (öffentliche Funktionen)
+from .flatlines import FlatLines
 from .toc_parser import parse_toc
 from .segment import segment_speeches
 
@@ -10,7 +11,7 @@ from .segment import segment_speeches
 Pipeline-Helfer zum Einbinden des TOC-Parsers in den Gesamt-Parsing-Flow.
 
 Funktionen:
-- split_toc_and_body(flat_lines, ...) -> (toc_lines, body_lines, meta)
+- split_toc_and_body(flat_lines, ...) -> (toc_lines, body_lines, meta), Zeilen als FlatLines
 - parse_protocol(flat_lines, ...) -> { "toc": {...}, "speeches": [...], "meta": {...} }
 
 Heuristik:
@@ -62,50 +63,49 @@ def is_body_start_line(line: str) -> bool:
     return False
 
 def split_toc_and_body(
-    flat_lines: List[Dict[str, Any]],
+    flat_lines: FlatLines,
     stop_at_first_body_header: bool = True
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+) -> Tuple[FlatLines, FlatLines, Dict[str, Any]]:
     """
     Trennt TOC-Zeilen und Body-Zeilen (Protokoll).
     - stop_at_first_body_header: Wenn True, endet TOC spätestens bei erster „Rolle …:“ Zeile.
+    - flat_lines: FlatLines oder Liste von Zeilen-Dicts {"page", "line_index", "text"}.
 
     Rückgabe:
-    (toc_lines, body_lines, meta)
+    (toc_lines, body_lines, meta) – toc_lines/body_lines sind Sichten auf flat_lines (ohne Kopie);
+    nur Leerzeilen vor dem TOC, die dem Body vorangestellt werden, erzwingen eine Kopie.
     meta = {
       "inhalt_found": bool,
       "body_start_index": int | None,
       "body_start_reason": "protokoll" | "role_header" | None
     }
     """
-    toc_lines: List[Dict[str, Any]] = []
-    body_lines: List[Dict[str, Any]] = []
-    in_toc = False
+    flat_lines = FlatLines.coerce(flat_lines)
+    n = len(flat_lines)
+    toc_start: Optional[int] = None
+    leading_blank: List[int] = []      # Leerzeilen vor TOC-/Body-Beginn gehören zum Body
     body_start_idx: Optional[int] = None
     body_start_reason: Optional[str] = None
 
-    for idx, obj in enumerate(flat_lines):
-        text = _nfkc(obj.get("text") or "")
-        # akt. Zeile leer -> einfach mitnehmen unter aktuellem Modus
+    norm = flat_lines.norm
+    for idx in range(n):
+        text = norm(idx)
+        # akt. Zeile leer -> gehört zum TOC (innerhalb der Sicht) oder vor TOC-Beginn zum Body
         if not text.strip():
-            if in_toc:
-                toc_lines.append(obj)
-            else:
-                body_lines.append(obj)
+            if toc_start is None:
+                leading_blank.append(idx)
             continue
 
-        if not in_toc:
+        if toc_start is None:
             # TOC-Beginn?
             if looks_like_inhalt_heading(text):
-                in_toc = True
-                toc_lines.append(obj)
+                toc_start = idx
                 continue
             # Noch kein TOC: alles bis dahin als "vor TOC" ignorieren (Kopfzeilen)
             # Ausnahme: Body-Start sicher erkannt -> kein TOC vorhanden
             if is_body_start_line(text):
                 body_start_idx = idx
                 body_start_reason = "protokoll" if PROTOKOLL_HEADING_RE.match(text) else "role_header"
-                # Rest als Body
-                body_lines.extend(flat_lines[idx:])
                 break
             # ansonsten Kopfbereich ignorieren
             continue
@@ -114,26 +114,24 @@ def split_toc_and_body(
         if PROTOKOLL_HEADING_RE.match(text):
             body_start_idx = idx
             body_start_reason = "protokoll"
-            body_lines.extend(flat_lines[idx:])
             break
 
         if stop_at_first_body_header and HEADER_LINE_RE.match(text):
             # Sicherheit: falls in seltenen Fällen schon früher eine Rollen-Zeile mit ":" auftaucht
             body_start_idx = idx
             body_start_reason = "role_header"
-            body_lines.extend(flat_lines[idx:])
             break
 
-        # sonst gehört die Zeile weiterhin zum TOC
-        toc_lines.append(obj)
-
-    # Falls Ende erreicht und Body noch leer: Rest ist Body (nach TOC)
-    if in_toc and not body_lines and body_start_idx is None:
-        # wir sind bis zum Ende im TOC geblieben, kein Body-Start erkannt -> kein Body
-        pass
-    elif not in_toc and not body_lines:
+    in_toc = toc_start is not None
+    toc_lines = flat_lines[toc_start:body_start_idx if body_start_idx is not None else n] if in_toc else flat_lines[0:0]
+    body_rest = range(body_start_idx, n) if body_start_idx is not None else range(0)
+    if not leading_blank:
+        body_lines = flat_lines[body_rest.start:body_rest.stop] if body_rest else flat_lines[0:0]
+    else:
+        body_lines = flat_lines.take(leading_blank + list(body_rest))
+    if not in_toc and not len(body_lines):
         # Es gab gar keinen TOC. Der gesamte Input ist Body.
-        body_lines = list(flat_lines)
+        body_lines = flat_lines
 
     meta = {
         "inhalt_found": in_toc,
@@ -143,7 +141,7 @@ def split_toc_and_body(
     return toc_lines, body_lines, meta
 
 def parse_protocol(
-    flat_lines: List[Dict[str, Any]],
+    flat_lines: FlatLines,
     *,
     # segment_speeches Optionen
     capture_offsets: bool = False,
@@ -170,7 +168,7 @@ def parse_protocol(
         toc = parse_toc(toc_lines)
 
     speeches_or_bundle = segment_speeches(
-        body_lines,
+        body_lines.to_dicts(),
         capture_offsets=capture_offsets,
         debug=debug,
         require_bold_for_header=require_bold_for_header,
@@ -20,6 +20,8 @@ def build_speech_segments(speeches: List[Dict[str, Any]],
             and isinstance(a.get("raw_end"), int)
         ]
         interjs.sort(key=lambda a: a["raw_start"])
+        # Position je Annotation (Identität) statt anns.index(ann) pro Interjektion
+        ann_pos = {id(a): i for i, a in enumerate(anns)}
 
         segments = []
         cursor = 0
@@ -33,7 +35,7 @@ def build_speech_segments(speeches: List[Dict[str, Any]],
             segments.append({
                 "type": "interjection",
                 "text": ann.get("text"),
-                "annotation_ref": anns.index(ann),
+                "annotation_ref": ann_pos[id(ann)],
                 "raw_start": rs,
                 "raw_end": re_
             })
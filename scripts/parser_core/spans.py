@@ -0,0 +1,180 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+"""
+Kompaktes Sitzungsmodell: unveränderliche Textpuffer plus (start, end)-Spannen in Array-Tabellen.
+
+SpanTable:   append-only Tabelle von Spannen; start/end und weitere Ganzzahl-Spalten liegen in
+             int64-Arrays (array('q')), nicht als ein Dict/Tupel pro Zeile.
+SessionText: eine Sitzung als zwei Puffer –
+             text  Volltext der bereinigten Seiten (Segmentierung, Quell-Offsets für Deep Links)
+             norm  normalisierte Redezeilen aller Reden, mit "\\n" verbunden
+             Reden, Zeilen, Absätze (Redezeilen zwischen Events) und Events sind Spannen in diese
+             Puffer. Redetext und Event-Dicts entstehen erst beim Serialisieren
+             (parse_landtag_pdf.speech_dicts); bis dahin gibt es keine Kopie pro Rede.
+             Zwischenstand nach dem Tokenizer (parse_landtag_pdf.tokenize_session): norm, lines und
+             ein Tokenstrom (tokens, TOKEN_*) statt der Reden-, Absatz- und Event-Tabellen; die baut
+             parse_landtag_pdf.build_speech_spans daraus.
+PageIndex:   Seiten- und Zeilenanfänge im Volltext als sortierte Offsets; locate() bildet einen Offset
+             per bisect auf (PDF-Seite, Zeile der bereinigten Seite) ab – Herkunft für Reden, Events
+             und TOC-Verknüpfungen ohne Tupel pro Zeile.
+"""
+
+EVENT_PAREN = 0     # Klammer-Event, ggf. mehrzeilig
+EVENT_DASH = 1      # "– Beifall …"
+
+# Token-Arten im Tokenstrom (SessionText.tokens)
+TOKEN_HEADER = 0    # Sprecherkopf
+TOKEN_TEXT = 1      # Absatz: zusammenhängende Redezeilen
+TOKEN_PAREN = 2     # Klammer-Event
+TOKEN_DASH = 3      # Dash-Event
+TOKEN_AGENDA = 4    # "Ich rufe Punkt N auf"
+
+
+class SpanTable:
+    __slots__ = ("starts", "ends", "columns")
+
+    def __init__(self, *columns: str):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.columns: Dict[str, array] = {name: array("q") for name in columns}
+
+    def append(self, start: int, end: int, **values: int) -> int:
+        """Hängt eine Spanne an (fehlende Spalten = 0); Rückgabe: Zeilennummer."""
+        self.starts.append(start)
+        self.ends.append(end)
+        for name, col in self.columns.items():
+            col.append(values.get(name, 0))
+        return len(self.starts) - 1
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SpanTable):
+            return NotImplemented
+        return self.starts == other.starts and self.ends == other.ends and self.columns == other.columns
+
+    def span(self, i: int) -> Tuple[int, int]:
+        return self.starts[i], self.ends[i]
+
+    def column(self, name: str) -> array:
+        return self.columns[name]
+
+    def text(self, buf: str, i: int) -> str:
+        return buf[self.starts[i]:self.ends[i]]
+
+    def texts(self, buf: str, rows: Optional[range] = None) -> Iterator[str]:
+        starts, ends = self.starts, self.ends
+        for i in rows if rows is not None else range(len(starts)):
+            yield buf[starts[i]:ends[i]]
+
+
+def page_start_offsets(page_lengths: Iterable[int]) -> array:
+    """Beginn jeder Seite in "\\n".join(Seitentexte); page_lengths: Länge je Seitentext."""
+    starts = array("q")
+    offset = 0
+    for length in page_lengths:
+        starts.append(offset)
+        offset += length + 1
+    return starts
+
+
+class PageIndex:
+    __slots__ = ("page_starts", "line_starts")
+
+    def __init__(self, text: str, page_starts: Optional[Sequence[int]] = None):
+        # ohne Seitengrenzen ist der ganze Text Seite 1
+        self.page_starts = array("q", page_starts if page_starts is not None and len(page_starts) else [0])
+        self.line_starts = array("q", [0])
+        i = text.find("\n")
+        while i >= 0:
+            self.line_starts.append(i + 1)
+            i = text.find("\n", i + 1)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PageIndex):
+            return NotImplemented
+        return self.page_starts == other.page_starts and self.line_starts == other.line_starts
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """(Seite ab 1, Zeile ab 0 innerhalb der bereinigten Seite) für einen Offset im Volltext."""
+        page = bisect_right(self.page_starts, offset) - 1
+        line = bisect_right(self.line_starts, offset) - 1
+        return page + 1, line - bisect_left(self.line_starts, self.page_starts[page])
+
+    def source(self, start: int, end: int) -> Dict[str, int]:
+        """Herkunft der Spanne [start, end): Seite/Zeile des ersten und letzten Zeichens plus Offsets."""
+        start_page, start_line = self.locate(start)
+        end_page, end_line = self.locate(max(start, end - 1))
+        return {"start_page": start_page, "start_line": start_line, "end_page": end_page, "end_line": end_line,
+                "start_offset": start, "end_offset": end}
+
+
+@dataclass
+class SessionText:
+    text: str
+    pages: Optional[PageIndex] = None
+    # Kopfspalten je Rede (Gruppen aus HEADER_RX)
+    speakers: List[Optional[str]] = field(default_factory=list)
+    roles: List[Optional[str]] = field(default_factory=list)
+    parties: List[Optional[str]] = field(default_factory=list)
+    # Reden: Textspanne in text (nach dem Doppelpunkt bis zum nächsten Kopf); head = Beginn der Kopfzeile;
+    # first_line/end_line, first_paragraph/end_paragraph, first_event/end_event: Zeilenbereiche der Tabellen unten
+    speeches: SpanTable = field(default_factory=lambda: SpanTable(
+        "head", "first_line", "end_line", "first_paragraph", "end_paragraph", "first_event", "end_event"))
+    # Redeanfang aus dem maskierten Text, falls er vom Original abweicht (Index -> Text bis Zeilenende)
+    masked_heads: Dict[int, str] = field(default_factory=dict)
+    norm: str = ""
+    # normalisierte Zeilen (Spannen in norm); src_start/src_end: Quellzeilen in text
+    lines: SpanTable = field(default_factory=lambda: SpanTable("src_start", "src_end"))
+    # Absätze: zusammenhängende Redezeilen zwischen Events (Spannen in norm)
+    paragraphs: SpanTable = field(default_factory=lambda: SpanTable("speech"))
+    # Events (Spannen in norm); first_line/last_line relativ zur Rede; kind: EVENT_PAREN, EVENT_DASH
+    events: SpanTable = field(default_factory=lambda: SpanTable("speech", "first_line", "last_line", "kind"))
+    # Tagesordnungspunkt je Rede (letzter Aufruf bis hierher, None vor dem ersten)
+    agenda_items: List[Optional[int]] = field(default_factory=list)
+    # Tokenstrom (Spannen in text), nur im Tokenizer-Zwischenstand; speech = Nummer des Kopfes, kind: TOKEN_*
+    #   TOKEN_HEADER  Match-Beginn bis Redebeginn, value = Beginn der Rolle
+    #   TOKEN_TEXT, TOKEN_PAREN, TOKEN_DASH  Quellspanne der globalen Zeilen first_line..last_line
+    #   TOKEN_AGENDA  Zeilen des Aufrufs, value = Nummer; folgt den Zeilen-Token seiner Rede
+    tokens: SpanTable = field(default_factory=lambda: SpanTable("kind", "speech", "first_line", "last_line", "value"))
+
+    def __len__(self) -> int:
+        # Reden; im Tokenizer-Zwischenstand die Sprecherköpfe (auch die später leeren Reden)
+        return len(self.speakers)
+
+    def raw_speech_text(self, i: int) -> str:
+        """Unnormalisierter Redetext: Text nach dem Doppelpunkt des Kopfes bis zum nächsten Kopf."""
+        start, end = self.speeches.span(i)
+        head = self.masked_heads.get(i)
+        if head is None:
+            return self.text[start:end]
+        return head + self.text[start + len(head):end]
+
+    def line(self, i: int) -> str:
+        return self.lines.text(self.norm, i)
+
+    def speech_lines(self, i: int) -> range:
+        cols = self.speeches.columns
+        return range(cols["first_line"][i], cols["end_line"][i])
+
+    def speech_paragraphs(self, i: int) -> range:
+        cols = self.speeches.columns
+        return range(cols["first_paragraph"][i], cols["end_paragraph"][i])
+
+    def speech_events(self, i: int) -> range:
+        cols = self.speeches.columns
+        return range(cols["first_event"][i], cols["end_event"][i])
+
+    def speech_text(self, i: int) -> str:
+        """Materialisiert den Redetext (Absätze mit "\\n" verbunden)."""
+        return "\n".join(self.paragraphs.texts(self.norm, self.speech_paragraphs(i))).strip()
+
+    def source_span(self, first_line: int, last_line: int) -> Tuple[int, int]:
+        """Offsets in text für die globalen normalisierten Zeilen first_line..last_line."""
+        src = self.lines.columns
+        return src["src_start"][first_line], src["src_end"][last_line]
+
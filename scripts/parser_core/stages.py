@@ -0,0 +1,509 @@
+import argparse
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import re
+import sys
+import time
+import tracemalloc
+import types
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .pagestream import peak_rss_mb, reset_traced_peak, traced_peak_since_reset
+
+"""
+Stufen-Memoisierung für die process_pdf-Kette.
+
+Jede Stufe ist eine Funktion; ihr Ergebnis wird unter einem Schlüssel aus
+  - Stufenname,
+  - Code-Fingerabdruck der Stufe (Bytecode, Namen und Konstanten der Funktion und aller
+    Funktionen/Klassen aus dem Projektverzeichnis, die sie transitiv über globale Namen erreicht, plus
+    die Werte einfacher Modul-Konstanten wie kompilierter Regexe; Kommentare zählen nicht, die
+    Python-Version schon; Aufrufe über Instanzen (session.speech_text(i)) sind nur am Attributnamen
+    erkennbar, daher zählen auch alle gleichnamigen Methoden/Properties eigener Klassen aus dem
+    Modul-Namensraum der Funktion),
+  - Inhalts-Hashes der Eingaben (SHA-256 einer kanonischen JSON-Form des Ergebnisses der
+    Vorgängerstufe; Pickle-Bytes hängen von der Objekt-Teilung ab und taugen nicht als Inhalts-Hash) und
+  - expliziten Parametern (z. B. PDF-Hash, Layout-Konfiguration)
+abgelegt (StageCache). Ändert sich eine Regex in einer späteren Stufe, laufen nur diese Stufe und die von ihr
+abhängigen neu; liefert eine neu berechnete Stufe dasselbe Ergebnis wie vorher, treffen die
+nachfolgenden Stufen wieder den Cache (Eingabe-Hash statt Herkunft).
+
+Ablage: <cache_dir>/<stufe>/<schlüssel>.pkl, LRU über die mtime wie beim Wort-Cache. Pickle, weil
+die Zwischenergebnisse Dataclasses und Wort-Tabellen enthalten; der Cache ist lokal und nicht
+für fremde Dateien gedacht. Unlesbare Einträge gelten als Fehltreffer.
+
+Messung: jede Stufe (auch ohne Cache) und jeder mit StageRunner.measure umschlossene Schritt
+(Download, Schreiben) liefert ein StageEvent mit Wand- und CPU-Zeit, Peak-RSS des Prozesses nach
+dem Schritt, bei laufendem tracemalloc (--trace-memory) dem zusätzlichen Allokations-Peak während
+des Schritts, und Mengen (Seiten, Zeilen, Reden, Events).
+
+Kommandozeile: python -m scripts.parser_core.stages [--root DIR] stats | clear [--stage NAME]
+"""
+
+DEFAULT_ROOT = ".cache/stages"
+
+STATUS_HIT = "hit"
+STATUS_MISS = "miss"
+STATUS_OFF = "off"      # Stufe ohne Cache ausgeführt
+STATUS_RUN = "run"      # nicht memoisierbarer Schritt (measure)
+
+
+# ------------------------- Code-Fingerabdruck -------------------------
+
+def _stable_repr(value: Any) -> str:
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(_stable_repr(v) for v in value)) + "}"
+    if isinstance(value, dict):
+        return "{" + ", ".join(f"{_stable_repr(k)}: {_stable_repr(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__ + "[" + ", ".join(_stable_repr(v) for v in value) + "]"
+    if isinstance(value, re.Pattern):
+        return f"re({value.pattern!r}, {value.flags})"
+    return repr(value)
+
+
+def _code_names(code: types.CodeType) -> List[str]:
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.extend(_code_names(const))
+    return names
+
+
+def _hash_code(h, code: types.CodeType) -> None:
+    # Ohne Dateiname/Zeilennummern: Änderungen an anderen Funktionen derselben Datei verschieben nur diese
+    h.update(code.co_code)
+    h.update(repr((code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars)).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(h, const)
+        else:
+            h.update(_stable_repr(const).encode("utf-8"))
+
+
+def _is_own(obj: Any, root: Path) -> bool:
+    try:
+        source = inspect.getsourcefile(obj)
+    except TypeError:
+        return False
+    if source is None:
+        return False
+    try:
+        Path(source).resolve().relative_to(root)
+    except ValueError:
+        return False
+    return True
+
+
+_CONSTANT_TYPES = (str, bytes, int, float, bool, type(None), tuple, frozenset, list, dict, set, re.Pattern)
+
+
+class _Fingerprinter:
+    def __init__(self, root: Path):
+        self.root = root
+        self.hash = hashlib.sha256()
+        self.hash.update(sys.version.encode("utf-8"))
+        self.seen: set = set()
+        self._classes: Dict[int, List[type]] = {}
+
+    def own_classes(self, g: Dict[str, Any]) -> List[type]:
+        """Eigene Klassen im Modul-Namensraum g, auch aus dort importierten eigenen Modulen."""
+        classes = self._classes.get(id(g))
+        if classes is None:
+            found: Dict[int, type] = {}
+            for value in list(g.values()):
+                members = vars(value).values() if isinstance(value, types.ModuleType) else (value,)
+                for member in members:
+                    if inspect.isclass(member) and id(member) not in found and _is_own(member, self.root):
+                        found[id(member)] = member
+            # nach Datei statt __module__: als Skript und als Paket importiert gleich geordnet
+            classes = self._classes[id(g)] = sorted(
+                found.values(), key=lambda c: (Path(inspect.getsourcefile(c)).resolve().relative_to(self.root).as_posix(),
+                                               c.__qualname__))
+        return classes
+
+    def visit(self, obj: Any) -> None:
+        if isinstance(obj, (staticmethod, classmethod)):
+            obj = obj.__func__
+        if isinstance(obj, property):
+            for f in (obj.fget, obj.fset, obj.fdel):
+                if f is not None:
+                    self.visit(f)
+            return
+        if isinstance(obj, functools.partial):
+            self.hash.update(_stable_repr((obj.args, obj.keywords)).encode("utf-8"))
+            self.visit(obj.func)
+            return
+        if not (inspect.isfunction(obj) or inspect.isclass(obj)) or id(obj) in self.seen:
+            return
+        self.seen.add(id(obj))
+        if not _is_own(obj, self.root):
+            return
+        self.hash.update(obj.__qualname__.encode("utf-8"))
+        if inspect.isclass(obj):
+            self.hash.update(repr([b.__qualname__ for b in obj.__bases__]).encode("utf-8"))
+            for name, value in vars(obj).items():
+                # __module__, __dataclass_fields__ (Objekt-Adressen) usw. sind nicht stabil bzw. redundant
+                if name.startswith("__") and name != "__annotations__":
+                    continue
+                if isinstance(value, _CONSTANT_TYPES):
+                    self.hash.update(f"{name}={_stable_repr(value)}".encode("utf-8"))
+                else:
+                    self.visit(value)
+            return
+        _hash_code(self.hash, obj.__code__)
+        self.hash.update(_stable_repr((obj.__defaults__, obj.__kwdefaults__)).encode("utf-8"))
+        g = obj.__globals__
+        names = _code_names(obj.__code__)
+        for name in names:
+            if name in g:
+                self.visit_global(name, g[name])
+        # Methodenaufrufe über Instanzen: der Typ ist zur Laufzeit unbekannt, also jede eigene Klasse,
+        # die den Namen definiert (lieber eine Stufe zu oft neu als ein veralteter Treffer)
+        attrs = set(names)
+        for cls in self.own_classes(g):
+            for klass in cls.__mro__:
+                for name in sorted(attrs.intersection(vars(klass))):
+                    if not name.startswith("__"):
+                        self.visit(vars(klass)[name])
+        for cell in obj.__closure__ or ():
+            try:
+                self.visit(cell.cell_contents)
+            except ValueError:  # leere Zelle
+                continue
+
+    def visit_global(self, name: str, value: Any) -> None:
+        if inspect.isfunction(value) or inspect.isclass(value) or isinstance(value, functools.partial):
+            self.visit(value)
+        elif isinstance(value, _CONSTANT_TYPES):
+            key = (name, id(value))
+            if key in self.seen:
+                return
+            self.seen.add(key)
+            self.hash.update(f"{name}={_stable_repr(value)}".encode("utf-8"))
+
+
+def code_fingerprint(fn: Callable, root: Optional[Path] = None) -> str:
+    """
+    Fingerabdruck einer Stufenfunktion (16 Hex-Zeichen). root: Projektverzeichnis, dessen Code
+    berücksichtigt wird (Default: Verzeichnis der Funktion bzw. dessen Elternverzeichnis für parser_core);
+    Bibliotheken gehen über explizite Parameter (z. B. pdfplumber-Version) in den Schlüssel ein.
+    """
+    if root is None:
+        root = Path(inspect.getsourcefile(fn)).resolve().parent
+        if root.name == "parser_core":
+            root = root.parent
+    fp = _Fingerprinter(Path(root).resolve())
+    fp.visit(fn)
+    return fp.hash.hexdigest()[:16]
+
+
+# ------------------------- Inhalts-Hash -------------------------
+
+def _json_default(o: Any) -> Any:
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return {"__dataclass__": type(o).__qualname__,
+                **{f.name: getattr(o, f.name) for f in dataclasses.fields(o)}}
+    if isinstance(o, array):
+        return {"__array__": o.typecode, "data": o.tobytes().hex()}
+    if isinstance(o, (set, frozenset)):
+        return sorted(o, key=repr)
+    if type(o).__reduce__ is not object.__reduce__:
+        # eigene Pickle-Form (z. B. FlatLines: nur sichtbare Zeilen, ohne abgeleitete Spalten)
+        return {"__reduce__": type(o).__qualname__, "args": list(o.__reduce__()[1])}
+    slots = getattr(type(o), "__slots__", None)
+    if slots:
+        return {"__slots__": type(o).__qualname__, **{name: getattr(o, name, None) for name in slots}}
+    return {"__pickle__": pickle.dumps(o, protocol=pickle.HIGHEST_PROTOCOL).hex()}
+
+
+def content_digest(value: Any) -> str:
+    """SHA-256 des Inhalts (unabhängig davon, ob der Wert frisch berechnet oder aus dem Cache geladen ist)."""
+    blob = json.dumps(value, default=_json_default, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ------------------------- Ablage -------------------------
+
+class StageCache:
+    def __init__(self, cache_dir: str = DEFAULT_ROOT, max_bytes: Optional[int] = 1024 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def path_for(self, stage: str, key: str) -> Path:
+        return self.cache_dir / stage / f"{key}.pkl"
+
+    def load(self, stage: str, key: str) -> Optional[bytes]:
+        path = self.path_for(stage, key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def store(self, stage: str, key: str, data: bytes) -> Path:
+        path = self.path_for(stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.evict(keep=path)
+        return path
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for p in self.cache_dir.glob("*/*.pkl"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        return entries
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """Löscht die am längsten nicht genutzten Einträge, bis der Cache unter max_bytes liegt."""
+        if self.max_bytes is None:
+            return []
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed: List[Path] = []
+        for _mtime, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed.append(p)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        per_stage: Dict[str, Dict[str, int]] = {}
+        for _mtime, size, p in self._entries():
+            s = per_stage.setdefault(p.parent.name, {"entries": 0, "bytes": 0})
+            s["entries"] += 1
+            s["bytes"] += size
+        return {
+            "root": str(self.cache_dir),
+            "max_bytes": self.max_bytes,
+            "bytes": sum(s["bytes"] for s in per_stage.values()),
+            "stages": dict(sorted(per_stage.items())),
+        }
+
+    def clear(self, stage: Optional[str] = None) -> int:
+        removed = 0
+        for _mtime, _size, p in self._entries():
+            if stage is None or p.parent.name == stage:
+                try:
+                    p.unlink()
+                    removed += 1
+                except OSError:
+                    continue
+        return removed
+
+
+# ------------------------- Ausführung -------------------------
+
+@dataclass
+class StageValue:
+    value: Any
+    digest: Optional[str] = None      # content_digest des Werts; None ohne Cache
+
+
+@dataclass
+class StageEvent:
+    stage: str
+    status: str
+    seconds: float = 0.0
+    key: Optional[str] = None
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    alloc_peak_mb: Optional[float] = None
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "stage": self.stage,
+            "status": self.status,
+            "seconds": round(self.seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "peak_rss_mb": self.peak_rss_mb,
+            "counts": self.counts,
+            "key": self.key,
+        }
+        if self.alloc_peak_mb is not None:
+            out["alloc_peak_mb"] = self.alloc_peak_mb
+        return out
+
+
+@contextmanager
+def measure(name: str, status: str = STATUS_RUN) -> Iterator[StageEvent]:
+    """Misst den Block; der Aufrufer kann event.status/counts/key setzen."""
+    event = StageEvent(name, status)
+    tracing = tracemalloc.is_tracing()
+    base = reset_traced_peak() if tracing else 0
+    t0, c0 = time.perf_counter(), time.process_time()
+    try:
+        yield event
+    finally:
+        event.seconds = time.perf_counter() - t0
+        event.cpu_seconds = time.process_time() - c0
+        event.peak_rss_mb = peak_rss_mb()
+        if tracing:
+            event.alloc_peak_mb = round(max(0, traced_peak_since_reset() - base) / (1024 * 1024), 2)
+
+
+def instrumentation_summary(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Block für den Layout-Sidecar: Einzelmessungen plus Summen."""
+    return {
+        "stages": events,
+        "total_seconds": round(sum(e["seconds"] for e in events), 4),
+        "total_cpu_seconds": round(sum(e["cpu_seconds"] for e in events), 4),
+        "peak_rss_mb": max((e["peak_rss_mb"] for e in events if e["peak_rss_mb"] is not None), default=None),
+    }
+
+
+class StageRunner:
+    """
+    Führt Stufen aus und memoisiert sie in cache (None = ohne Cache, ohne Pickle-Aufwand).
+    events protokolliert je Stufe Treffer/Fehltreffer und Laufzeit.
+    """
+
+    def __init__(self, cache: Optional[StageCache] = None):
+        self.cache = cache
+        self.events: List[StageEvent] = []
+        self._fingerprints: Dict[Callable, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    def fingerprint(self, fn: Callable) -> str:
+        fp = self._fingerprints.get(fn)
+        if fp is None:
+            fp = self._fingerprints[fn] = code_fingerprint(fn)
+        return fp
+
+    def wrap(self, value: Any) -> StageValue:
+        """Wert außerhalb einer Stufe als Eingabe verwendbar machen (Hash nur mit Cache)."""
+        if self.cache is None:
+            return StageValue(value)
+        return StageValue(value, content_digest(value))
+
+    def key_for(self, name: str, fn: Callable, inputs: Dict[str, StageValue],
+                params: Optional[Dict[str, Any]]) -> str:
+        blob = json.dumps({
+            "stage": name,
+            "code": self.fingerprint(fn),
+            "inputs": {k: v.digest for k, v in sorted(inputs.items())},
+            "params": params or {},
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[StageEvent]:
+        """Nicht memoisierter Schritt (Download, Streaming-Seitenstufen) im selben Protokoll."""
+        with measure(name) as event:
+            yield event
+        self.events.append(event)
+
+    def run(self, name: str, fn: Callable, inputs: Optional[Dict[str, StageValue]] = None,
+            params: Optional[Dict[str, Any]] = None,
+            counts: Optional[Callable[[Any], Dict[str, int]]] = None, **kwargs: Any) -> StageValue:
+        """
+        fn(**{name: wert der Eingaben}, **kwargs). inputs und params bilden den Schlüssel; kwargs
+        (Pfade, Worker-Zahl, Caches) gehen nicht ein und dürfen das Ergebnis nicht beeinflussen.
+        counts(wert) -> Mengen für das Protokoll (z. B. {"pages": 44}).
+        """
+        inputs = inputs or {}
+        with measure(name, STATUS_OFF) as event:
+            if self.cache is None:
+                value = fn(**{k: v.value for k, v in inputs.items()}, **kwargs)
+                digest = None
+            else:
+                value, digest = self._run_cached(name, fn, inputs, params, kwargs, event)
+            if counts is not None:
+                event.counts = counts(value)
+        self.events.append(event)
+        return StageValue(value, digest)
+
+    def _run_cached(self, name: str, fn: Callable, inputs: Dict[str, StageValue],
+                    params: Optional[Dict[str, Any]], kwargs: Dict[str, Any], event: StageEvent):
+        key = self.key_for(name, fn, inputs, params)
+        event.key = key[:12]
+        data = self.cache.load(name, key)
+        if data is not None:
+            try:
+                value = pickle.loads(data)
+                event.status = STATUS_HIT
+            except Exception:
+                data = None
+        if data is None:
+            value = fn(**{k: v.value for k, v in inputs.items()}, **kwargs)
+            event.status = STATUS_MISS
+            try:
+                self.cache.store(name, key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            except OSError as e:
+                print(f"[WARN] Stufen-Cache nicht geschrieben ({name}): {e}", file=sys.stderr)
+        return value, content_digest(value)
+
+
+def format_stage_report(events: List[Dict[str, Any]]) -> str:
+    """events: StageEvent.to_dict()-Einträge eines Dokuments."""
+    lines = [f"{'Stufe':<14} {'Status':<6} {'Zeit/s':>8} {'CPU/s':>8} {'RSS/MB':>7}  Mengen / Schlüssel"]
+    for e in events:
+        rss = f"{e['peak_rss_mb']:.1f}" if e.get("peak_rss_mb") is not None else "-"
+        info = " ".join(f"{k}={v}" for k, v in (e.get("counts") or {}).items())
+        if e.get("alloc_peak_mb") is not None:
+            info = (info + " " if info else "") + f"alloc_peak={e['alloc_peak_mb']}MB"
+        if e.get("key"):
+            info = (info + " " if info else "") + f"[{e['key']}]"
+        lines.append(f"{e['stage']:<14} {e['status']:<6} {e['seconds']:>8.3f} {e.get('cpu_seconds', 0.0):>8.3f} "
+                     f"{rss:>7}  {info}")
+    hits = sum(1 for e in events if e["status"] == STATUS_HIT)
+    misses = sum(1 for e in events if e["status"] == STATUS_MISS)
+    lines.append(f"{hits} Treffer, {misses} neu berechnet" if hits or misses else
+                 f"{sum(e['seconds'] for e in events):.3f} s gesamt")
+    return "\n".join(lines)
+
+
+# ------------------------- CLI -------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Stufen-Cache der process_pdf-Kette: Statistik und Aufräumen")
+    p.add_argument("--root", default=DEFAULT_ROOT, help=f"Cache-Verzeichnis (Default: {DEFAULT_ROOT})")
+    sub = p.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Einträge und Größe je Stufe")
+    clear = sub.add_parser("clear", help="Einträge löschen")
+    clear.add_argument("--stage", default=None, help="Nur diese Stufe (Default: alle)")
+    args = p.parse_args(argv)
+
+    cache = StageCache(args.root, max_bytes=None)
+    if args.command == "stats":
+        out: Dict[str, Any] = cache.stats()
+    else:
+        out = {"removed": cache.clear(args.stage)}
+    print(json.dumps(out, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,8 +27,10 @@ def reflow_speeches(speeches: List[Dict[str, Any]],
             sp["text_raw"] = raw
 
         lines = [l.rstrip() for l in raw.splitlines()]
-        while lines and not lines[0].strip():
-            lines.pop(0)
+        first = 0
+        while first < len(lines) and not lines[first].strip():
+            first += 1
+        lines = lines[first:]
         while lines and not lines[-1].strip():
             lines.pop()
 
@@ -1,7 +1,8 @@
 import re
-import unicodedata
 from typing import List, Dict, Any, Optional, Tuple
 
+from .flatlines import FlatLines
+
 """
 Parser für das Inhaltsverzeichnis (Tagesordnung).
 
@@ -18,7 +19,7 @@ Ziele (gemäß Anforderung):
 - Bold/Typografie aus PDF ist nicht erforderlich; wir arbeiten textbasiert.
 
 Eingabeformat:
-- flat_lines: Liste von Dicts mit mindestens: { "text": str, "page": int, "line_index": int }
+- flat_lines: FlatLines oder Liste von Dicts mit mindestens: { "text": str, "page": int, "line_index": int }
   (Es ist okay, hier nur die TOC-Seite(n) zu übergeben.)
 
 Ausgabeformat:
@@ -114,21 +115,22 @@ SUBENTRY_WITH_DRS_RE = re.compile(
 # Öffentliche API
 # -----------------------------------------------------------
 
-def parse_toc(flat_lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+def parse_toc(flat_lines: FlatLines) -> Dict[str, Any]:
     """
     Parst die übergebenen TOC-Zeilen in strukturierte Tagesordnung.
-    Erwartet nur die TOC-Seiten (oder einen entsprechend herausgefilterten Ausschnitt).
+    Erwartet nur die TOC-Seiten (oder einen entsprechend herausgefilterten Ausschnitt),
+    als FlatLines oder Liste von Zeilen-Dicts.
     """
+    norms = FlatLines.coerce(flat_lines).norm_texts()
     items: List[Dict[str, Any]] = []
     i = 0
-    n = len(flat_lines)
+    n = len(norms)
 
     # Zustände
     current: Optional[Dict[str, Any]] = None
 
     while i < n:
-        raw = (flat_lines[i].get("text") or "")
-        raw = unicodedata.normalize("NFKC", raw)
+        raw = norms[i]
         text = _cleanup_line(raw)
         if not text:
             i += 1
@@ -149,7 +151,7 @@ def parse_toc(flat_lines: List[Dict[str, Any]]) -> Dict[str, Any]:
             # Ziehe evtl. mehr Headerzeilen ein (Mehrzeiler bis wir klar einen Subentry/Sprecher/neuen TOP finden)
             j = i + 1
             while j < n:
-                nxt_raw = unicodedata.normalize("NFKC", flat_lines[j].get("text") or "")
+                nxt_raw = norms[j]
                 nxt = _cleanup_line(nxt_raw)
                 if not nxt:
                     break
@@ -185,7 +187,7 @@ def parse_toc(flat_lines: List[Dict[str, Any]]) -> Dict[str, Any]:
             header_lines = [text]
             j = i + 1
             while j < n:
-                nxt_raw = unicodedata.normalize("NFKC", flat_lines[j].get("text") or "")
+                nxt_raw = norms[j]
                 nxt = _cleanup_line(nxt_raw)
                 if not nxt:
                     break
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .wordtable import WordTable
+
+"""
+Persistenter Wort-Cache für die pdfplumber-Extraktion.
+
+Pro PDF werden die Wort-Tabellen (text, x0, x1, top, bottom) aller Seiten abgelegt. Schlüssel ist
+der SHA-256 der PDF-Bytes plus die Version des Extraktors (pdfplumber), d. h. ein erneutes Parsen
+nach einer Regex-Änderung liest nur noch den Cache statt jede Seite neu zu extrahieren.
+
+Dateiformat (eine Datei pro Schlüssel, zusammenhängende Arrays, mmap-fähig):
+  Header:   magic "LTWC", u16 Formatversion, u8 Byteorder (0=little, 1=big), u32 Seitenanzahl,
+            u32 Anzahl Strings, u32 Länge String-Blob, u32 Anzahl Wörter, u32 Länge Meta-Blob
+  Seiten:   u32[n_pages] Seitennummern, f64[n_pages] Seitenbreiten, u32[n_pages + 1] Wort-Offsets
+  Strings:  u32[n_strings + 1] Byte-Offsets in den UTF-8-Blob, danach der Blob
+            (eine String-Tabelle für das ganze Dokument)
+  Wörter:   u32[n_words] String-Index, f64[n_words] x0, x1, top, bottom
+  Meta:     UTF-8-JSON (dokumentweite Extraktionsparameter, z. B. gelernte Kopfzeilen-Bänder)
+
+Eviction: LRU über die mtime (Treffer frischen die mtime auf), begrenzt auf max_bytes.
+"""
+
+MAGIC = b"LTWC"
+FORMAT_VERSION = 3
+_HEADER = struct.Struct("<4sHBIIIII")
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+_COLUMNS = ("x0", "x1", "top", "bottom")
+
+# (page_number, page_width, words)
+CachedPage = Tuple[int, float, WordTable]
+
+
+def file_sha256(path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _encode(pages: List[CachedPage], meta: Optional[Dict[str, Any]] = None) -> bytes:
+    page_numbers = array("I")
+    widths = array("d")
+    word_offsets = array("I", [0])
+    string_ids = {}
+    string_offsets = array("I", [0])
+    blob = bytearray()
+    text_idx = array("I")
+    columns = {c: array("d") for c in _COLUMNS}
+
+    for page_number, width, table in pages:
+        page_numbers.append(page_number)
+        widths.append(width)
+        remap = []
+        for text in table.strings:
+            sid = string_ids.get(text)
+            if sid is None:
+                sid = string_ids[text] = len(string_ids)
+                blob += text.encode("utf-8")
+                string_offsets.append(len(blob))
+            remap.append(sid)
+        text_idx.extend(remap[t] for t in table.text_idx)
+        for c in _COLUMNS:
+            columns[c].extend(getattr(table, c))
+        word_offsets.append(len(text_idx))
+
+    meta_blob = json.dumps(meta or {}, sort_keys=True).encode("utf-8")
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, _BYTEORDER, len(page_numbers),
+                          len(string_ids), len(blob), len(text_idx), len(meta_blob))
+    parts = [header, page_numbers.tobytes(), widths.tobytes(), word_offsets.tobytes(),
+             string_offsets.tobytes(), bytes(blob), text_idx.tobytes()]
+    parts.extend(columns[c].tobytes() for c in _COLUMNS)
+    parts.append(meta_blob)
+    return b"".join(parts)
+
+
+def _decode(buf) -> Optional[Tuple[List[CachedPage], Dict[str, Any]]]:
+    if len(buf) < _HEADER.size:
+        return None
+    magic, version, byteorder, n_pages, n_strings, blob_len, n_words, meta_len = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != FORMAT_VERSION or byteorder != _BYTEORDER:
+        return None
+    pos = _HEADER.size
+
+    def take(typecode: str, count: int) -> array:
+        nonlocal pos
+        arr = array(typecode)
+        nbytes = arr.itemsize * count
+        arr.frombytes(buf[pos:pos + nbytes])
+        pos += nbytes
+        return arr
+
+    page_numbers = take("I", n_pages)
+    widths = take("d", n_pages)
+    word_offsets = take("I", n_pages + 1)
+    string_offsets = take("I", n_strings + 1)
+    blob = bytes(buf[pos:pos + blob_len])
+    pos += blob_len
+    strings = [blob[string_offsets[i]:string_offsets[i + 1]].decode("utf-8") for i in range(n_strings)]
+    text_idx = take("I", n_words)
+    columns = {c: take("d", n_words) for c in _COLUMNS}
+    meta = json.loads(bytes(buf[pos:pos + meta_len]).decode("utf-8"))
+    pos += meta_len
+    if pos != len(buf):
+        return None
+
+    pages: List[CachedPage] = []
+    for p in range(n_pages):
+        a, b = word_offsets[p], word_offsets[p + 1]
+        # Alle Seiten teilen sich die String-Tabelle des Dokuments
+        table = WordTable(strings)
+        table.text_idx = text_idx[a:b]
+        for c in _COLUMNS:
+            setattr(table, c, columns[c][a:b])
+        pages.append((page_numbers[p], widths[p], table))
+    return pages, meta
+
+
+class WordCache:
+    def __init__(self, cache_dir: str = ".cache/words", max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def key_for(self, pdf_path, extractor_version: str, content_hash: Optional[str] = None) -> str:
+        """content_hash: bereits bekannter SHA-256 der PDF-Bytes (z. B. Blob im PdfStore), spart das Hashen."""
+        return f"{content_hash or file_sha256(pdf_path)}-{extractor_version}"
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.words"
+
+    def load(self, key: str) -> Optional[List[CachedPage]]:
+        entry = self.load_entry(key)
+        return entry[0] if entry is not None else None
+
+    def load_entry(self, key: str) -> Optional[Tuple[List[CachedPage], Dict[str, Any]]]:
+        """Wie load, zusätzlich mit den beim Speichern übergebenen Meta-Daten."""
+        path = self.path_for(key)
+        try:
+            with path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    entry = _decode(memoryview(mm))
+        except (OSError, ValueError, UnicodeDecodeError):
+            return None
+        if entry is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def store(self, key: str, pages: List[CachedPage], meta: Optional[Dict[str, Any]] = None) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_bytes(_encode(pages, meta))
+        os.replace(tmp, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[Path] = None) -> List[Path]:
+        """Löscht die am längsten nicht genutzten Einträge, bis der Cache unter max_bytes liegt."""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for p in self.cache_dir.glob("*.words"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        removed: List[Path] = []
+        for _mtime, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and p == keep:
+                continue
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed.append(p)
+        return removed
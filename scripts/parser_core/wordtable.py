@@ -0,0 +1,135 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+"""
+Spaltenorientierte Wort-Tabelle für die Layout-Helfer.
+
+Statt einer Liste von pdfplumber-Dicts (ein Dict pro Wort) liegen die Koordinaten in
+zusammenhängenden float64-Arrays (x0, x1, top, bottom); der Text ist ein Index in eine
+String-Tabelle (pro Tabelle dedupliziert). Teilmengen (Spalten, Zeilen) werden als Index-Listen
+weitergereicht, nicht kopiert.
+
+Alle Helfer arbeiten spaltenweise in einem Durchlauf (Quantisierung, Spaltenzuordnung) und
+sortieren stabil – die Ergebnisse entsprechen exakt der bisherigen Dict-Verarbeitung.
+"""
+
+
+class WordTable:
+    __slots__ = ("strings", "text_idx", "x0", "x1", "top", "bottom")
+
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings: List[str] = strings if strings is not None else []
+        self.text_idx = array("I")
+        self.x0 = array("d")
+        self.x1 = array("d")
+        self.top = array("d")
+        self.bottom = array("d")
+
+    @classmethod
+    def from_words(cls, words: Sequence[dict]) -> "WordTable":
+        """Baut eine Tabelle aus pdfplumber-Wörtern (extract_words)."""
+        table = cls()
+        ids: Dict[str, int] = {}
+        strings = table.strings
+        text_idx = table.text_idx
+        for w in words:
+            text = w.get("text") or ""
+            sid = ids.get(text)
+            if sid is None:
+                sid = ids[text] = len(strings)
+                strings.append(text)
+            text_idx.append(sid)
+        table.x0 = array("d", [float(w.get("x0", 0.0)) for w in words])
+        table.x1 = array("d", [float(w.get("x1", 0.0)) for w in words])
+        table.top = array("d", [float(w.get("top", 0.0)) for w in words])
+        table.bottom = array("d", [float(w.get("bottom", w.get("top", 0.0))) for w in words])
+        return table
+
+    def __len__(self) -> int:
+        return len(self.text_idx)
+
+    def text(self, i: int) -> str:
+        return self.strings[self.text_idx[i]]
+
+    def texts(self, indices: Optional[Iterable[int]] = None) -> List[str]:
+        strings = self.strings
+        text_idx = self.text_idx
+        if indices is None:
+            return [strings[t] for t in text_idx]
+        return [strings[text_idx[i]] for i in indices]
+
+    def to_words(self, indices: Optional[Iterable[int]] = None) -> List[dict]:
+        """Zurück in pdfplumber-ähnliche Dicts (für Helfer, die auf Wort-Dicts arbeiten)."""
+        if indices is None:
+            indices = range(len(self))
+        strings = self.strings
+        return [{"text": strings[self.text_idx[i]], "x0": self.x0[i], "x1": self.x1[i],
+                 "top": self.top[i], "bottom": self.bottom[i]} for i in indices]
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.text_idx, self.x0, self.x1, self.top, self.bottom))
+
+
+def group_lines_by_y(table: WordTable, indices: Optional[Sequence[int]] = None,
+                     y_quant: float = 3.0) -> List[List[int]]:
+    """
+    Gruppiert Wörter nach quantisierter y-Position. Rückgabe: Zeilen als Index-Listen,
+    Zeilen nach y-Schlüssel, Wörter innerhalb einer Zeile nach x0 (stabil) sortiert.
+    """
+    if indices is None:
+        indices = range(len(table))
+    top = table.top
+    x0 = table.x0
+    keyed = sorted(((int(round(top[i] / y_quant)), x0[i], i) for i in indices),
+                   key=lambda t: (t[0], t[1]))
+    lines: List[List[int]] = []
+    current_key = None
+    current: List[int] = []
+    for yk, _x, i in keyed:
+        if yk != current_key:
+            if current:
+                lines.append(current)
+            current = []
+            current_key = yk
+        current.append(i)
+    if current:
+        lines.append(current)
+    return lines
+
+
+def split_by_mid(table: WordTable, split_x: float) -> Tuple[List[int], List[int]]:
+    """Linke Spalte: Mittelpunkt < split_x, rechte Spalte: Mittelpunkt >= split_x."""
+    left: List[int] = []
+    right: List[int] = []
+    for i, (a, b) in enumerate(zip(table.x0, table.x1)):
+        if (a + b) / 2.0 < split_x:
+            left.append(i)
+        else:
+            right.append(i)
+    return left, right
+
+
+def assign_columns(table: WordTable, split_x: float,
+                   margin: float) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Ordnet Wörter linker/rechter Spalte oder „volle Breite“ (überdeckt die Mitte) zu.
+    Rückgabe: (left, right, full) als Index-Listen in Tabellenreihenfolge.
+    """
+    left: List[int] = []
+    right: List[int] = []
+    full: List[int] = []
+    left_boundary = split_x - margin
+    right_boundary = split_x + margin
+    lo = split_x - 0.5
+    hi = split_x + 0.5
+    for i, (a, b) in enumerate(zip(table.x0, table.x1)):
+        mid = (a + b) * 0.5
+        if a < left_boundary and b > right_boundary:
+            full.append(i)
+        elif mid < lo:
+            left.append(i)
+        elif mid > hi:
+            right.append(i)
+        else:
+            full.append(i)
+    return left, right, full
@@ -0,0 +1,43 @@
+from pathlib import Path
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.batch import format_summary, run_batch, summarize
+
+
+def _work(item):
+    if item == "haengt":
+        time.sleep(60)
+    if item == "kaputt":
+        raise ValueError("keine PDF-Datei")
+    if item == "absturz":
+        os._exit(3)
+    return {"pages": 10, "output": f"{item}.json"}
+
+
+def test_run_batch_isolates_errors_crashes_and_timeouts():
+    t0 = time.monotonic()
+    results = {r.item: r for r in run_batch(["a", "haengt", "kaputt", "absturz", "b"], _work,
+                                             jobs=2, timeout=1.0)}
+
+    assert time.monotonic() - t0 < 10
+    assert {k: r.status for k, r in results.items()} == {
+        "a": "ok", "b": "ok", "haengt": "timeout", "kaputt": "error", "absturz": "crashed",
+    }
+    assert results["a"].output == "a.json"
+    assert results["kaputt"].error == "ValueError: keine PDF-Datei"
+    assert "exitcode 3" in results["absturz"].error
+
+
+def test_results_stream_in_completion_order_and_summary_counts_pages():
+    results = list(run_batch(["haengt", "a"], _work, jobs=2, timeout=1.0))
+
+    assert [r.item for r in results] == ["a", "haengt"]
+    summary = summarize(results, wall_time=2.0)
+    assert summary["status"] == {"ok": 1, "timeout": 1}
+    assert summary["pages"] == 10
+    assert summary["pages_per_sec"] == 5.0
+    assert "2 Dokumente (ok=1, timeout=1)" in format_summary(summary)
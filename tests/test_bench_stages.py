@@ -0,0 +1,26 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.benchmarks.bench_stages import append_history, compare, load_history, run_suite
+
+
+def test_replays_fixture_through_text_stages():
+    stages = run_suite(repeat=1, only=["header_footer", "cleanup", "speeches", "events"])
+    assert list(stages) == ["header_footer", "cleanup", "speeches", "events"]
+    assert stages["cleanup"]["counts"]["pages"] == 44
+    assert stages["events"]["counts"]["speeches"] == stages["speeches"]["counts"]["speeches"] > 100
+    assert all(r["ops_per_sec"] > 0 and r["alloc_peak_mb"] >= 0 for r in stages.values())
+    assert stages["speeches"]["normalize"]["nfkc"]["calls"] > 100 and stages["speeches"]["norm_ms"] > 0
+
+
+def test_history_appends_runs_and_compares_medians(tmp_path):
+    path = tmp_path / "history.json"
+    first = {"toc": {"median_ms": 2.0}}
+    append_history(path, first, "fixture.json", commit="aaa")
+    append_history(path, {"toc": {"median_ms": 3.0}, "session": {"median_ms": 1.0}}, "fixture.json", commit="bbb")
+    runs = load_history(path)
+    assert [r["commit"] for r in runs] == ["aaa", "bbb"]
+    assert compare(runs[0], runs[1]["stages"]) == {"toc": 50.0}
+    assert compare(None, first) == {}
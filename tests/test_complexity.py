@@ -0,0 +1,94 @@
+from pathlib import Path
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.benchmarks.complexity import measure_growth, stage_growth
+from scripts.parse_landtag_pdf import extract_next_meeting_from_toc_and_strip
+from scripts.parser_core.segments import build_speech_segments
+from scripts.parser_core.textflow import reflow_speeches
+
+# Schranken-Tests messen Laufzeiten und gehören nicht in jeden pytest-Lauf (geteilte CI-Maschinen):
+# COMPLEXITY_TESTS=1 python -m pytest tests/test_complexity.py
+timing = pytest.mark.skipif(not os.environ.get("COMPLEXITY_TESTS"),
+                            reason="Laufzeitmessung, nur mit COMPLEXITY_TESTS=1")
+
+# Deklarierte Schranken je Stufe (n = Seiten des synthetischen Protokolls)
+STAGE_BOUNDS = {
+    "header_footer": "n",
+    "cleanup": "n",
+    "toc_split": "n",
+    "toc": "n",
+    "speeches": "n",
+    "events": "n",
+    "enrich": "n",
+    "session": "n",
+}
+
+
+def _assert_within(growth):
+    assert growth.ok, growth.describe()
+
+
+@timing
+def test_text_stages_stay_within_declared_bounds():
+    for growth in stage_growth([12, 48, 192], STAGE_BOUNDS):
+        _assert_within(growth)
+
+
+def _speech_with_interjections(k):
+    parts, anns = [], []
+    pos = 0
+    for i in range(k):
+        text = f"Satz {i} zur Sache. "
+        event = f"(Beifall bei der CDU {i})"
+        parts += [text, event]
+        anns.append({"type": "interjection", "text": event, "raw_start": pos + len(text),
+                     "raw_end": pos + len(text) + len(event)})
+        pos += len(text) + len(event)
+    return {"index": 0, "text_raw": "".join(parts), "annotations": anns}
+
+
+@timing
+def test_speech_segments_linear_in_interjections():
+    def make(k):
+        speech = _speech_with_interjections(k)
+        return (lambda: {"speeches": [copy.deepcopy(speech)]}), build_speech_segments
+    _assert_within(measure_growth("build_speech_segments", make, [300, 1200, 4800]))
+
+
+def test_speech_segments_reference_interjections_in_order():
+    sp = _speech_with_interjections(3)
+    build_speech_segments([sp])
+    assert [s["annotation_ref"] for s in sp["segments"] if s["type"] == "interjection"] == [0, 1, 2]
+
+
+@timing
+def test_next_meeting_strip_linear_in_toc_lines():
+    def make(n):
+        lines = [f"Abg. Name {i} CDU . . . . . {7000 + i}" for i in range(n)]
+        lines += ["Nächste Sitzung . . . . . 7680", "Donnerstag, 17. Juli 2025, 9:30 Uhr"]
+        return (lambda: {"toc": {"items": [{"number": 1, "raw_lines": list(lines)}]}}), \
+            extract_next_meeting_from_toc_and_strip
+    _assert_within(measure_growth("extract_next_meeting_from_toc_and_strip", make, [500, 2000, 8000]))
+
+
+@timing
+def test_reflow_linear_in_lines():
+    def make(n):
+        text = "\n" * n + "\n".join(f"Zeile {i} ohne Satzende" for i in range(n))
+        return (lambda: {"speeches": [{"text": text}]}), reflow_speeches
+    _assert_within(measure_growth("reflow_speeches", make, [500, 2000, 8000]))
+
+
+# läuft immer: quadratisches Wachstum liegt weit über der Toleranz (Überschuss ~1 bei erlaubten 0.35)
+def test_harness_flags_quadratic_growth():
+    def quadratic(items):
+        return [items.index(x) for x in items]
+    growth = measure_growth("quadratic", lambda n: ((lambda: {"items": list(range(n))}), quadratic),
+                            [200, 800, 3200])
+    assert not growth.ok
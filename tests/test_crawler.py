@@ -0,0 +1,151 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.crawler import (
+    CrawlState,
+    crawl_filterlist,
+    crawl_html,
+    new_pdf_links,
+    save_unless_failed,
+    write_manifest,
+)
+from scripts.parser_core.downloader import DownloadResult
+
+TEMPLATE = "https://example.invalid/filterlist?offset={offset}"
+PAGE_SIZE = 5
+
+
+class _Listing:
+    """Filterlist-Attrappe: neueste zuerst, feste Seitengröße, zählt Anfragen."""
+
+    def __init__(self, n):
+        self.items = [self._item(i) for i in range(n, 0, -1)]
+        self.offsets = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _item(i):
+        return {"title": f"Plenarprotokoll 17/{i}", "documents": [{"url": f"/resource/blob/{i}/p{i}.pdf"}]}
+
+    def publish(self, i):
+        self.items.insert(0, self._item(i))
+
+    def __call__(self, url):
+        offset = int(url.rsplit("=", 1)[1])
+        with self.lock:
+            self.offsets.append(offset)
+        return {"result": self.items[offset:offset + PAGE_SIZE]}
+
+
+def _pdfs(items):
+    return [doc["url"] for it in items for doc in it["documents"]]
+
+
+def test_backfill_then_incremental_stops_at_high_water_mark(tmp_path):
+    listing = _Listing(23)
+    state = CrawlState.load(tmp_path / "state.json")
+
+    first = crawl_filterlist(TEMPLATE, state, fetch=listing, concurrency=3, per_host_interval=0.0)
+    assert first.mode == "backfill"
+    assert first.new_items == listing.items
+    assert new_pdf_links(first.new_items, state, _pdfs) == _pdfs(listing.items)
+    state.save()
+
+    listing.publish(24)
+    listing.publish(25)
+    listing.offsets.clear()
+    state = CrawlState.load(tmp_path / "state.json")
+    second = crawl_filterlist(TEMPLATE, state, fetch=listing)
+    assert second.mode == "incremental"
+    assert [it["title"] for it in second.new_items] == ["Plenarprotokoll 17/25", "Plenarprotokoll 17/24"]
+    assert second.requests == 1 and listing.offsets == [0]
+    assert new_pdf_links(second.new_items, state, _pdfs) == ["/resource/blob/25/p25.pdf", "/resource/blob/24/p24.pdf"]
+
+    # Nichts Neues: eine Anfrage, leeres Ergebnis
+    third = crawl_filterlist(TEMPLATE, state, fetch=listing)
+    assert third.new_items == [] and third.requests == 1
+
+
+def test_incremental_survives_removed_newest_item_and_pages_on(tmp_path):
+    listing = _Listing(8)
+    state = CrawlState()
+    crawl_filterlist(TEMPLATE, state, fetch=listing, per_host_interval=0.0)
+
+    del listing.items[0]                  # bisher neuester Eintrag verschwindet
+    for i in range(9, 16):                # sieben neue: mehr als eine Seite
+        listing.publish(i)
+    listing.offsets.clear()
+    result = crawl_filterlist(TEMPLATE, state, fetch=listing)
+    assert len(result.new_items) == 7
+    assert listing.offsets == [0, 5]
+
+
+class _HtmlHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = self.server.body
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_failed_download_keeps_state_for_the_next_run(tmp_path):
+    listing = _Listing(7)
+    state = CrawlState(path=tmp_path / "state.json")
+    crawl_filterlist(TEMPLATE, state, fetch=listing)
+    state.save()
+
+    listing.publish(8)
+    state = CrawlState.load(tmp_path / "state.json")
+    urls = new_pdf_links(crawl_filterlist(TEMPLATE, state, fetch=listing).new_items, state, _pdfs)
+    assert urls == ["/resource/blob/8/p8.pdf"]
+    failed = save_unless_failed(state, [DownloadResult(urls[0], None, "error", error="HTTP 503")])
+    assert failed == urls
+
+    # nicht gespeichert: der nächste Lauf meldet die URL erneut
+    state = CrawlState.load(tmp_path / "state.json")
+    assert new_pdf_links(crawl_filterlist(TEMPLATE, state, fetch=listing).new_items, state, _pdfs) == urls
+    assert save_unless_failed(state, [DownloadResult(urls[0], tmp_path / "p8.pdf", "downloaded")]) == []
+    state = CrawlState.load(tmp_path / "state.json")
+    assert crawl_filterlist(TEMPLATE, state, fetch=listing).new_items == []
+
+
+def test_html_listing_conditional_get_and_manifest(tmp_path):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _HtmlHandler)
+    httpd.hits, httpd.etag, httpd.body = [], '"a"', b"a.pdf b.pdf a.pdf"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/liste"
+    extract = lambda html: html.decode().split()
+    try:
+        state = CrawlState()
+        _, first = crawl_html(url, state, extract)
+        assert [it["url"] for it in first.new_items] == ["a.pdf", "b.pdf"]
+        state.pdf_urls.extend(it["url"] for it in first.new_items)
+
+        _, second = crawl_html(url, state, extract)
+        assert second.mode == "not-modified" and httpd.hits[-1] == '"a"'
+
+        httpd.etag, httpd.body = '"b"', b"c.pdf a.pdf b.pdf"
+        _, third = crawl_html(url, state, extract)
+        assert [it["url"] for it in third.new_items] == ["c.pdf"]
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    manifest = write_manifest(tmp_path / "neu.txt", ["c.pdf"], {"c.pdf": {"title": "17/3"}})
+    assert manifest.read_text(encoding="utf-8") == "c.pdf\n"
+    assert '"title": "17/3"' in (tmp_path / "neu.txt.json").read_text(encoding="utf-8")
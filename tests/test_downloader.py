@@ -0,0 +1,136 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import asyncio
+import hashlib
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.downloader import AsyncDownloader, download_all, download_pdf
+from scripts.parser_core.pdfcache import PdfStore
+
+BODY = b"%PDF-1.4\n" + bytes(range(256)) * 800
+ETAG = '"v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers), time.monotonic()))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(0.05)
+            if self.path == "/missing.pdf":
+                self.send_error(404)
+            elif self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("ETag", ETAG)
+                self.send_header("Content-Length", str(len(BODY)))
+                self.end_headers()
+                self.wfile.write(BODY)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.in_flight = 0
+    httpd.max_in_flight = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_streams_to_disk_with_hash_and_revalidates_with_etag(server, tmp_path):
+    url = _url(server, "/a.pdf")
+    downloader = AsyncDownloader(cache_dir=str(tmp_path), per_host_interval=0.0)
+
+    first, = asyncio.run(downloader.fetch_all([url]))
+    second, = asyncio.run(downloader.fetch_all([url]))
+
+    assert first.status == "downloaded"
+    assert first.sha256 == hashlib.sha256(BODY).hexdigest()
+    assert first.path.read_bytes() == BODY
+    assert first.path.name == f"{first.sha256}.pdf"
+    assert PdfStore(str(tmp_path)).lookup_url(url).etag == ETAG
+    assert second.status == "not-modified" and second.sha256 == first.sha256
+    assert server.requests[1][1].get("If-None-Match") == ETAG
+    assert not list(tmp_path.rglob("*.part"))
+
+
+def test_republished_pdf_is_deduplicated_and_named_downloads_keep_meta(server, tmp_path):
+    urls = [_url(server, "/blob/1.pdf"), _url(server, "/blob/2.pdf")]
+
+    stored = download_all(urls, cache_dir=str(tmp_path / "store"), per_host_interval=0.0)
+    named = download_all(urls[:1], dest_for=lambda u: tmp_path / "named" / u.rsplit("/", 1)[-1],
+                         per_host_interval=0.0)
+
+    assert stored[0].path == stored[1].path
+    assert PdfStore(str(tmp_path / "store")).stats()["blobs"] == 1
+    assert named[0].path == tmp_path / "named" / "1.pdf"
+    assert (tmp_path / "named" / "1.pdf.meta.json").exists()
+
+
+def test_bounded_concurrency_host_interval_and_errors(server, tmp_path):
+    urls = [_url(server, f"/{n}.pdf") for n in range(6)] + [_url(server, "/missing.pdf")]
+    downloader = AsyncDownloader(cache_dir=str(tmp_path), concurrency=4, per_host_concurrency=2,
+                                 per_host_interval=0.1)
+
+    t0 = time.monotonic()
+    results = asyncio.run(downloader.fetch_all(urls))
+
+    assert [r.status for r in results] == ["downloaded"] * 6 + ["error"]
+    assert results[-1].http_status == 404
+    assert server.max_in_flight <= 2
+    # Anfragestarts pro Host mindestens 0.1 s auseinander
+    assert time.monotonic() - t0 >= 0.6
+
+
+def test_throttled_host_does_not_hold_the_global_slot(server, tmp_path):
+    port = server.server_address[1]
+    # zwei Hosts (netloc) auf demselben Server; 127.0.0.1 ist gedrosselt, localhost nicht
+    urls = [f"http://127.0.0.1:{port}/1.pdf", f"http://127.0.0.1:{port}/2.pdf", f"http://localhost:{port}/3.pdf"]
+    downloader = AsyncDownloader(cache_dir=str(tmp_path), concurrency=1, per_host_concurrency=2,
+                                 per_host_interval=0.5)
+
+    t0 = time.monotonic()
+    results = asyncio.run(downloader.fetch_all(urls))
+
+    assert [r.status for r in results] == ["downloaded"] * 3
+    started = {path: at - t0 for path, _headers, at in server.requests}
+    # /3.pdf läuft, während /2.pdf auf seinen Abstand wartet, statt hinter ihm im globalen Slot
+    assert started["/3.pdf"] < started["/2.pdf"]
+    assert started["/2.pdf"] >= 0.5
+    assert server.max_in_flight == 1
+
+
+def test_download_pdf_uses_existing_cache_file_without_request(server, tmp_path):
+    url = _url(server, "/c.pdf")
+
+    path = download_pdf(url, cache_dir=str(tmp_path))
+    again = download_pdf(url, cache_dir=str(tmp_path))
+
+    assert path == again and path.read_bytes() == BODY
+    assert len(server.requests) == 1
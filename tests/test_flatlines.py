@@ -0,0 +1,59 @@
+from pathlib import Path
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parse_landtag_pdf import pages_to_flat_lines, parse_toc, split_toc_and_body
+from scripts.parser_core.flatlines import FlatLines
+from scripts.parser_core.stages import content_digest
+
+PAGES = [
+    ["Landtag von Baden-Württemberg", "", "INHALT", "1. Aktuelle Debatte – Thema . . . . 7701"],
+    ["Abg. Max Muster CDU . . . . 7702", "Protokoll", "Beginn: 9:30 Uhr", "Präsidentin Muhterem Aras: Guten Morgen."],
+]
+
+
+def test_split_returns_views_on_one_store():
+    flat = pages_to_flat_lines(PAGES)
+    toc_lines, body_lines, meta = split_toc_and_body(flat)
+    assert meta == {"inhalt_found": True, "body_start_index": 5, "body_start_reason": "protokoll"}
+    # Leerzeile vor dem TOC gehört zum Body -> Kopie; TOC ist eine Sicht ohne Kopie
+    assert toc_lines.texts is flat.texts and (toc_lines.start, toc_lines.stop) == (2, 5)
+    assert [r["text"] for r in toc_lines] == ["INHALT", PAGES[0][3], PAGES[1][0]]
+    assert [(r["page"], r["line_index"]) for r in body_lines] == [(1, 1), (2, 1), (2, 2), (2, 3)]
+    # Liste von Dicts wie bisher
+    assert split_toc_and_body(flat.to_dicts()) == (toc_lines, body_lines, meta)
+    assert parse_toc(toc_lines) == parse_toc(toc_lines.to_dicts())
+
+
+def test_norm_is_computed_once_and_shared():
+    flat = FlatLines.from_pages([["ﬁ Fußnote", "plain"]])
+    assert flat.norms == [None, None]
+    assert flat.norm(0) == "fi Fußnote"
+    assert flat.norm(1) is flat.text(1)
+    view = flat[1:]
+    assert view.norm(0) is flat.norm(1) and view[0] == {"page": 1, "line_index": 1, "text": "plain"}
+
+
+def test_compact_and_pickle_keep_only_visible_rows():
+    flat = pages_to_flat_lines(PAGES)
+    view = flat[2:4]
+    small = view.compact()
+    assert small == view and len(small.texts) == 2
+    restored = pickle.loads(pickle.dumps(view))
+    assert restored == view and len(restored.texts) == 2
+    assert restored.norm(1) is restored.texts[1]
+    with pytest.raises(ValueError):
+        view.append(3, 0, "x")
+
+
+def test_digest_ignores_view_offsets_and_lazy_norms():
+    flat = pages_to_flat_lines(PAGES)
+    view = flat[2:4]
+    before = content_digest(view)
+    view.norm_texts()
+    assert content_digest(view) == before == content_digest(pickle.loads(pickle.dumps(view)))
+    assert content_digest(flat[2:5]) != before
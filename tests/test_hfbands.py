@@ -0,0 +1,66 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.hfbands import HeaderFooterBands, learn_bands
+from scripts.parser_core.wordtable import WordTable
+
+
+def _key(text):
+    return "".join(ch for ch in text if not ch.isdigit()).strip(" –")
+
+
+def _page(page_number, header_top, body_top, footer_top=None):
+    words = [{"text": "Landtag", "x0": 56.0, "x1": 100.0, "top": header_top, "bottom": header_top + 9},
+             {"text": f"{page_number}. Sitzung", "x0": 300.0, "x1": 360.0, "top": header_top, "bottom": header_top + 9}]
+    for row in range(5):
+        top = body_top + row * 11
+        words.append({"text": f"Zeile{row}", "x0": 56.0, "x1": 120.0, "top": top, "bottom": top + 9})
+    if footer_top is not None:
+        words.append({"text": str(7600 + page_number), "x0": 280.0, "x1": 300.0,
+                      "top": footer_top, "bottom": footer_top + 9})
+    return page_number, WordTable.from_words(words)
+
+
+def test_learn_bands_per_parity_and_filter_removes_only_header():
+    pages = [_page(n, 34.0 if n % 2 else 54.0, 54.0 if n % 2 else 66.0, footer_top=806.0) for n in range(1, 10)]
+
+    bands = learn_bands(pages, _key, skip_first_n_pages=3)
+
+    assert 43.0 < bands.header_bottom[1] < 54.0
+    assert 63.0 < bands.header_bottom[0] < 66.0
+    assert 760.0 < bands.footer_top[1] < 806.0
+
+    _n, table = _page(12, 54.0, 66.0)
+    filtered = bands.filter_table(12, table)
+    assert filtered.texts() == [f"Zeile{row}" for row in range(5)]
+    # Titel/Inhaltsverzeichnis bleiben unangetastet
+    assert bands.filter_table(2, table) is table
+
+
+def test_filter_drops_only_words_inside_a_band():
+    bands = HeaderFooterBands(header_bottom={0: 50.0}, footer_top={0: 800.0})
+    table = WordTable.from_words([
+        {"text": "Kopf", "x0": 56.0, "x1": 100.0, "top": 40.0, "bottom": 50.0},
+        # große Schrift im Rumpf, ragt oben ins Kopfzeilen-Band
+        {"text": "Groß", "x0": 56.0, "x1": 100.0, "top": 44.0, "bottom": 62.0},
+        {"text": "Rumpf", "x0": 56.0, "x1": 100.0, "top": 400.0, "bottom": 409.0},
+        # ragt unten ins Fußzeilen-Band
+        {"text": "Unten", "x0": 56.0, "x1": 100.0, "top": 795.0, "bottom": 806.0},
+        {"text": "7612", "x0": 280.0, "x1": 300.0, "top": 800.0, "bottom": 809.0},
+    ])
+
+    assert bands.filter_table(12, table).texts() == ["Groß", "Rumpf", "Unten"]
+
+
+def test_learn_bands_skips_when_header_text_differs():
+    pages = [(n, WordTable.from_words([
+        {"text": f"Text{chr(65 + n)}", "x0": 56.0, "x1": 100.0, "top": 34.0, "bottom": 43.0},
+        {"text": "Rumpf", "x0": 56.0, "x1": 100.0, "top": 60.0, "bottom": 69.0},
+    ])) for n in range(4, 10)]
+
+    bands = learn_bands(pages, _key, skip_first_n_pages=3, learn_footer=False)
+
+    assert not bands
+    assert HeaderFooterBands.from_meta(bands.to_meta()) == bands
@@ -0,0 +1,127 @@
+from pathlib import Path
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.benchmarks.bench_histogram_split import histogram_split_reference
+from scripts.parser_core.layout import (
+    _SplitSweep,
+    _build_layout_template,
+    _histogram_split,
+    _mixed_line_penalty,
+    _process_page,
+    _rebalance_split,
+)
+
+
+def _two_column_mids(rng, n):
+    mids = [rng.gauss(170, 45) for _ in range(n // 2)] + [rng.gauss(425, 45) for _ in range(n - n // 2)]
+    # Gitterwerte treffen Bin-Grenzen exakt
+    mids += [56.0 + 2.5 * k for k in range(0, 200, 7)]
+    return mids
+
+
+def test_histogram_split_matches_reference_binning():
+    rng = random.Random(127)
+    for n in (12, 200, 1500):
+        for _ in range(20):
+            mids = _two_column_mids(rng, n)
+            for bins in (10, 80):
+                expected = histogram_split_reference(mids, 595.28, bins, 0.18, 0.30)
+                assert _histogram_split(mids, 595.28, bins, 0.18, 0.30) == expected
+                assert _histogram_split(sorted(mids), 595.28, bins, 0.18, 0.30) == expected
+
+
+def test_histogram_split_finds_gutter_between_columns():
+    rng = random.Random(7)
+    mids = [rng.uniform(60, 280) for _ in range(600)] + [rng.uniform(315, 535) for _ in range(600)]
+
+    split_x, meta = _histogram_split(mids, 595.28, 80, 0.18, 0.30)
+
+    assert 280 <= split_x <= 315
+    assert meta["hist_bins"] == 80
+
+
+def _random_page_pairs(rng, n):
+    pairs = []
+    for _ in range(n):
+        x0 = rng.choice((rng.uniform(50, 260), rng.uniform(300, 520), rng.uniform(200, 330)))
+        w = {"text": "w", "x0": x0, "x1": x0 + rng.uniform(5, 60), "top": rng.choice(range(60, 780, 4)) + rng.random()}
+        pairs.append(((w["x0"] + w["x1"]) / 2.0, w))
+    pairs.sort(key=lambda p: p[0])
+    return pairs
+
+
+def test_split_sweep_matches_rebuilt_penalty():
+    rng = random.Random(6)
+    for n in (1, 30, 400):
+        pairs = _random_page_pairs(rng, n)
+        sweep = _SplitSweep(pairs)
+        for x in sorted(rng.uniform(0, 600) for _ in range(50)):
+            sweep.advance(x)
+            left = [w for m, w in pairs if m < x]
+            right = [w for m, w in pairs if m >= x]
+            assert sweep.left_count == len(left)
+            assert sweep.penalty() == _mixed_line_penalty(left, right)
+
+
+def test_rebalance_split_picks_same_split_as_rebuild():
+    rng = random.Random(11)
+    for _ in range(20):
+        pairs = _random_page_pairs(rng, 250)
+        left = [w for m, w in pairs if m < 200]
+        right = [w for m, w in pairs if m >= 200]
+        result = _rebalance_split(pairs, 595.28, left, right, 200, 0.4, 0.6, 6.0)
+        if result is None:
+            continue
+        sx, lws, rws, fl, _fr, meta = result
+        assert lws == [w for m, w in pairs if m < sx]
+        assert rws == [w for m, w in pairs if m >= sx]
+        assert meta["rebalance_mixed_penalty"] == round(_mixed_line_penalty(lws, rws), 3)
+
+
+class _FakePage:
+    def __init__(self, words, width=595.28):
+        self._words = words
+        self.width = width
+
+    def extract_words(self, **_kwargs):
+        return self._words
+
+    def extract_text(self):
+        return "\n".join(w["text"] for w in self._words)
+
+
+def _two_column_page(rng, banner=False):
+    words = []
+    for row in range(60):
+        top = 80.0 + row * 11
+        for x0 in (60.0, 120.0, 190.0, 320.0, 390.0, 460.0):
+            words.append({"text": f"w{row}", "x0": x0 + rng.uniform(0, 5), "x1": x0 + 50, "top": top})
+    if banner:
+        # Überschriften über die volle Breite kreuzen den Spaltenzwischenraum
+        words += [{"text": "Banner", "x0": 200.0, "x1": 400.0, "top": 40.0 + k} for k in range(20)]
+    return _FakePage(words)
+
+
+_PAGE_KWARGS = dict(force_two_column=True, min_words_for_detection=25, min_side_fraction=0.10,
+                    hist_bins=80, min_peak_sep_rel=0.18, min_valley_rel_drop=0.30, line_y_quant=3.0,
+                    rebalance_target_low=0.42, rebalance_target_high=0.58, rebalance_scan_step=5.0)
+
+
+def test_layout_template_snaps_to_gutter_and_validates_pages():
+    rng = random.Random(3)
+    pages = [_two_column_page(rng) for _ in range(10)]
+    template, sampled = _build_layout_template(pages, 3, 0.02, _PAGE_KWARGS)
+
+    assert sorted(sampled) == [2, 6, 9]
+    assert 240 < template.split_x < 320
+
+    result = _process_page(pages[0], 1, template=template, **_PAGE_KWARGS)
+    assert result.method == "two-column-template"
+    assert result.meta["left_count"] == result.meta["right_count"]
+
+    fallback = _process_page(_two_column_page(rng, banner=True), 11, template=template, **_PAGE_KWARGS)
+    assert fallback.method != "two-column-template"
+    assert fallback.meta["template_rejected"]["reason"] == "straddle"
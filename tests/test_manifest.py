@@ -0,0 +1,59 @@
+from pathlib import Path
+import hashlib
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parse_landtag_pdf import parser_fingerprint, plan_rebuild
+from scripts.parser_core.config import LayoutConfig, ParserConfig
+from scripts.parser_core.manifest import ParseManifest, code_fingerprint
+
+
+def test_rebuild_reasons(tmp_path):
+    out = tmp_path / "data"
+    manifest = ParseManifest(out)
+    assert manifest.rebuild_reason("a.pdf", "s1", "fp1") == "new"
+
+    out.mkdir()
+    (out / "session.json").write_text("{}", encoding="utf-8")
+    manifest.record("a.pdf", "s1", "fp1", [out / "session.json"])
+
+    reloaded = ParseManifest(out)
+    assert reloaded.get("a.pdf").outputs == ["session.json"]
+    assert reloaded.rebuild_reason("a.pdf", "s1", "fp1") is None
+    assert reloaded.rebuild_reason("a.pdf", "s2", "fp1") == "pdf-changed"
+    assert reloaded.rebuild_reason("a.pdf", "s1", "fp2") == "parser-changed"
+    assert reloaded.rebuild_reason("a.pdf", None, "fp1") == "pdf-unknown"
+    assert reloaded.unchanged_pdf("a.pdf", "s1") and not reloaded.unchanged_pdf("a.pdf", "s2")
+    (out / "session.json").unlink()
+    assert reloaded.rebuild_reason("a.pdf", "s1", "fp1") == "output-missing"
+
+
+def test_fingerprint_tracks_code_and_config(tmp_path):
+    src = tmp_path / "mod.py"
+    src.write_text("X = 1\n", encoding="utf-8")
+    before = code_fingerprint([src])
+    src.write_text("X = 2\n", encoding="utf-8")
+    assert code_fingerprint([src]) != before
+
+    base = ParserConfig()
+    assert parser_fingerprint(base) == parser_fingerprint(ParserConfig())
+    assert parser_fingerprint(base) != parser_fingerprint(ParserConfig(layout=LayoutConfig(min_words=99)))
+
+
+def test_plan_rebuild_skips_unchanged_local_pdf(tmp_path):
+    pdf = tmp_path / "p.pdf"
+    pdf.write_bytes(b"%PDF-1.4 eins")
+    out = tmp_path / "data"
+    out.mkdir()
+    (out / "s.json").write_text("{}", encoding="utf-8")
+    manifest = ParseManifest(out)
+    fp = parser_fingerprint(ParserConfig())
+    [(_, reason)] = plan_rebuild([str(pdf)], manifest, fp)
+    assert reason == "new"
+
+    manifest.record(str(pdf), hashlib.sha256(pdf.read_bytes()).hexdigest(), fp, [out / "s.json"])
+    assert plan_rebuild([str(pdf)], manifest, fp) == [(str(pdf), None)]
+    assert plan_rebuild([str(pdf)], manifest, fp, force=True) == [(str(pdf), "forced")]
+    pdf.write_bytes(b"%PDF-1.4 zwei")
+    assert plan_rebuild([str(pdf)], manifest, fp) == [(str(pdf), "pdf-changed")]
@@ -0,0 +1,47 @@
+from pathlib import Path
+import io
+import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.pagestream import MemoryProbe, PageSpool, dump_json
+
+
+PAGES = [["Landtag von Baden-Württemberg", "Zeile „zwei“"], [], ["a\nb", ""]]
+
+
+def test_page_spool_round_trip_and_reiteration():
+    spool = PageSpool()
+    for page in PAGES:
+        spool.append(page)
+
+    assert len(spool) == 3
+    assert list(spool) == PAGES
+    assert list(spool) == PAGES
+
+
+def test_dump_json_matches_json_dump_with_spooled_pages():
+    spool = PageSpool()
+    for page in PAGES:
+        spool.append(page)
+    empty = PageSpool()
+    doc = {"ref": "x.json", "debug": {"meta": [{"page": 1, "split_x": 297.64}], "pages": spool,
+                                      "none": empty, "flags": {}, "n": None}}
+    expected = json.dumps({**doc, "debug": {**doc["debug"], "pages": PAGES, "none": []}},
+                          ensure_ascii=False, indent=2)
+
+    out = io.StringIO()
+    dump_json(doc, out)
+
+    assert out.getvalue() == expected
+
+
+def test_memory_probe_reports_tracemalloc_peak():
+    probe = MemoryProbe(trace=True).start()
+    blob = [bytes(1024) for _ in range(1024)]
+    report = probe.report()
+    probe.stop()
+
+    assert report["tracemalloc_peak_mb"] >= 1.0
+    assert len(blob) == 1024
@@ -0,0 +1,120 @@
+from pathlib import Path
+import sys
+import tracemalloc
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import scripts.parse_landtag_pdf as parse_landtag_pdf
+from scripts.parse_landtag_pdf import (
+    DocumentWords,
+    PageWords,
+    TocLineCollector,
+    WordTable,
+    _batch_worker,
+    _page_ranges,
+    _words_to_lines_text,
+    _words_to_lines_with_xy,
+    extract_toc_interleaved_flat_lines,
+    layout_document,
+    pages_to_flat_lines,
+    split_toc_and_body,
+)
+from scripts.parser_core.config import LayoutConfig, ParserConfig
+
+
+def test_page_ranges_cover_all_pages_in_order():
+    ranges = _page_ranges(10, 4)
+    assert ranges == [(0, 3), (3, 6), (6, 8), (8, 10)]
+
+
+def test_page_ranges_never_exceed_page_count():
+    assert _page_ranges(2, 8) == [(0, 1), (1, 2)]
+
+
+def test_toc_fallback_reads_words_from_store_without_opening_pdf():
+    store = DocumentWords(retain=range(1, 4))
+    store.page_count = 1
+    store.put(PageWords(1, 600.0, WordTable.from_words([
+        {"text": "INHALT", "x0": 40.0, "x1": 80.0, "top": 10.0},
+        {"text": "1.", "x0": 40.0, "x1": 50.0, "top": 30.0},
+        {"text": "Debatte", "x0": 55.0, "x1": 95.0, "top": 30.5},
+        {"text": "Abg.", "x0": 320.0, "x1": 340.0, "top": 30.0},
+    ])))
+
+    flat = extract_toc_interleaved_flat_lines(Path("/nonexistent.pdf"), 1, 3, word_store=store)
+
+    assert [f["text"] for f in flat] == ["INHALT", "1. Debatte Abg."]
+
+
+def test_word_table_lines_group_by_quantized_y_and_sort_by_x():
+    table = WordTable.from_words([
+        {"text": "Welt", "x0": 60.0, "x1": 80.0, "top": 100.4},
+        {"text": "zweite", "x0": 10.0, "x1": 40.0, "top": 112.0},
+        {"text": "Hallo", "x0": 10.0, "x1": 40.0, "top": 99.0},
+        {"text": " ", "x0": 45.0, "x1": 46.0, "top": 99.0},
+        {"text": "Zeile", "x0": 45.0, "x1": 70.0, "top": 112.2},
+    ])
+
+    assert _words_to_lines_text(table) == ["Hallo Welt", "zweite Zeile"]
+    assert _words_to_lines_with_xy(table, [4, 1]) == [(112.0, 10.0, "zweite Zeile")]
+
+
+def _two_column_entry(page, banner=False):
+    words = []
+    for row in range(40):
+        top = 80.0 + row * 11
+        for x0, text in ((60.0, "links"), (150.0, "L"), (320.0, "rechts"), (410.0, "R")):
+            words.append({"text": f"{text}{row}", "x0": x0, "x1": x0 + 60.0, "top": top})
+    if banner:
+        words += [{"text": "Banner", "x0": 200.0, "x1": 400.0, "top": 40.0 + k} for k in range(10)]
+    return PageWords(page, 595.28, WordTable.from_words(words))
+
+
+def test_layout_document_sampled_engine_reuses_template_split():
+    entries = [_two_column_entry(n, banner=(n == 6)) for n in range(1, 7)]
+
+    pages, metas = layout_document(entries, LayoutConfig(engine="sampled", sample_pages=2, min_gap=20.0))
+
+    methods = [m.method for m in metas]
+    assert methods.count("two-column-template") == 3
+    assert metas[5].method != "two-column-template"
+    assert all(230 < m.split_x < 320 for m in metas if m.method == "two-column-template")
+    assert pages[0][0] == "links0 L0"
+    assert "rechts0 R0" in pages[0]
+
+
+def test_toc_collector_matches_split_on_full_document():
+    pages = [
+        ["Landtag", "INHALT", "1. Aktuelle Debatte", "2. Gesetz"],
+        ["3. Wahl", "Abg. Muster CDU . . . 12"],
+        ["4. Antrag"],
+        ["Protokoll", "Beginn: 10:00 Uhr"],
+        ["Präsident Muster: Ich eröffne die Sitzung."],
+    ]
+    collector = TocLineCollector()
+    for pi, lines in enumerate(pages, start=1):
+        collector.feed(pi, lines)
+
+    toc_lines, meta = collector.finish()
+    expected, _body, expected_meta = split_toc_and_body(pages_to_flat_lines(pages))
+
+    assert toc_lines == expected
+    assert meta == expected_meta
+    assert meta["body_start_reason"] == "protokoll"
+    assert collector.flat == []
+
+
+def test_batch_worker_stops_memory_probe_when_download_fails(monkeypatch, tmp_path):
+    def failing_download(url, force=False, store=None):
+        raise OSError("offline")
+
+    monkeypatch.setattr(parse_landtag_pdf, "download_pdf", failing_download)
+    assert not tracemalloc.is_tracing()
+
+    with pytest.raises(OSError):
+        _batch_worker("https://example.invalid/x.pdf", tmp_path, False, 1, None, ParserConfig(),
+                      stream=False, trace_memory=True)
+
+    assert not tracemalloc.is_tracing()
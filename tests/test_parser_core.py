@@ -1,16 +1,41 @@
 from pathlib import Path
+import re
 import sys
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from scripts.parser_core.normalize import normalize_line, dehyphenate
+from scripts.parser_core.normalize import collapse_ws, dehyphenate, nfkc, normalize_line, profile, squeeze_blanks
 from scripts.parser_core.metadata import parse_session_info
+from scripts.parser_core.config import apply_overrides, load_parser_config
+
+import pytest
 
 
 def test_normalize_line_collapses_whitespace():
     assert normalize_line('  Hallo\t\t Welt   ') == 'Hallo Welt'
 
 
+def test_normalization_fast_paths_match_regex_forms():
+    plain = 'Abg. Muster CDU: Danke.'
+    assert nfkc(plain) is plain and nfkc(None) == ''
+    assert nfkc('ﬁnal\u00a0①') == 'final 1'
+    for s in ['', ' a\u2028b \x1c c\u3000', '\t x  y \n']:
+        assert collapse_ws(s) == re.sub(r'\s+', ' ', s).strip()
+        assert squeeze_blanks(s) == re.sub(r'[ \t]+', ' ', s)
+    assert squeeze_blanks(plain) is plain
+
+
+def test_normalization_profile_counts_calls():
+    with profile() as prof:
+        nfkc('abc')
+        nfkc('Grüße')
+        collapse_ws(' a  b ')
+    assert prof.as_dict()['nfkc']['calls'] == 2 and prof.as_dict()['nfkc']['fast'] == 1
+    assert prof.as_dict()['collapse_ws']['calls'] == 1 and prof.total_seconds >= 0
+    nfkc('außerhalb')
+    assert prof.calls['nfkc'] == 2
+
+
 def test_dehyphenate_joins_split_words():
     lines = ['Demo-', 'kratie', 'bleibt']
     assert dehyphenate(lines) == ['Demokratie', 'bleibt']
@@ -31,3 +56,37 @@ def test_parse_session_info_extracts_core_fields():
     assert meta['date'] == '2025-07-16'
     assert meta['start_time'] == '09:00:00'
     assert meta['end_time'] == '17:30:00'
+
+
+def test_load_parser_config_reads_layout_section_and_applies_overrides(tmp_path):
+    cfg_file = tmp_path / 'parser_config.json'
+    cfg_file.write_text('{"layout": {"engine": "sampled", "mode": "auto", "sample_pages": 4, "min_gap": 20}}')
+
+    cfg = load_parser_config(str(cfg_file))
+    assert cfg.layout.engine == 'sampled'
+    assert cfg.layout.force_two_column is False
+    assert cfg.layout.min_gap == 20.0
+
+    cfg = apply_overrides(cfg, engine='histogram', sample_pages=None)
+    assert cfg.layout.engine == 'histogram'
+    assert cfg.layout.sample_pages == 4
+
+
+def test_load_parser_config_rejects_unknown_engine(tmp_path):
+    cfg_file = tmp_path / 'parser_config.json'
+    cfg_file.write_text('{"layout": {"engine": "magic"}}')
+
+    with pytest.raises(ValueError):
+        load_parser_config(str(cfg_file))
+
+
+def test_load_parser_config_rejects_unknown_keys(tmp_path):
+    cfg_file = tmp_path / 'parser_config.json'
+    cfg_file.write_text('{"layout": {"engine": "histogram", "gap_factor": 1.4}}')
+
+    with pytest.raises(ValueError, match='gap_factor'):
+        load_parser_config(str(cfg_file))
+
+
+def test_repo_parser_config_keeps_fixed_mid_default():
+    assert load_parser_config().layout.engine == 'fixed-mid'
@@ -0,0 +1,60 @@
+from pathlib import Path
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.pdfcache import PdfStore, content_hash_for_path, main
+
+
+def test_same_content_under_two_urls_is_stored_once(tmp_path):
+    store = PdfStore(str(tmp_path))
+    data = b"%PDF-1.4 Plenarprotokoll"
+    first = store.put_bytes(data)
+    second = store.put_bytes(data)
+    sha = hashlib.sha256(data).hexdigest()
+    store.record_url("https://example.org/blob/1.pdf", sha, etag='"a"')
+    store.record_url("https://example.org/blob/2.pdf", sha)
+
+    stats = store.stats()
+
+    assert first == second == store.blob_path(sha)
+    assert content_hash_for_path(first) == sha
+    assert store.path_for_url("https://example.org/blob/2.pdf") == first
+    assert store.lookup_url("https://example.org/blob/1.pdf").etag == '"a"'
+    assert (stats["blobs"], stats["urls"], stats["urls_sharing_a_blob"]) == (1, 2, 1)
+    assert stats["bytes_saved_by_dedup"] == len(data)
+    assert not list((tmp_path / "tmp").glob("*.part"))
+
+
+def test_gc_evicts_least_recently_used_and_drops_their_urls(tmp_path):
+    store = PdfStore(str(tmp_path))
+    old = store.put_bytes(b"a" * 1000)
+    new = store.put_bytes(b"b" * 1000)
+    store.record_url("u-old", old.stem)
+    store.record_url("u-new", new.stem)
+    time.sleep(0.01)
+    store.touch(new.stem)
+
+    report = store.gc(max_bytes=1500)
+
+    assert report["evicted"] == [old.stem]
+    assert not old.exists() and new.exists()
+    assert store.lookup_url("u-old") is None
+    assert store.lookup_url("u-new") is not None
+
+
+def test_gc_cleans_missing_rows_and_cli_stats(tmp_path, capsys):
+    store = PdfStore(str(tmp_path))
+    gone = store.put_bytes(b"weg")
+    os.unlink(gone)
+    (tmp_path / "0123456789abcdef.pdf").write_bytes(b"alt")
+
+    assert main(["--root", str(tmp_path), "gc", "--legacy"]) == 0
+    assert main(["--root", str(tmp_path), "stats"]) == 0
+
+    out = capsys.readouterr().out
+    assert '"missing_index_rows": 1' in out and '"legacy_files": 1' in out
+    assert store.stats()["blobs"] == 0 and store.stats()["legacy_files"] == 0
@@ -0,0 +1,260 @@
+from pathlib import Path
+import json
+import re
+import pickle
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parse_landtag_pdf import (
+    DASH_EVENT_RE,
+    HEADER_RX,
+    INLINE_HEADER_NOISE,
+    RE_ICH_RUFE_PUNKT,
+    RE_ICH_RUFE_TOP,
+    _canonical_event_label_from_text,
+    _flatten_events,
+    _split_parenthetical_event_parts,
+    build_speech_spans,
+    link_toc_to_speeches,
+    mask_parenthetical_events,
+    remove_fill_dots,
+    speech_dicts,
+    tokenize_session,
+)
+from scripts.parser_core.normalize import nfkc
+from scripts.parser_core.spans import (
+    TOKEN_AGENDA,
+    TOKEN_DASH,
+    TOKEN_HEADER,
+    TOKEN_PAREN,
+    TOKEN_TEXT,
+    PageIndex,
+    SpanTable,
+    page_start_offsets,
+)
+
+FIXTURE = Path(__file__).resolve().parents[1] / "data" / "session_17_127_2025-07-16.layout.json"
+
+TEXT = "\n".join([
+    "Präsidentin Muhterem Aras: Ich eröffne die 127. Sitzung.",
+    "Ich rufe Punkt 2 der Tagesordnung auf:",
+    "(Beifall bei den GRÜNEN – Abg. Anton Baron AfD: Wie",
+    "bitte?)",
+    "Abg. Max Muster CDU: Vielen Dank . . .",
+    ". . und weiter im Text.",
+    "– Zuruf",
+    "Landtag von Baden-Württemberg   Plenarprotokoll",
+    "Abg. Leer SPD:",
+    "(Heiterkeit)",
+])
+
+
+def _without_source(value):
+    if isinstance(value, dict):
+        return {k: _without_source(v) for k, v in value.items() if k != "source"}
+    if isinstance(value, list):
+        return [_without_source(v) for v in value]
+    return value
+
+
+# ------------------------- Referenz: Dict-Pipeline -------------------------
+# Die frühere Rede- und Event-Zerlegung als Dicts, nur noch als Orakel für tokenize_session und
+# build_speech_spans: eine Kopie des Redetexts je Rede, jede Stufe ein eigener Durchlauf.
+
+def _normalize_speech_text(text):
+    t = remove_fill_dots(nfkc(text))
+    out = []
+    for ln in t.splitlines():
+        ln = ln.strip()
+        if not ln:
+            continue
+        if any(rx.search(ln) for rx in INLINE_HEADER_NOISE):
+            for rx in INLINE_HEADER_NOISE:
+                ln = rx.sub("", ln)
+            ln = re.sub(r"\s{2,}", " ", ln).strip(" –—- ")
+            if not ln or ln.isspace():
+                continue
+        out.append(ln)
+    t = "\n".join(out).strip()
+    t = re.sub(r"[ \t]+", " ", t)
+    t = re.sub(r"(\n)[ \t]+", r"\1", t)
+    return t.strip()
+
+
+def _cleanup_events(sp):
+    lines = sp["text"].splitlines()
+    body, events = [], []
+    i = 0
+    while i < len(lines):
+        ln = lines[i].strip()
+        if ln.startswith("("):
+            buf = [ln]
+            balance = ln.count("(") - ln.count(")")
+            j = i + 1
+            while balance > 0 and j < len(lines):
+                nxt = lines[j].strip()
+                buf.append(nxt)
+                balance += nxt.count("(") - nxt.count(")")
+                j += 1
+            full = " ".join(buf).strip()
+            events.append({"type": "CompositeEvent", "text": full, "line_index": i,
+                           "span": {"start_line_index": i, "end_line_index": j - 1},
+                           "parts": _split_parenthetical_event_parts(full), "group_id": f"pevt_{i}"})
+            i = j
+        elif DASH_EVENT_RE.match(ln):
+            events.append({"type": _canonical_event_label_from_text(ln.lstrip("–- ").strip()), "text": ln,
+                           "line_index": i})
+            i += 1
+        else:
+            body.append(lines[i])
+            i += 1
+    sp["text"] = "\n".join(body).strip()
+    if events:
+        sp["events"] = events
+        sp["events_flat"] = _flatten_events(events)
+
+
+def _dict_pipeline(text):
+    matches = list(HEADER_RX.finditer(mask_parenthetical_events(text)))
+    speeches = []
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sp = {"index": i, "speaker": m.group("name"), "role": m.group("role"), "party": m.group("party"),
+              "text": _normalize_speech_text(m.group("after") + text[m.end():end])}
+        _cleanup_events(sp)
+        speeches.append(sp)
+    current = None
+    for sp in speeches:
+        m = RE_ICH_RUFE_TOP.search(sp["text"]) or RE_ICH_RUFE_PUNKT.search(sp["text"])
+        if m:
+            current = int(m.group(1))
+        if current is not None:
+            sp["agenda_item_number"] = current
+    speeches = [sp for sp in speeches if sp["text"].strip()]
+    for i, sp in enumerate(speeches):
+        sp["index"] = i
+    return speeches
+
+
+def test_span_model_matches_dict_pipeline_on_fixture():
+    layout = json.loads(FIXTURE.read_text(encoding="utf-8"))["layout_debug"]
+    text = "\n".join("\n".join(p) for p in layout["post_cleaned_pages"])
+    session = build_speech_spans(tokenize_session(text))
+    assert _without_source(speech_dicts(session)) == _dict_pipeline(text)
+    assert len(session.paragraphs) >= len(session)
+
+
+def test_spans_point_into_one_buffer():
+    session = build_speech_spans(tokenize_session(TEXT))
+    # die leere Rede (nur ein Event) entfällt wie bei prune_empty_speeches
+    assert session.speakers == ["Muhterem Aras", "Max Muster"]
+    assert _without_source(speech_dicts(session)) == _dict_pipeline(TEXT)
+    assert session.speech_text(1) == "Vielen Dank und weiter im Text."
+    # Quell-Offsets: Rede 1 beginnt hinter dem Doppelpunkt ihrer Kopfzeile
+    start, end = session.speeches.span(1)
+    assert TEXT[session.speeches.column("head")[1]:start] == "Abg. Max Muster CDU: "
+    ev = session.speech_events(0)[0]
+    first, last = session.events.column("first_line")[ev], session.events.column("last_line")[ev]
+    base = session.speeches.column("first_line")[0]
+    a, b = session.source_span(base + first, base + last)
+    assert TEXT[a:b] == "(Beifall bei den GRÜNEN – Abg. Anton Baron AfD: Wie\nbitte?)"
+    assert pickle.loads(pickle.dumps(session)) == session
+
+
+def test_whitespace_left_by_header_noise_keeps_line_sources():
+    # nach dem Entfernen der Kopfzeilen-Reste bleibt nur ein Steuerzeichen: die Zeile entfällt,
+    # die übrigen Zeilen behalten ihre eigene Herkunft
+    pages = [["Abg. Max Muster CDU: Erster Satz.", "Plenarprotokoll\x1fPlenarprotokoll"],
+             ["Zweiter Satz", "(Beifall)"]]
+    text = "\n".join("\n".join(p) for p in pages)
+    session = build_speech_spans(tokenize_session(text, page_start_offsets(len("\n".join(p)) for p in pages)))
+    assert session.speech_text(0) == "Erster Satz.\nZweiter Satz"
+    speech = speech_dicts(session)[0]
+    assert _without_source(speech) == _dict_pipeline(text)[0]
+    assert {k: speech["source"][k] for k in ("start_page", "start_line", "end_page", "end_line")} == \
+        {"start_page": 1, "start_line": 0, "end_page": 2, "end_line": 1}
+    event = speech["events"][0]["source"]
+    assert (event["start_page"], event["start_line"], event["end_page"], event["end_line"]) == (2, 1, 2, 1)
+
+def test_token_stream_kinds_and_sources():
+    session = tokenize_session(TEXT)
+    kinds = list(session.tokens.column("kind"))
+    # die leere Rede behält nur ihren Kopf
+    assert kinds == [TOKEN_HEADER, TOKEN_TEXT, TOKEN_PAREN, TOKEN_AGENDA,
+                     TOKEN_HEADER, TOKEN_TEXT, TOKEN_DASH, TOKEN_HEADER]
+    assert list(session.tokens.column("speech")) == [0, 0, 0, 0, 1, 1, 1, 2]
+    texts = list(session.tokens.texts(TEXT))
+    assert texts[0] == "Präsidentin Muhterem Aras: "
+    assert texts[2] == "(Beifall bei den GRÜNEN – Abg. Anton Baron AfD: Wie\nbitte?)"
+    assert texts[3] == "Ich rufe Punkt 2 der Tagesordnung auf:"
+    assert session.tokens.column("value")[3] == 2
+    # Füllpunkte über den Zeilenumbruch: ein Absatz aus zwei Quellzeilen
+    assert texts[5] == "Vielen Dank . . .\n. . und weiter im Text."
+    assert build_speech_spans(session).agenda_items == [2, 2]
+
+
+def test_tokenizer_matches_dict_pipeline_on_random_sessions():
+    parts = ["Abg. Max Muster CDU: ", "Präsidentin Muhterem Aras: ", "Text", " . . .", ".", "\n", "\n(", ")",
+             "Beifall", "\n– Zuruf", "Ich rufe Punkt 3 auf", "Tagesordnungspunkt 4", "Plenarprotokoll 17/1",
+             "\t", "  ", "ﬁ"]
+    rnd = random.Random(25)
+    for _ in range(500):
+        text = "".join(rnd.choice(parts) for _ in range(rnd.randint(0, 30)))
+        session = build_speech_spans(tokenize_session(text))
+        assert _without_source(speech_dicts(session)) == _dict_pipeline(text), text
+
+
+def test_tokenizer_normalizes_lines_like_reference():
+    alphabet = list("ab .\t\n()–:…\x0c\x1f\xa0ﬁ\u0301") + ["Beifall", "Plenarprotokoll", "12. Sitzung", ". .\n.",
+                                                              "LANDTAG von Baden-Württemberg", "3. ſitzung",
+                                                              "17. Wahlperıode"]
+    rnd = random.Random(5)
+    for _ in range(2000):
+        text = "Abg. Max Muster CDU: " + "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 25)))
+        session = build_speech_spans(tokenize_session(text))
+        assert _without_source(speech_dicts(session)) == _dict_pipeline(text), text
+        assert all(0 <= a <= b <= len(text) for a, b in zip(session.lines.column("src_start"),
+                                                              session.lines.column("src_end")))
+
+
+def test_span_table_columns():
+    table = SpanTable("speech")
+    assert table.append(3, 7, speech=2) == 0
+    table.append(8, 8)
+    assert len(table) == 2 and table.span(0) == (3, 7)
+    assert list(table.column("speech")) == [2, 0]
+    assert list(table.texts("0123456789")) == ["3456", ""]
+
+
+def test_page_index_locates_pages_and_lines():
+    pages = [["Kopf", "Zeile zwei"], [], ["Seite drei"]]
+    text = "\n".join("\n".join(p) for p in pages)
+    index = PageIndex(text, page_start_offsets(len("\n".join(p)) for p in pages))
+    assert list(index.page_starts) == [0, 16, 17]
+    assert index.locate(0) == (1, 0)
+    assert index.locate(text.index("zwei")) == (1, 1)
+    assert index.locate(text.index("drei")) == (3, 0)
+    assert index.source(5, 15) == {"start_page": 1, "start_line": 1, "end_page": 1, "end_line": 1,
+                                   "start_offset": 5, "end_offset": 15}
+
+
+def test_speeches_events_and_toc_carry_page_provenance():
+    pages = [TEXT.split("\n")[:4], TEXT.split("\n")[4:]]
+    text = "\n".join("\n".join(p) for p in pages)
+    session = build_speech_spans(tokenize_session(text, page_start_offsets(len("\n".join(p)) for p in pages)))
+    speeches = speech_dicts(session)
+    first, second = speeches[0]["source"], speeches[1]["source"]
+    assert (first["start_page"], first["start_line"], first["end_page"], first["end_line"]) == (1, 0, 1, 3)
+    assert (second["start_page"], second["start_line"], second["end_page"], second["end_line"]) == (2, 0, 2, 3)
+    event = speeches[0]["events"][0]
+    assert (event["source"]["start_line"], event["source"]["end_line"]) == (2, 3)
+    assert speeches[0]["events_flat"][0]["source"] == event["source"]
+
+    toc = {"items": [{"number": 2, "speakers": [{"name": "Max  Muster"}, {"name": "Unbekannt"}]}]}
+    link_toc_to_speeches(toc, speeches)
+    item = toc["items"][0]
+    assert item["source"]["first_speech"] == 0 and item["source"]["end_page"] == 2
+    assert item["speakers"][0]["speech_index"] == 1 and item["speakers"][0]["source"] == second
+    assert "source" not in item["speakers"][1]
@@ -0,0 +1,113 @@
+from pathlib import Path
+import importlib.util
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.stages import StageCache, StageRunner, code_fingerprint, instrumentation_summary
+
+MODULE = '''
+import re
+
+WORD_RE = re.compile(r"{pattern}")
+
+def _words(text):
+    # {comment}
+    return WORD_RE.findall(text)
+
+def stage_split(text):
+    return _words(text)
+
+def stage_count(split):
+    return len(split)
+'''
+
+
+def _load(tmp_path, name, pattern="\\w+", comment="Wörter"):
+    path = tmp_path / name / "mod.py"
+    path.parent.mkdir()
+    path.write_text(MODULE.format(pattern=pattern, comment=comment), encoding="utf-8")
+    spec = importlib.util.spec_from_file_location(f"stagemod_{name}", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _run(mod, cache, text="a b c"):
+    runner = StageRunner(cache)
+    text_value = runner.wrap(text)
+    split = runner.run("split", mod.stage_split, {"text": text_value})
+    count = runner.run("count", mod.stage_count, {"split": split})
+    return count.value, {e.stage: e.status for e in runner.events}
+
+
+def test_fingerprint_follows_helpers_and_constants_not_comments(tmp_path):
+    base = _load(tmp_path, "base")
+    comment = _load(tmp_path, "comment", comment="anderer Kommentar")
+    regex = _load(tmp_path, "regex", pattern=r"[a-z]+")
+    assert code_fingerprint(base.stage_split) == code_fingerprint(comment.stage_split)
+    assert code_fingerprint(base.stage_split) != code_fingerprint(regex.stage_split)
+    assert code_fingerprint(base.stage_count) == code_fingerprint(regex.stage_count)
+
+
+METHOD_MODULE = '''
+class Box:
+    def __init__(self, items):
+        self.items = items
+
+    def total(self):
+        return {body}
+
+def stage_box(text):
+    return Box(text.split())
+
+def stage_total(box):
+    return box.total()
+'''
+
+
+def test_fingerprint_follows_methods_called_on_instances(tmp_path):
+    fingerprints = []
+    for name, body in (("sum", "len(self.items)"), ("same", "len(self.items)"), ("changed", "len(set(self.items))")):
+        path = tmp_path / name / "mod.py"
+        path.parent.mkdir()
+        path.write_text(METHOD_MODULE.format(body=body), encoding="utf-8")
+        spec = importlib.util.spec_from_file_location(f"stagemod_method_{name}", path)
+        mod = importlib.util.module_from_spec(spec)
+        # wie ein echter Import: inspect findet die Quelldatei einer Klasse über sys.modules
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+        fingerprints.append((code_fingerprint(mod.stage_box), code_fingerprint(mod.stage_total)))
+    assert fingerprints[0] == fingerprints[1]
+    # nur der Methodenrumpf ändert sich: stage_total ruft box.total() über die Instanz auf
+    assert fingerprints[2][1] != fingerprints[0][1]
+
+
+def test_only_changed_stage_reruns_and_unchanged_output_cuts_off(tmp_path):
+    cache = StageCache(str(tmp_path / "cache"))
+    assert _run(_load(tmp_path, "v1"), cache) == (3, {"split": "miss", "count": "miss"})
+    assert _run(_load(tmp_path, "v2"), cache) == (3, {"split": "hit", "count": "hit"})
+    # Neue Regex, gleiches Ergebnis: split läuft neu, count trifft über den Inhalts-Hash
+    assert _run(_load(tmp_path, "v3", pattern=r"[a-z]+"), cache) == (3, {"split": "miss", "count": "hit"})
+    assert _run(_load(tmp_path, "v4"), cache, text="a b") == (2, {"split": "miss", "count": "miss"})
+    assert cache.stats()["stages"]["split"]["entries"] == 3
+
+
+def test_without_cache_runs_everything(tmp_path):
+    assert _run(_load(tmp_path, "off"), None) == (3, {"split": "off", "count": "off"})
+
+
+def test_events_carry_time_memory_and_counts(tmp_path):
+    mod = _load(tmp_path, "measured")
+    runner = StageRunner(None)
+    with runner.measure("load") as event:
+        event.counts = {"chars": 5}
+    split = runner.run("split", mod.stage_split, {"text": runner.wrap("a b c")}, counts=lambda v: {"words": len(v)})
+    assert split.value == ["a", "b", "c"]
+    events = [e.to_dict() for e in runner.events]
+    assert [(e["stage"], e["status"], e["counts"]) for e in events] == [
+        ("load", "run", {"chars": 5}), ("split", "off", {"words": 3})]
+    assert all(e["seconds"] >= 0 and e["cpu_seconds"] >= 0 and e["peak_rss_mb"] > 0 for e in events)
+    summary = instrumentation_summary(events)
+    assert summary["stages"] == events
+    assert summary["peak_rss_mb"] == max(e["peak_rss_mb"] for e in events)
@@ -0,0 +1,46 @@
+from pathlib import Path
+import sys
+
+import pdfplumber
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.benchmarks.synthetic_protocol import generate, write_pdf
+from scripts.parse_landtag_pdf import (
+    normalize_toc_items,
+    parse_toc,
+    stage_cleanup,
+    stage_header_footer,
+    stage_speeches,
+    stage_toc_split,
+)
+
+
+def test_generator_is_deterministic_and_hits_page_target():
+    a = generate(30, seed=7)
+    b = generate(30, seed=7)
+    assert a.page_lines() == b.page_lines()
+    assert a.page_lines() != generate(30, seed=8).page_lines()
+    assert abs(len(a.pages) - 30) <= 1
+    assert a.truth["toc_items"] >= 3 and a.truth["speeches"] > 50
+
+
+def test_text_stages_recover_generated_structure():
+    protocol = generate(20, seed=3)
+    cleanup = stage_cleanup(stage_header_footer({"pages": protocol.page_lines()}))
+    toc = normalize_toc_items(parse_toc(stage_toc_split(cleanup)))
+    speeches = stage_speeches("\n".join("\n".join(p) for p in cleanup))
+    assert len(toc["items"]) == protocol.truth["toc_items"]
+    assert len(speeches) == protocol.truth["speeches"]
+
+
+def test_pdf_has_two_columns_and_page_header(tmp_path):
+    protocol = generate(3, seed=1)
+    path = write_pdf(protocol, tmp_path / "syn.pdf")
+    with pdfplumber.open(path) as pdf:
+        assert len(pdf.pages) == len(protocol.pages)
+        words = pdf.pages[1].extract_words()
+    text = " ".join(w["text"] for w in words)
+    assert "Wahlperiode" in text and "Präsidentin" in text
+    mid = 297.64
+    assert any(w["x0"] < mid - 50 for w in words) and any(w["x0"] > mid for w in words)
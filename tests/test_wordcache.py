@@ -0,0 +1,71 @@
+from pathlib import Path
+import os
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scripts.parser_core.wordcache import WordCache
+from scripts.parser_core.wordtable import WordTable
+
+
+def _table(*words):
+    return WordTable.from_words([
+        {"text": t, "x0": x0, "x1": x1, "top": top, "bottom": top + 9.0} for t, x0, x1, top in words
+    ])
+
+
+PAGES = [
+    (1, 595.28, _table(("Landtag", 56.7, 88.25, 40.125), ("Württemberg", 120.0, 171.5, 40.125))),
+    (2, 595.28, _table()),
+    (3, 595.28, _table(("Landtag", 310.0, 341.55, 99.0))),
+]
+
+
+def _plain(pages):
+    return [
+        (p, w, list(zip(t.texts(), t.x0, t.x1, t.top, t.bottom))) for p, w, t in pages
+    ]
+
+
+def test_word_cache_round_trip_is_exact(tmp_path):
+    cache = WordCache(str(tmp_path))
+    cache.store("abc-0.11.0", PAGES)
+
+    assert _plain(cache.load("abc-0.11.0")) == _plain(PAGES)
+    assert cache.load("missing-0.11.0") is None
+
+
+def test_word_cache_keeps_document_meta(tmp_path):
+    cache = WordCache(str(tmp_path))
+    cache.store("abc-0.11.0", PAGES, {"hf_bands": {"header_bottom": {"odd": 43.656}}})
+
+    pages, meta = cache.load_entry("abc-0.11.0")
+
+    assert _plain(pages) == _plain(PAGES)
+    assert meta == {"hf_bands": {"header_bottom": {"odd": 43.656}}}
+
+
+def test_word_cache_key_depends_on_content_and_version(tmp_path):
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"%PDF-1.4 demo")
+    cache = WordCache(str(tmp_path / "cache"))
+
+    assert cache.key_for(pdf, "0.11.0") != cache.key_for(pdf, "0.12.0")
+    copy = tmp_path / "b.pdf"
+    copy.write_bytes(pdf.read_bytes())
+    assert cache.key_for(pdf, "0.11.0") == cache.key_for(copy, "0.11.0")
+
+
+def test_word_cache_evicts_least_recently_used(tmp_path):
+    cache = WordCache(str(tmp_path), max_bytes=10 ** 9)
+    for i, key in enumerate(["old", "mid", "new"]):
+        path = cache.store(key, PAGES)
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.load("old")  # Treffer frischt "old" auf
+
+    size = cache.path_for("old").stat().st_size
+    cache.max_bytes = 2 * size
+    removed = cache.evict()
+
+    assert removed == [cache.path_for("mid")]
+    assert _plain(cache.load("old")) == _plain(PAGES)